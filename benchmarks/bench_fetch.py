@@ -0,0 +1,53 @@
+import argparse
+import os
+import sys
+import time
+from unittest.mock import patch
+
+# ----------------------------------------------------------------------
+# PROGRAM NAME:     bench_fetch.py
+#
+# DESCRIPTION:      Compares the fetch engines against a local stand-in
+#                   for the USCF website that serves tests/testdata pages
+#                   with a simulated network latency.
+# ----------------------------------------------------------------------
+
+# Modify the system path before doing any imports of our specific code
+this_file = os.path.abspath(__file__)
+benchmarks_root = os.path.dirname(this_file)
+project_root = os.path.dirname(benchmarks_root)
+src_dir = os.path.join(project_root, "src")
+sys.path.append(src_dir)        # So it can find our classes
+sys.path.append(project_root)   # So it can find "tests"
+
+# Now python will find our packages
+from chess_clubs import config, get_player_pairs
+from chess_clubs.async_crawler import AsyncCrawler
+from chess_clubs.crawler import Crawler
+from chess_clubs.player import Player
+from tests.testdata.server import TestdataServer
+
+parser = argparse.ArgumentParser(description='Benchmarks the fetch engines')
+parser.add_argument('-n', '--players', type=int, default=30, help='Number of players')
+parser.add_argument('-l', '--latency', type=float, default=0.05, help='Server latency in seconds')
+parser.add_argument('-w', '--workers', type=int, default=16, help='Workers or requests in flight')
+args = parser.parse_args()
+
+players = [Player(f"{10000000 + i}", f"PLAYER NUMBER{i}") for i in range(args.players)]
+pairs = list(get_player_pairs(players))
+played = {players[1].id}
+
+engines = {
+    "serial": Crawler(workers=1),
+    "threads": Crawler(workers=args.workers),
+    "async": AsyncCrawler(concurrency=args.workers),
+}
+
+print(f"{len(pairs)} pairs, {args.latency * 1000:.0f} ms latency, {args.workers} workers")
+with TestdataServer(played=played, latency=args.latency) as server:
+    with patch.object(config.net, "BASE_URL", server.base_url):
+        for name, crawler in engines.items():
+            start = time.perf_counter()
+            ngames = sum(len(h2h.games) for _, _, h2h in crawler.crawl(pairs))
+            elapsed = time.perf_counter() - start
+            print(f"{name:8} {elapsed:8.2f} s {len(pairs) / elapsed:8.1f} pairs/s {ngames} games")
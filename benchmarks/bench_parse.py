@@ -0,0 +1,45 @@
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+# ----------------------------------------------------------------------
+# PROGRAM NAME:     bench_parse.py
+#
+# DESCRIPTION:      Compares the HeadToHead parser backends on a saved
+#                   gamestats page and checks that they all produce the
+#                   same games.
+# ----------------------------------------------------------------------
+
+# Modify the system path before doing any imports of our specific code
+this_file = os.path.abspath(__file__)
+benchmarks_root = os.path.dirname(this_file)
+project_root = os.path.dirname(benchmarks_root)
+src_dir = os.path.join(project_root, "src")
+sys.path.append(src_dir)        # So it can find our classes
+sys.path.append(project_root)   # So it can find "tests"
+
+# Now python will find our packages
+from chess_clubs.head_to_head import HeadToHead
+from tests.testdata import TESTDATA
+
+parser = argparse.ArgumentParser(description='Benchmarks the HeadToHead parsers')
+parser.add_argument('-n', '--repeat', type=int, default=200, help='Number of parses per parser')
+parser.add_argument('-f', '--file', default="head_to_head_page.html", help='Page in tests/testdata')
+args = parser.parse_args()
+
+html = (Path(TESTDATA) / args.file).read_text(encoding="utf-8")
+expected = [str(game) for game in HeadToHead("0", "0", html=html, parser="html.parser").games]
+
+print(f"{args.file}: {len(html)} bytes, {len(expected)} games, {args.repeat} parses")
+baseline = None
+for name in HeadToHead.PARSERS:
+    games = [str(game) for game in HeadToHead("0", "0", html=html, parser=name).games]
+    assert games == expected, f"{name} produced different games"
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        HeadToHead("0", "0", html=html, parser=name)
+    elapsed = time.perf_counter() - start
+    baseline = baseline or elapsed
+    print(f"{name:12} {elapsed / args.repeat * 1000:8.3f} ms/page {baseline / elapsed:6.1f}x")
@@ -0,0 +1,19 @@
+import pytest
+
+from synthetic import active_players_page, gamestats_page
+from tests.testdata.server import TestdataServer
+
+
+@pytest.fixture(scope="session")
+def active_players_html():
+    return active_players_page(300)
+
+
+@pytest.fixture(scope="session")
+def gamestats_html():
+    return gamestats_page(200)
+
+
+@pytest.fixture(scope="session")
+def zero_html():
+    return TestdataServer().read("head_to_head_zero.html").decode("utf-8")
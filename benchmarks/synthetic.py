@@ -0,0 +1,114 @@
+import copy
+import re
+from urllib.parse import parse_qs, urlparse
+
+from bs4 import BeautifulSoup
+
+from chess_clubs.archive import ArchiveMiss
+from tests.testdata.server import TestdataServer
+
+# ----------------------------------------------------------------------
+# MODULE NAME:      synthetic.py
+#
+# DESCRIPTION:      Synthesises large pages from the tests/testdata
+#                   templates, and a whole club that can be replayed
+#                   through Main.run() without any network.
+# ----------------------------------------------------------------------
+
+templates = TestdataServer()    # Only used to read the testdata pages
+FIRST_ID = 20000000
+
+
+def player_id(i: int) -> str:
+    return str(FIRST_ID + i)
+
+
+def active_players_page(players: int) -> str:
+    """
+    Returns an active player list with the given number of players, all
+    made from the first row of the saved list.
+    """
+    soup = BeautifulSoup(templates.read("active_players.html"), "html.parser")
+    table = soup.find("h4").find_next("table")
+    trs = table.find_all("tr")
+    template = str(trs[1])
+    for tr in trs[1:]:
+        tr.decompose()
+    rows = []
+    for i in range(players):
+        row = template.replace("30420180", player_id(i))
+        row = row.replace("AVANNI RICHARDSON", f"PLAYER NUMBER{i}")
+        rows.append(row)
+    table.append(BeautifulSoup("".join(rows), "html.parser"))
+    return str(soup)
+
+
+def gamestats_page(games: int) -> str:
+    """
+    Returns a head-to-head page with the given number of game rows, made
+    by repeating the rows of the saved page.
+    """
+    soup = BeautifulSoup(templates.read("head_to_head_page.html"), "html.parser")
+    trs = [a.find_parent("tr") for a in soup.find_all("a", href=re.compile("XtblMain"))]
+    last = trs[-1]
+    for i in range(games - len(trs)):
+        row = copy.copy(trs[i % len(trs)])
+        last.insert_after(row)
+        last = row
+    for tr in trs[games:]:
+        tr.decompose()
+    return str(soup)
+
+
+class SyntheticClub:
+    """
+    A club of synthetic players whose pages are generated on demand.  It
+    stands in for a replayed Archive on the shared fetcher, so that
+    Main.run() can be benchmarked end to end.  One pair in `played_every`
+    has played six games; the others have never met.
+
+    Usage:
+        fetcher.archive = SyntheticClub(300)
+        Main(CLUB_ID, dbname, budget=0, use_cache=False).run()
+    """
+
+    replaying = True
+
+    def __init__(self, players: int, played_every: int = 10):
+        self.players = players
+        self.played_every = played_every
+        self.path = f"<synthetic club of {players} players>"
+        self.pages = 0
+        self._club = templates.club_page().decode("utf-8")
+        self._active = active_players_page(players)
+        self._played = templates.read("head_to_head_page.html").decode("utf-8")
+        self._zero = templates.read("head_to_head_zero.html").decode("utf-8")
+
+    def lookup(self, url: str) -> str:
+        self.pages += 1
+        parsed = urlparse(url)
+        if parsed.path.endswith("AffDtlMain.php"):
+            return self._club
+        if parsed.path.endswith("top-affil-players.php"):
+            return self._active
+        if parsed.path.endswith("gamestats.php"):
+            query = parse_qs(parsed.query)
+            pid, oid = query["memid"][0], query["drill"][0]
+            if (int(pid) + int(oid) - 2 * FIRST_ID) % self.played_every:
+                return self._zero
+            return self._played.replace("30420180", pid).replace("30403332", oid)
+        raise ArchiveMiss(url)
+
+    get = lookup
+
+    async def get_async(self, url: str) -> str:
+        return self.lookup(url)
+
+    def put(self, url: str, text: str):
+        pass
+
+    def __len__(self) -> int:
+        return self.pages
+
+    def close(self):
+        pass
@@ -0,0 +1,47 @@
+import sqlite3
+
+from chess_clubs.core import Main
+from chess_clubs.game import Game
+from chess_clubs.writer import DatabaseWriter
+
+PAIRS = 2000
+GAMES_PER_PAIR = 5
+
+
+def make_games(pid, oid):
+    games = []
+    for rnumber in range(1, GAMES_PER_PAIR + 1):
+        game = Game()
+        game.player_id, game.opponent_id = pid, oid
+        game.tid, game.sname, game.rnumber = "202406012762", "OPEN", rnumber
+        game.color, game.result = "W", "WLD"[rnumber % 3]
+        games.append(game)
+    return games
+
+
+def new_database():
+    con = sqlite3.connect(":memory:")
+    Main("A6021250", ":memory:").create_tables(con)
+    return con
+
+
+def write_games(con):
+    with DatabaseWriter(con) as writer:
+        for i in range(PAIRS):
+            writer.add_head_to_head(str(10000000 + i), str(20000000 + i),
+                                    make_games(str(10000000 + i), str(20000000 + i)))
+
+
+def test_write_games(benchmark):
+    def setup():
+        return (new_database(),), {}
+
+    benchmark.pedantic(write_games, setup=setup, rounds=5)
+
+
+def test_create_summaries(benchmark):
+    con = new_database()
+    write_games(con)
+    benchmark(Main("A6021250", ":memory:").create_summaries, con)
+    count = con.execute("SELECT COUNT(*) FROM summaries").fetchone()[0]
+    assert count == 2 * PAIRS
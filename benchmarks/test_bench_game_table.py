@@ -0,0 +1,41 @@
+import pytest
+
+from chess_clubs.game_table import GameTable
+
+np = pytest.importorskip("numpy")
+
+PLAYERS = 1000
+GAMES = 5_000_000
+
+
+@pytest.fixture(scope="module", params=[1000, 1400, 1500, 4400])
+def table(request):
+    # Up to 1448 players are counted over every possible pair, and more
+    # over the pairs that played.  Build 500k games, then repeat them to
+    # reach 5M.
+    players = request.param
+    rows = [(str(20000000 + i % players), str(20000000 + (i * 7 + 1) % players),
+             "202406012762", "OPEN", i % 5 + 1, "WB"[i % 2], "WLDF"[i % 4])
+            for i in range(GAMES // 10)]
+    table = GameTable.from_rows(rows)
+    for name in ("pid", "oid", "tid", "rnumber", "color", "result"):
+        setattr(table, name, getattr(table, name) * 10)
+    assert len(table) == GAMES
+    return table
+
+
+def test_count_results(benchmark, table):
+    pids, oids, wins, losses, draws = benchmark(table.count_results)
+    assert wins.sum() + losses.sum() + draws.sum() == GAMES * 3 // 4
+
+
+def test_invert(benchmark, table):
+    benchmark(table.invert)
+
+
+def test_load_rows(benchmark):
+    rows = [(str(20000000 + i % PLAYERS), str(20000000 + (i * 7 + 1) % PLAYERS),
+             "202406012762", "OPEN", i % 5 + 1, "WB"[i % 2], "WLD"[i % 3])
+            for i in range(100_000)]
+    table = benchmark(GameTable.from_rows, rows)
+    assert len(table) == len(rows)
@@ -0,0 +1,163 @@
+import tracemalloc
+
+import pytest
+
+from chess_clubs import invert_color, invert_result
+from chess_clubs.game import Game
+from chess_clubs.summary import Summary
+
+GAMES = 100_000
+
+
+class DictGame:
+    """ A copy of Game as it was before the slots, with a per-instance dictionary """
+
+    def __init__(self):
+        self.player_id = None
+        self.player_name = None
+        self.tname = None
+        self.tid = None
+        self.tdate = None
+        self.sname = None
+        self.rnumber = None
+        self.color = None
+        self.opponent_id = None
+        self.opponent_name = None
+        self.result = None
+
+    def invert(self):
+        self.player_id, self.opponent_id = self.opponent_id, self.player_id
+        self.player_name, self.opponent_name = self.opponent_name, self.player_name
+        self.color = invert_color(self.color)
+        self.result = invert_result(self.result)
+
+
+class DictSummary:
+    """ A copy of Summary as it was before the slots, updating pct in every setter """
+
+    def __init__(self, player_id, opponent_id):
+        self.pid = player_id
+        self.oid = opponent_id
+        self._games = 0
+        self._wins = 0
+        self._losses = 0
+        self._draws = 0
+        self._pct = 0.0
+
+    def invert(self):
+        self.pid, self.oid = self.oid, self.pid
+        self.wins, self.losses = self.losses, self.wins
+        self._update_pct()
+
+    def update_with(self, game):
+        if game.result == "W":
+            self.wins += 1
+        elif game.result == "L":
+            self.losses += 1
+        elif game.result == "D":
+            self.draws += 1
+
+    @property
+    def games(self):
+        return self.wins + self.losses + self.draws
+
+    @property
+    def wins(self):
+        return self._wins
+
+    @wins.setter
+    def wins(self, value):
+        self._wins = value
+        self._update_pct()
+
+    @property
+    def losses(self):
+        return self._losses
+
+    @losses.setter
+    def losses(self, value):
+        self._losses = value
+        self._update_pct()
+
+    @property
+    def draws(self):
+        return self._draws
+
+    @draws.setter
+    def draws(self, value):
+        self._draws = value
+        self._update_pct()
+
+    @property
+    def pct(self):
+        return self._pct
+
+    def _update_pct(self):
+        total = self.games
+        if total > 0:
+            self._pct = 100.0 * (self._wins + 0.5 * self._draws) / total
+        else:
+            self._pct = 0.0
+
+
+VARIANTS = {
+    "slots": (Game, Summary),
+    "dict": (DictGame, DictSummary),
+}
+
+
+def make_games(game_class, n=GAMES):
+    games = []
+    for i in range(n):
+        game = game_class()
+        game.player_id, game.opponent_id = str(10000000 + i % 500), str(20000000 + i % 700)
+        game.tid, game.sname, game.rnumber = "202406012762", "OPEN", i % 5 + 1
+        game.color, game.result = "WB"[i % 2], "WLD"[i % 3]
+        games.append(game)
+    return games
+
+
+def summarize(games, summary_class):
+    summaries = {}
+    for game in games:
+        key = (game.player_id, game.opponent_id)
+        summary = summaries.get(key)
+        if summary is None:
+            summary = summaries[key] = summary_class(*key)
+        summary.update_with(game)
+        game.invert()
+    return summaries
+
+
+@pytest.mark.parametrize("variant", list(VARIANTS))
+def test_game_memory(benchmark, variant):
+    game_class, _ = VARIANTS[variant]
+
+    def measure():
+        tracemalloc.start()
+        games = make_games(game_class)
+        size, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return size, games
+
+    size, games = benchmark.pedantic(measure, rounds=1)
+    benchmark.extra_info["bytes_per_game"] = size / len(games)
+
+
+def test_slots_are_smaller():
+    sizes = {}
+    for variant, (game_class, _) in VARIANTS.items():
+        tracemalloc.start()
+        games = make_games(game_class, 10_000)
+        sizes[variant] = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del games
+    assert sizes["slots"] < sizes["dict"]
+
+
+@pytest.mark.parametrize("variant", list(VARIANTS))
+def test_summarize(benchmark, variant):
+    game_class, summary_class = VARIANTS[variant]
+    games = make_games(game_class)
+    summaries = benchmark(summarize, games, summary_class)
+    assert sum(summary.games for summary in summaries.values()) == GAMES
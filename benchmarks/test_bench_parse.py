@@ -0,0 +1,42 @@
+import re
+
+import pytest
+from bs4 import BeautifulSoup
+
+from chess_clubs import parse_player
+from chess_clubs.club import Club
+from chess_clubs.game_factory import GameFactory
+from chess_clubs.head_to_head import HeadToHead
+
+
+def test_parse_player(benchmark, active_players_html):
+    soup = BeautifulSoup(active_players_html, "html.parser")
+    trs = soup.find("h4").find_next("table").find_all("tr")[1:]
+    players = benchmark(lambda: [parse_player(tr) for tr in trs])
+    assert len(players) == 300
+
+
+def test_get_active_players(benchmark, active_players_html):
+    club = Club.__new__(Club)
+    players = benchmark(lambda: list(club.get_active_players(active_players_html)))
+    assert len(players) == 300
+
+
+def test_from_soup(benchmark, gamestats_html):
+    soup = BeautifulSoup(gamestats_html, "html.parser")
+    trs = [a.find_parent("tr") for a in soup.find_all("a", href=re.compile("XtblMain"))]
+    games = benchmark(lambda: [GameFactory.from_soup("30420180", tr) for tr in trs])
+    assert len(games) == 200
+
+
+@pytest.mark.parametrize("parser", HeadToHead.PARSERS)
+def test_head_to_head(benchmark, gamestats_html, parser):
+    if parser in ("lxml", "xpath"):
+        pytest.importorskip("lxml")
+    h2h = benchmark(HeadToHead, "30420180", "30403332", html=gamestats_html, parser=parser)
+    assert len(h2h.games) == 200
+
+
+def test_head_to_head_zero(benchmark, zero_html):
+    h2h = benchmark(HeadToHead, "30420180", "30403332", html=zero_html)
+    assert h2h.games == []
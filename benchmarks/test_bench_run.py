@@ -0,0 +1,46 @@
+import sqlite3
+
+import pytest
+
+from chess_clubs import fetcher
+from chess_clubs.core import Main
+from synthetic import SyntheticClub
+
+
+@pytest.mark.parametrize("players", [50, 300, 1000])
+def test_run(benchmark, tmp_path, players):
+    dbname = str(tmp_path / "club.db")
+
+    def setup():
+        fetcher.archive = SyntheticClub(players)
+        return (), {}
+
+    def run():
+        Main("A6021250", dbname, workers=1, budget=0, use_cache=False).run()
+
+    benchmark.pedantic(run, setup=setup, rounds=1 if players > 300 else 3)
+    with sqlite3.connect(dbname) as con:
+        pairs = con.execute("SELECT COUNT(*) FROM crawl_state").fetchone()[0]
+    assert pairs == players * (players - 1) // 2
+
+
+@pytest.mark.parametrize("engine,parsers,processes", [
+    ("threads", 1, False),
+    ("pipeline", 2, False),
+    ("pipeline", 4, True),
+])
+def test_run_engines(benchmark, tmp_path, engine, parsers, processes):
+    dbname = str(tmp_path / "club.db")
+
+    def setup():
+        fetcher.archive = SyntheticClub(300)
+        return (), {}
+
+    def run():
+        Main("A6021250", dbname, workers=4, budget=0, use_cache=False,
+             engine=engine, parsers=parsers, processes=processes).run()
+
+    benchmark.pedantic(run, setup=setup, rounds=1)
+    with sqlite3.connect(dbname) as con:
+        pairs = con.execute("SELECT COUNT(*) FROM crawl_state").fetchone()[0]
+    assert pairs == 300 * 299 // 2
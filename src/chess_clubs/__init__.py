@@ -1,11 +1,17 @@
+import asyncio
+import itertools
 import time
+from typing import Generator, List, Tuple
 from bs4 import BeautifulSoup, element
-import requests
 
 from chess_clubs.config import load_config
+from chess_clubs.fetcher import Fetcher
+from chess_clubs.metrics import metrics
 from chess_clubs.player import Player
+from chess_clubs.rate_limiter import RETRY_STATUSES, backoff_delay, parse_retry_after
 
 config = load_config()
+fetcher = Fetcher(config.net)
 
 
 def get_active_player_list_url(main_table, MIN_GAMES=config.app.MIN_GAMES) -> str:
@@ -66,7 +72,7 @@ def get_head_to_head_url(player_id: str, opponent_id: str) -> str:
     Returns:
         str: The URL pointing to the head-to-head game statistics page.
     """
-    url = (f"https://www.uschess.org/datapage/gamestats.php?memid={player_id}"
+    url = (f"{config.net.BASE_URL}/datapage/gamestats.php?memid={player_id}"
            f"&ptype=0&rs=R&drill={opponent_id}")
     return url
 
@@ -110,6 +116,9 @@ def get_page(url: str) -> str:
     """
     Fetches the HTML content of a webpage from a given URL, retrying on timeout errors.
 
+    The page is fetched by the shared fetcher, which reuses pooled
+    keep-alive connections.
+
     Args:
         url (str): The URL of the webpage to fetch.
 
@@ -119,29 +128,118 @@ def get_page(url: str) -> str:
     Raises:
         requests.exceptions.RequestException: If the request encounters an error.
     """
-    config = load_config()
+    return fetcher.get_page(url)
+
+
+async def get_page_async(session, url: str) -> str:
+    """
+    Fetches the HTML content of a webpage asynchronously, sharing the rate
+    limiter and retrying with backoff in the same way as get_page().  Like
+    get_page(), it uses the shared fetcher's page cache, if one is
+    installed, and revalidates expired pages with conditional requests,
+    and it records or replays the pages with the fetcher's archive.
+
+    Args:
+        session (aiohttp.ClientSession): The session whose connection pool
+        is used for the request.
+        url (str): The URL of the webpage to fetch.
+
+    Returns:
+        str: The HTML content of the requested webpage.
+
+    Raises:
+        aiohttp.ClientError: If the request encounters an error.
+    """
+    archive = fetcher.archive
+    if archive is not None and archive.replaying:
+        return await archive.get_async(url)
+    html = await load_page_async(session, url)
+    if archive is not None:
+        archive.put(url, html)
+    return html
+
+
+async def load_page_async(session, url: str) -> str:
+    """
+    Returns a page from the cache or the network, asynchronously.
+    """
+    import aiohttp  # Optional dependency, only needed for async crawling
+
+    cache = fetcher.cache
+    headers = {}
+    if cache is not None:
+        html = cache.get(url)
+        if html is not None:
+            return html
+        headers = fetcher.conditional_headers(url)
+
     MAX_ATTEMPTS = config.net.MAX_ATTEMPTS
-    TIMEOUT = config.net.TIMEOUT
+    TIMEOUT = aiohttp.ClientTimeout(total=config.net.TIMEOUT)
     RETRY_DELAY = config.net.RETRY_DELAY
 
     for attempt in range(MAX_ATTEMPTS):
+        last = attempt == MAX_ATTEMPTS - 1
+        await fetcher.limiter.acquire_async()
         try:
             # Attempt to fetch the page
-            response = requests.get(url, timeout=TIMEOUT)
-            response.raise_for_status()  # Raise an error for bad status codes
-            return response.text
-        except requests.exceptions.Timeout:
-            if attempt < MAX_ATTEMPTS - 1:
-                # If a timeout occurs and attempts are remaining, retry
-                print(
-                    f"Timeout occurred, retrying... ({attempt + 1}/{MAX_ATTEMPTS})")
-                time.sleep(RETRY_DELAY)
-            else:
+            start = time.perf_counter()
+            async with session.get(url, timeout=TIMEOUT, headers=headers) as response:
+                if response.status in RETRY_STATUSES and not last:
+                    retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                    delay = backoff_delay(attempt, RETRY_DELAY, config.net.MAX_BACKOFF, retry_after)
+                    print(f"HTTP {response.status} occurred, retrying in {delay:.1f} s..."
+                          f" ({attempt + 1}/{MAX_ATTEMPTS})")
+                    metrics.incr("fetch.retries")
+                    fetcher.limiter.pause(delay)
+                    continue
+                response.raise_for_status()  # Raise an error for bad status codes
+                body = await response.read()
+                metrics.observe("fetch.seconds", time.perf_counter() - start)
+                fetcher.count(response.status, response.content_length or len(body))
+                if response.status == 304:
+                    html = cache.revalidate(url)
+                    if html is not None:
+                        return html
+                    # The page was evicted meanwhile, so download it after
+                    # all, with an unconditional request and fresh attempts
+                    return await load_page_async(session, url)
+                html = fetcher.decode(url, body, response.headers.get("Content-Type"))
+            if cache is not None:
+                cache.put(url, html,
+                          response.headers.get("ETag"),
+                          response.headers.get("Last-Modified"))
+            return html
+        except asyncio.TimeoutError:
+            if last:
                 # Raise the exception after the last attempt
                 raise
-        except requests.exceptions.RequestException as e:
-            # For any other request exception, raise it immediately
-            raise e
+            # If a timeout occurs and attempts are remaining, retry
+            print(
+                f"Timeout occurred, retrying... ({attempt + 1}/{MAX_ATTEMPTS})")
+            metrics.incr("fetch.retries")
+            await asyncio.sleep(backoff_delay(attempt, RETRY_DELAY, config.net.MAX_BACKOFF))
+
+
+def get_player_pairs(players: List[Player]) -> Generator[Tuple[Player, Player], None, None]:
+    """
+    Plans the head-to-head matchups for a list of players.
+
+    Each unordered pair of distinct players is yielded exactly once, so
+    one head-to-head page is enough to record the games from both
+    players' perspectives.
+
+    Args:
+        players (List[Player]): The active players of the club.
+
+    Returns:
+        Generator[Tuple[Player, Player], None, None]: A generator yielding
+        (player, opponent) tuples.
+    """
+    # Keep only the first entry of a player who is listed more than once
+    unique = {}
+    for player in players:
+        unique.setdefault(player.id, player)
+    yield from itertools.combinations(unique.values(), 2)
 
 
 def invert_color(color: str) -> str:
@@ -249,7 +347,7 @@ def player_name_from_id(id: str) -> str:
     Returns:
         str: The player's name if found, otherwise an empty string.
     """
-    url = f"https://www.uschess.org/msa/thin.php?{id}"
+    url = f"{config.net.BASE_URL}/msa/thin.php?{id}"
     html = get_page(url)
     soup = BeautifulSoup(html, 'html.parser')
 
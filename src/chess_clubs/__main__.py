@@ -6,6 +6,7 @@ output database name to generate a database for the chess club.
 """
 
 import argparse
+import sys
 
 from chess_clubs.core import Main
 
@@ -22,6 +23,106 @@ if __name__ == '__main__':
         help='Output database name (default: clubid.db)'
     )
 
+    # Optional arguments: concurrent crawling of the head-to-head pages
+    parser.add_argument(
+        '-w', '--workers', type=int,
+        help='Number of threads fetching head-to-head pages'
+    )
+    parser.add_argument(
+        '--budget', type=float,
+        help='Maximum requests per second for each worker (0 for no limit)'
+    )
+    parser.add_argument(
+        '--engine', choices=['threads', 'pipeline', 'async'], default='threads',
+        help='Fetch engine; with async, --workers is the number of requests in flight'
+    )
+    parser.add_argument(
+        '--parsers', type=int,
+        help='Number of threads parsing pages with the pipeline engine'
+    )
+    parser.add_argument(
+        '--queue-size', type=int,
+        help='Maximum number of items in flight with the pipeline engine'
+    )
+    parser.add_argument(
+        '--processes', action='store_true', default=None,
+        help='Parse the pages in --parsers worker processes instead of threads'
+    )
+    parser.add_argument(
+        '--chunk-size', type=int,
+        help='Maximum number of pages sent to a parsing process at once'
+    )
+
+    # Optional argument: bypass the on-disk page cache
+    parser.add_argument(
+        '--no-cache', dest='use_cache', action='store_false', default=None,
+        help='Download every page instead of using the page cache'
+    )
+
+    # Optional argument: refresh an existing database
+    parser.add_argument(
+        '-u', '--update', action='store_true',
+        help='Update the existing database, re-crawling only the players who have played since'
+    )
+
+    # Optional argument: resume an interrupted crawl
+    parser.add_argument(
+        '-r', '--resume', action='store_true',
+        help='Resume an interrupted crawl, retrying the pairs that failed'
+    )
+
+    # Optional argument: build the games from pairs or from crosstables
+    parser.add_argument(
+        '--strategy', choices=['pairs', 'crosstables'], default='pairs',
+        help='Fetch a head-to-head page per pair of players, or a crosstable per tournament'
+    )
+
+    # Optional argument: skip pairs of players who never met
+    parser.add_argument(
+        '--prefilter', action='store_true', default=None,
+        help='Only request the matchups of players who played in the same tournament'
+    )
+
+    # Optional arguments: record the fetched pages, or replay them offline
+    parser.add_argument(
+        '--record', metavar='DIR',
+        help='Record every fetched page in an archive in DIR'
+    )
+    parser.add_argument(
+        '--replay', metavar='DIR',
+        help='Serve every page from the archive in DIR, without the network'
+    )
+    parser.add_argument(
+        '--latency', type=float, default=0.0,
+        help='Simulated latency in seconds of each replayed page'
+    )
+
+    # Optional arguments: progress records for monitoring a long crawl
+    parser.add_argument(
+        '--progress', metavar='FILE',
+        help='Append JSON-lines progress records of the crawl to FILE (- for stderr)'
+    )
+    parser.add_argument(
+        '--progress-interval', type=float,
+        help='Seconds between progress records'
+    )
+
+    # Optional arguments: database write tuning
+    parser.add_argument(
+        '--flush-size', type=int,
+        help='Number of game rows written per transaction'
+    )
+    parser.add_argument(
+        '--wal', action='store_true', default=None,
+        help='Use write-ahead logging with synchronous=NORMAL'
+    )
+
+    # Optional argument: check the summaries of an existing database
+    parser.add_argument(
+        '--verify', action='store_true',
+        help='Check the summaries of the existing database against the games'
+    )
+
     # Parse the command-line arguments
     args = parser.parse_args()
 
@@ -30,5 +131,30 @@ if __name__ == '__main__':
         args.dbname = f"{args.clubid}.db"
 
     # Call the main function with the provided arguments
-    main = Main(args.clubid, args.dbname)
+    main = Main(args.clubid, args.dbname,
+                workers=args.workers,
+                budget=args.budget,
+                engine=args.engine,
+                use_cache=args.use_cache,
+                update=args.update,
+                resume=args.resume,
+                flush_size=args.flush_size,
+                wal=args.wal,
+                prefilter=args.prefilter,
+                strategy=args.strategy,
+                record=args.record,
+                replay=args.replay,
+                latency=args.latency,
+                progress=args.progress,
+                progress_interval=args.progress_interval,
+                parsers=args.parsers,
+                queue_size=args.queue_size,
+                processes=args.processes,
+                chunk_size=args.chunk_size)
+    if args.verify:
+        problems = main.verify()
+        for problem in problems:
+            print(*problem)
+        print(f"{len(problems)} problems found in the summaries")
+        sys.exit(1 if problems else 0)
     main.run()
@@ -0,0 +1,132 @@
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+
+class ArchiveMiss(KeyError):
+    """
+    Raised when a page that is being replayed was not recorded.
+    """
+
+
+class Archive:
+    """
+    A record of every page fetched by a run, stored compressed in an
+    SQLite database, which can be replayed later without any network.
+
+    In record mode, each page that get_page() returns is stored under its
+    URL.  In replay mode, get_page() is served from the archive alone,
+    after an optional simulated latency, so that whole runs can be
+    benchmarked repeatably offline.
+
+    Usage:
+        fetcher.archive = Archive("recordings", "record")
+    """
+
+    FILENAME = "archive.db"
+
+    def __init__(self, directory: str, mode: str, latency: float = 0.0):
+        """
+        Initializes an Archive, creating the database if necessary.
+
+        Args:
+            directory (str): The directory holding the archive database.
+            mode (str): "record" or "replay".
+            latency (float, optional): The simulated latency in seconds of
+            each replayed page.
+        """
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown archive mode {mode!r}")
+        path = os.path.join(directory, self.FILENAME)
+        if mode == "replay" and not os.path.exists(path):
+            raise FileNotFoundError(path)
+        os.makedirs(directory, exist_ok=True)
+
+        self.path: str = path
+        self.mode: str = mode
+        self.latency: float = latency
+        self._lock = threading.Lock()
+        self._con = sqlite3.connect(path, check_same_thread=False)
+        self._con.executescript("""
+
+        CREATE TABLE IF NOT EXISTS responses (
+            url         TEXT NOT NULL PRIMARY KEY,
+            body        BLOB,       -- zlib-compressed page content
+            recorded    REAL        -- Time the page was recorded
+        );
+
+        """)
+
+    @property
+    def replaying(self) -> bool:
+        """
+        Returns True if pages are served from the archive.
+        """
+        return self.mode == "replay"
+
+    def put(self, url: str, text: str):
+        """
+        Records a page.
+
+        Args:
+            url (str): The URL of the page.
+            text (str): The page content.
+        """
+        body = zlib.compress(text.encode("utf-8"))
+        with self._lock:
+            sql = """ INSERT OR REPLACE INTO responses (url, body, recorded) VALUES(?, ?, ?) """
+            self._con.execute(sql, (url, body, time.time()))
+            self._con.commit()
+
+    def lookup(self, url: str) -> str:
+        """
+        Returns a recorded page immediately.
+
+        Raises:
+            ArchiveMiss: If the page was not recorded.
+        """
+        with self._lock:
+            row = self._con.execute("SELECT body FROM responses WHERE url=?", (url,)).fetchone()
+        if row is None:
+            raise ArchiveMiss(url)
+        return zlib.decompress(row[0]).decode("utf-8")
+
+    def get(self, url: str) -> str:
+        """
+        Returns a recorded page after the simulated latency.
+
+        Raises:
+            ArchiveMiss: If the page was not recorded.
+        """
+        if self.latency:
+            time.sleep(self.latency)
+        return self.lookup(url)
+
+    async def get_async(self, url: str) -> str:
+        """
+        Returns a recorded page after the simulated latency, without
+        blocking the event loop.
+
+        Raises:
+            ArchiveMiss: If the page was not recorded.
+        """
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return self.lookup(url)
+
+    def __len__(self) -> int:
+        """
+        Returns the number of recorded pages.
+        """
+        with self._lock:
+            return self._con.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def close(self):
+        """
+        Closes the archive database.
+        """
+        with self._lock:
+            self._con.close()
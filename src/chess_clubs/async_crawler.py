@@ -0,0 +1,165 @@
+import asyncio
+from collections import deque
+import queue
+import threading
+from typing import Generator, Iterable, Tuple
+
+from chess_clubs import config, get_head_to_head_url, get_page_async
+from chess_clubs.head_to_head import HeadToHead
+from chess_clubs.player import Player
+
+_DONE = object()  # Marks the end of the crawl on the result queue
+
+
+async def get_head_to_head_async(session, player_id: str, opponent_id: str) -> HeadToHead:
+    """
+    Fetches a head-to-head matchup page asynchronously and parses it.
+
+    Args:
+        session (aiohttp.ClientSession): The session used for the request.
+        player_id (str): The unique identifier of the player.
+        opponent_id (str): The unique identifier of the opponent.
+
+    Returns:
+        HeadToHead: The parsed matchup.
+    """
+    url = get_head_to_head_url(player_id, opponent_id)
+    html = await get_page_async(session, url)
+    return HeadToHead(player_id, opponent_id, html=html)
+
+
+class AsyncCrawler:
+    """
+    Fetches head-to-head matchups with asyncio instead of threads.
+
+    Thousands of pair requests can be in flight at once.  A semaphore
+    limits how many are actually on the wire, and those share a small
+    pool of keep-alive connections.  The matchups are handed back in the
+    order of the planned pairs, like Crawler.crawl().
+    """
+
+    def __init__(self, concurrency: int = 50, pool_size: int = None):
+        """
+        Initializes an AsyncCrawler.
+
+        Args:
+            concurrency (int, optional): The maximum number of requests in
+            flight at the same time.
+            pool_size (int, optional): The maximum number of open
+            connections. Defaults to config.net.POOL_SIZE.
+        """
+        if pool_size is None:
+            pool_size = config.net.POOL_SIZE
+        self.concurrency: int = max(1, concurrency)
+        self.pool_size: int = max(1, pool_size)
+
+    def new_session(self):
+        """
+        Creates an aiohttp session backed by a bounded connection pool.
+        """
+        import aiohttp  # Optional dependency, only needed for async crawling
+        connector = aiohttp.TCPConnector(limit=self.pool_size,
+                                         limit_per_host=self.pool_size)
+        return aiohttp.ClientSession(connector=connector)
+
+    def crawl(self, pairs: Iterable[Tuple[Player, Player]]
+              ) -> Generator[Tuple[Player, Player, HeadToHead], None, None]:
+        """
+        Fetches the head-to-head matchup for each pair of players.
+
+        The event loop runs on a background thread, so the caller can
+        write each matchup to the database as it arrives.
+
+        Args:
+            pairs (Iterable[Tuple[Player, Player]]): The planned pairs.
+
+        Returns:
+            Generator[Tuple[Player, Player, HeadToHead], None, None]: A
+            generator yielding (player, opponent, head_to_head) tuples in
+            the order of the planned pairs.  If a pair could not be
+            crawled, head_to_head is the exception that was raised.
+        """
+        results = queue.Queue(maxsize=self.concurrency)
+        stop = threading.Event()
+
+        def emit(item) -> bool:
+            # Wait for room on the queue, unless the caller has stopped
+            while not stop.is_set():
+                try:
+                    results.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+
+        def run():
+            try:
+                asyncio.run(self.crawl_async(pairs, emit))
+                emit(_DONE)
+            except BaseException as e:
+                emit(e)
+
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+        try:
+            while True:
+                item = results.get()
+                if item is _DONE:
+                    break
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            # Stop the event loop, if the caller stopped early, so that the
+            # session is closed and the thread ends
+            stop.set()
+            thread.join()
+
+    async def crawl_async(self, pairs: Iterable[Tuple[Player, Player]], emit):
+        """
+        Fetches the matchups concurrently and passes each one to emit()
+        in the order of the planned pairs.
+
+        emit() is called in a thread of the default executor, so that it
+        may block without holding up the requests in flight.  The crawl
+        stops early when emit() returns False.
+
+        Args:
+            pairs (Iterable[Tuple[Player, Player]]): The planned pairs.
+            emit: A callable taking a (player, opponent, head_to_head) tuple
+            and returning whether to go on.
+        """
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def fetch(session, player, opponent):
+            async with semaphore:
+                try:
+                    return await get_head_to_head_async(session, player.id, opponent.id)
+                except Exception as e:
+                    return e
+
+        async def emit_next() -> bool:
+            player, opponent, task = pending.popleft()
+            return await loop.run_in_executor(None, emit, (player, opponent, await task))
+
+        # Keep a bounded window of tasks, so that memory use does not grow
+        # with the number of pairs
+        max_pending = 2 * self.concurrency
+        pending = deque()
+        async with self.new_session() as session:
+            try:
+                for player, opponent in pairs:
+                    task = asyncio.ensure_future(fetch(session, player, opponent))
+                    pending.append((player, opponent, task))
+                    if len(pending) >= max_pending and not await emit_next():
+                        return
+                while pending:
+                    if not await emit_next():
+                        return
+            finally:
+                # Cancel the requests still in flight before the session
+                # is closed
+                for _, _, task in pending:
+                    task.cancel()
+                await asyncio.gather(*(task for _, _, task in pending), return_exceptions=True)
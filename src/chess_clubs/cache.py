@@ -0,0 +1,305 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Dict, Tuple
+
+from chess_clubs.config import CacheConfig
+
+
+class PageCache:
+    """
+    An on-disk cache of fetched web pages, stored in an SQLite database.
+
+    Pages are keyed by a SHA-256 hash of their URL and stored compressed.
+    Each page expires after the time-to-live of its URL class (club page,
+    active player list, gamestats, tournament history or other).  When the cache grows past
+    its byte budget, the least recently used pages are evicted.
+
+    The ETag and Last-Modified validators of each page are kept, so that
+    an expired page can be revalidated with a conditional request instead
+    of being downloaded again.
+    """
+
+    # Substrings that identify the class of a URL
+    URL_CLASSES = [
+        ("club", "AffDtlMain.php"),
+        ("active", "top-affil-players.php"),
+        ("gamestats", "gamestats.php"),
+        ("history", "MbrDtlTnmtHst.php"),
+    ]
+
+    def __init__(self, path: str, max_bytes: int, ttls: Dict[str, int]):
+        """
+        Initializes a PageCache, creating the database if necessary.
+
+        Args:
+            path (str): The name of the SQLite database file.
+            max_bytes (int): The budget for the compressed size of all pages.
+            ttls (Dict[str, int]): The time-to-live in seconds of each URL
+            class: "club", "active", "gamestats", "history" and "other".
+        """
+        self.path: str = path
+        self.max_bytes: int = max_bytes
+        self.ttls: Dict[str, int] = ttls
+        self.hits: int = 0
+        self.misses: int = 0
+        self.revalidated: int = 0  # Expired pages the server said were unchanged
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._con = sqlite3.connect(path, check_same_thread=False)
+        self._con.executescript("""
+
+        PRAGMA journal_mode = WAL;
+        PRAGMA synchronous = NORMAL;
+
+        CREATE TABLE IF NOT EXISTS pages (
+            key         TEXT NOT NULL PRIMARY KEY, -- SHA-256 hash of the URL
+            url         TEXT,       -- URL of the page
+            body        BLOB,       -- zlib-compressed page content
+            size        INT,        -- Size of the compressed content
+            fetched     REAL,       -- Time the page was fetched or revalidated
+            accessed    REAL,       -- Time the page was last used
+            etag        TEXT,       -- ETag response header
+            modified    TEXT        -- Last-Modified response header
+        );
+
+        CREATE INDEX IF NOT EXISTS pages_accessed ON pages(accessed);
+
+        """)
+
+        # Add the validator columns to a cache created by an older version
+        columns = {row[1] for row in self._con.execute("PRAGMA table_info(pages)")}
+        for column in ("etag", "modified"):
+            if column not in columns:
+                self._con.execute(f"ALTER TABLE pages ADD COLUMN {column} TEXT")
+        row = self._con.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()
+        self._total: int = row[0]
+
+    @classmethod
+    def from_config(cls, cache: CacheConfig) -> "PageCache":
+        """
+        Creates a PageCache from the cache section of the configuration.
+        """
+        ttls = {
+            "club": cache.TTL_CLUB,
+            "active": cache.TTL_ACTIVE,
+            "gamestats": cache.TTL_GAMESTATS,
+            "history": cache.TTL_HISTORY,
+            "other": cache.TTL_OTHER,
+        }
+        return cls(cache.PATH, cache.MAX_BYTES, ttls)
+
+    @staticmethod
+    def key(url: str) -> str:
+        """
+        Returns the cache key for a URL.
+        """
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def url_class(self, url: str) -> str:
+        """
+        Returns the class of a URL, which determines its time-to-live.
+        """
+        for name, marker in self.URL_CLASSES:
+            if marker in url:
+                return name
+        return "other"
+
+    def get(self, url: str) -> str:
+        """
+        Returns the cached content of a page.
+
+        Args:
+            url (str): The URL of the page.
+
+        Returns:
+            str: The page content.
+            None: If the page is not cached or has expired.
+        """
+        now = time.time()
+        ttl = self.ttls[self.url_class(url)]
+        key = self.key(url)
+        with self._lock:
+            sql = """ SELECT body, fetched FROM pages WHERE key=? """
+            row = self._con.execute(sql, (key,)).fetchone()
+            if row is None or now - row[1] >= ttl:
+                self.misses += 1
+                return None
+            self.hits += 1
+            sql = """ UPDATE pages SET accessed=? WHERE key=? """
+            self._con.execute(sql, (now, key))
+            self._con.commit()
+        return zlib.decompress(row[0]).decode("utf-8")
+
+    def validators(self, url: str) -> Tuple[str, str]:
+        """
+        Returns the validators of a cached page, even an expired one.
+
+        Args:
+            url (str): The URL of the page.
+
+        Returns:
+            Tuple[str, str]: The ETag and Last-Modified headers the page
+            was served with, each of which may be None.
+        """
+        key = self.key(url)
+        with self._lock:
+            sql = """ SELECT etag, modified FROM pages WHERE key=? """
+            row = self._con.execute(sql, (key,)).fetchone()
+        return row if row is not None else (None, None)
+
+    def revalidate(self, url: str) -> str:
+        """
+        Marks an expired page as fresh again, after the server said it has
+        not changed, and counts the lookup as a hit instead of a miss.
+
+        Args:
+            url (str): The URL of the page.
+
+        Returns:
+            str: The page content.
+            None: If the page has been evicted in the meantime.
+        """
+        now = time.time()
+        key = self.key(url)
+        with self._lock:
+            row = self._con.execute("SELECT body FROM pages WHERE key=?", (key,)).fetchone()
+            if row is None:
+                return None
+            sql = """ UPDATE pages SET fetched=?, accessed=? WHERE key=? """
+            self._con.execute(sql, (now, now, key))
+            self._con.commit()
+            self.misses -= 1
+            self.hits += 1
+            self.revalidated += 1
+        return zlib.decompress(row[0]).decode("utf-8")
+
+    def expire(self, url: str):
+        """
+        Marks a page as expired, so that it is revalidated with the server
+        before it is used again.
+
+        Args:
+            url (str): The URL of the page.
+        """
+        key = self.key(url)
+        with self._lock:
+            self._con.execute("UPDATE pages SET fetched=0 WHERE key=?", (key,))
+            self._con.commit()
+
+    def expire_pages(self, url: str):
+        """
+        Marks a page and its later pages, url.2, url.3 and so on, as
+        expired, so that they are revalidated with the server before they
+        are used again.
+
+        Args:
+            url (str): The URL of the first page.
+        """
+        with self._lock:
+            sql = """ UPDATE pages SET fetched=0 WHERE url=? OR substr(url, 1, ?)=? """
+            self._con.execute(sql, (url, len(url) + 1, url + "."))
+            self._con.commit()
+
+    def put(self, url: str, text: str, etag: str = None, modified: str = None):
+        """
+        Stores the content of a page, evicting the least recently used
+        pages if the cache is over its byte budget.
+
+        Args:
+            url (str): The URL of the page.
+            text (str): The page content.
+            etag (str, optional): The ETag response header.
+            modified (str, optional): The Last-Modified response header.
+        """
+        now = time.time()
+        key = self.key(url)
+        body = zlib.compress(text.encode("utf-8"))
+        with self._lock:
+            row = self._con.execute("SELECT size FROM pages WHERE key=?", (key,)).fetchone()
+            if row is not None:
+                self._total -= row[0]
+            sql = """
+
+            INSERT OR REPLACE INTO pages (key, url, body, size, fetched, accessed, etag, modified)
+            VALUES(?, ?, ?, ?, ?, ?, ?, ?)
+
+            """
+            self._con.execute(sql, (key, url, body, len(body), now, now, etag, modified))
+            self._total += len(body)
+            self._evict()
+            self._con.commit()
+
+    def _evict(self):
+        """
+        Deletes the least recently used pages until the cache fits in its
+        byte budget.  The caller must hold the lock.
+        """
+        if self._total <= self.max_bytes:
+            return
+        cur = self._con.execute("SELECT key, size FROM pages ORDER BY accessed")
+        victims = []
+        for key, size in cur:
+            if self._total <= self.max_bytes:
+                break
+            victims.append((key,))
+            self._total -= size
+        cur.close()
+        self._con.executemany("DELETE FROM pages WHERE key=?", victims)
+
+    def delete(self, url: str):
+        """
+        Deletes a page from the cache, so that it is downloaded again.
+
+        Args:
+            url (str): The URL of the page.
+        """
+        key = self.key(url)
+        with self._lock:
+            row = self._con.execute("SELECT size FROM pages WHERE key=?", (key,)).fetchone()
+            if row is None:
+                return
+            self._con.execute("DELETE FROM pages WHERE key=?", (key,))
+            self._con.commit()
+            self._total -= row[0]
+
+    @property
+    def size(self) -> int:
+        """
+        Returns the compressed size of all cached pages.
+        """
+        return self._total
+
+    def clear(self):
+        """
+        Deletes all pages from the cache.
+        """
+        with self._lock:
+            self._con.execute("DELETE FROM pages")
+            self._con.commit()
+            self._total = 0
+
+    def close(self):
+        """
+        Closes the cache database.
+        """
+        with self._lock:
+            self._con.close()
+
+    def __str__(self) -> str:
+        """
+        Returns a string representation of the cache statistics.
+        """
+        parts = [
+            f'hits="{self.hits}"',
+            f'misses="{self.misses}"',
+            f'revalidated="{self.revalidated}"',
+            f'size="{self.size}"',
+        ]
+        return f"PageCache({','.join(parts)})"
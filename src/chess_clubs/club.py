@@ -1,7 +1,7 @@
 from bs4 import BeautifulSoup
 from typing import Dict, Generator, Tuple
 
-from chess_clubs import get_active_player_list_url, get_club_name, get_main_table, get_page, parse_player
+from chess_clubs import config, get_active_player_list_url, get_club_name, get_main_table, get_page, parse_player
 from chess_clubs.player import Player
 
 class Club:
@@ -12,33 +12,48 @@ class Club:
     including club name, active players, and head-to-head results.
     """
 
-    def __init__(self, id: str):
+    def __init__(self, id: str, html: str = None):
         """
         Initializes a Club instance by retrieving and parsing club information from USCF.
 
         Args:
             id (str): The unique identifier of the club from the US Chess Federation.
+            html (str, optional): The HTML of the club page, if it has already
+            been fetched. Otherwise it is fetched from USCF.
         """
         self.id: str = id
         self.name: str = None
-        self.url: str = f"https://www.uschess.org/msa/AffDtlMain.php?{self.id}"
+        self.url: str = Club.get_url(self.id)
         self.active_players_url: str = None
         
         # Fetch and parse the club's webpage to extract relevant information
-        html = get_page(self.url)
+        if html is None:
+            html = get_page(self.url)
         soup = BeautifulSoup(html, 'html.parser')
         main_table = get_main_table(soup)
         self.name = get_club_name(main_table)
         self.active_players_url = get_active_player_list_url(main_table)
 
-    def get_active_players(self) -> Generator[Player, None, None]:
+    @staticmethod
+    def get_url(id: str) -> str:
+        """
+        Returns the URL of the USCF page for the club with the given ID.
+        """
+        return f"{config.net.BASE_URL}/msa/AffDtlMain.php?{id}"
+
+    def get_active_players(self, html: str = None) -> Generator[Player, None, None]:
         """
         Generator function that retrieves the active players from the club.
 
+        Args:
+            html (str, optional): The HTML of the active player list, if it
+            has already been fetched. Otherwise it is fetched from USCF.
+
         Returns:
             Generator[Player, None, None]: A generator yielding Player objects.
         """
-        html = get_page(self.active_players_url)
+        if html is None:
+            html = get_page(self.active_players_url)
         soup = BeautifulSoup(html, 'html.parser')
         
         # Locate the active player table, which appears after the first <h4> tag
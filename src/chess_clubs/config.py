@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 import yaml
 import os
 
@@ -8,9 +8,12 @@ from pathlib import Path
 system = platform.system()
 if system == "Windows":
     base = Path(os.environ.get("APPDATA", Path.home() / "AppData" / "Roaming"))
+    cache_base = Path(os.environ.get("LOCALAPPDATA", Path.home() / "AppData" / "Local"))
 else:
     base = Path(os.environ.get("XDG_CONFIG_HOME", Path.home() / ".config"))
+    cache_base = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache"))
 CONFIG_PATH = base / "chess-clubs" / "config.yaml"
+CACHE_PATH = cache_base / "chess-clubs" / "pages.db"
 
 
 @dataclass
@@ -18,17 +21,54 @@ class NetConfig:
     MAX_ATTEMPTS: int
     TIMEOUT: int
     RETRY_DELAY: int
+    BASE_URL: str = "https://www.uschess.org"
+    POOL_SIZE: int = 10
+    KEEP_ALIVE: bool = True
+    GZIP: bool = True
+    WORKERS: int = 1
+    WORKER_BUDGET: float = 2.0
+    RATE: float = 0.0               # Requests per second for the whole program
+    BURST: int = 1
+    MAX_BACKOFF: float = 60.0       # Longest wait between retries, in seconds
+    ENCODING: str = None            # Of pages without a charset, None to sniff it once per host
 
 
 @dataclass
 class AppConfig:
     MIN_GAMES: int
+    PARSER: str = "stream"          # stream, html.parser, lxml or xpath
+    PREFILTER: bool = False         # Only pair players who shared a tournament
+    PROGRESS_INTERVAL: float = 10.0 # Seconds between progress records
+    PARSERS: int = 1                # Parse threads of the pipeline engine
+    QUEUE_SIZE: int = 0             # Items in flight in the pipeline, 0 for automatic
+    PROCESSES: bool = False         # Parse in worker processes instead of threads
+    CHUNK_SIZE: int = 16            # Pages sent to a worker process at once
+
+
+@dataclass
+class DbConfig:
+    FLUSH_SIZE: int = 1000
+    WAL: bool = False
+
+
+@dataclass
+class CacheConfig:
+    ENABLED: bool = True
+    PATH: str = str(CACHE_PATH)
+    MAX_BYTES: int = 256 * 1024 * 1024
+    TTL_CLUB: int = 24 * 60 * 60            # Seconds
+    TTL_ACTIVE: int = 24 * 60 * 60
+    TTL_HISTORY: int = 24 * 60 * 60
+    TTL_GAMESTATS: int = 7 * 24 * 60 * 60
+    TTL_OTHER: int = 30 * 24 * 60 * 60
 
 
 @dataclass
 class Config:
     net: NetConfig
     app: AppConfig
+    cache: CacheConfig = field(default_factory=CacheConfig)
+    db: DbConfig = field(default_factory=DbConfig)
 
 
 def load_config(path=CONFIG_PATH) -> Config:
@@ -37,5 +77,7 @@ def load_config(path=CONFIG_PATH) -> Config:
 
     return Config(
         net=NetConfig(**data['net']),
-        app=AppConfig(**data['app'])
+        app=AppConfig(**data['app']),
+        cache=CacheConfig(**(data.get('cache') or {})),
+        db=DbConfig(**(data.get('db') or {}))
     )
@@ -1,15 +1,43 @@
 from datetime import datetime
 import os
 import sqlite3
+import sys
+from typing import List, Set, TextIO, Tuple
 
+from chess_clubs import config, fetcher, get_head_to_head_url, get_player_pairs
+from chess_clubs.archive import Archive
+from chess_clubs.cache import PageCache
 from chess_clubs.club import Club, Player
-from chess_clubs.game import Game
+from chess_clubs.crawler import Crawler
 from chess_clubs.head_to_head import HeadToHead
+from chess_clubs.metrics import Progress, metrics
+from chess_clubs.pipeline import Pipeline
+from chess_clubs.tournament_history import TournamentHistory, TournamentIndex
+from chess_clubs.writer import DatabaseWriter
 
 
 class Main():
 
-    def __init__(self, clubid: str, dbname: str):
+    def __init__(self, clubid: str, dbname: str,
+                 workers: int = None,
+                 budget: float = None,
+                 engine: str = "threads",
+                 use_cache: bool = None,
+                 update: bool = False,
+                 resume: bool = False,
+                 flush_size: int = None,
+                 wal: bool = None,
+                 prefilter: bool = None,
+                 strategy: str = "pairs",
+                 record: str = None,
+                 replay: str = None,
+                 latency: float = 0.0,
+                 progress: str = None,
+                 progress_interval: float = None,
+                 parsers: int = None,
+                 queue_size: int = None,
+                 processes: bool = None,
+                 chunk_size: int = None):
         """
         Initializes class to create and populate a SQLite database with
         club and player data.
@@ -17,65 +45,396 @@ class Main():
         Args:
             clubid (str): The unique identifier for the club.
             dbname (str): The name of the SQLite database file.
+            workers (int, optional): The number of threads fetching
+            head-to-head pages. Defaults to config.net.WORKERS.
+            budget (float, optional): The maximum requests per second for
+            each worker. Defaults to config.net.WORKER_BUDGET.
+            engine (str, optional): "threads" to fetch and parse the pages
+            on a thread pool, "pipeline" to fetch them on workers threads
+            and parse them on parsers threads, or "async" to fetch them
+            with asyncio, in which case workers is the number of requests
+            in flight.
+            use_cache (bool, optional): Whether to serve pages from the
+            on-disk page cache. Defaults to config.cache.ENABLED.
+            update (bool, optional): Whether to refresh an existing database
+            instead of rebuilding it from scratch.
+            resume (bool, optional): Whether to resume an interrupted crawl,
+            skipping the pairs that were completed and retrying the ones
+            that failed.
+            flush_size (int, optional): The number of game rows written to
+            the database per transaction. Defaults to config.db.FLUSH_SIZE.
+            wal (bool, optional): Whether to use write-ahead logging with
+            synchronous=NORMAL. Defaults to config.db.WAL.
+            prefilter (bool, optional): Whether to read each player's
+            tournament history first, and only request the head-to-head
+            matchups of players who were in the same tournament. Defaults
+            to config.app.PREFILTER.
+            strategy (str, optional): "pairs" to fetch the head-to-head
+            page of each pair of players, or "crosstables" to fetch the
+            crosstable of each tournament that club members played in.
+            record (str, optional): A directory in which to record every
+            page that is fetched.
+            replay (str, optional): A directory with recorded pages from
+            which to serve every page, instead of the network and the page
+            cache.
+            latency (float, optional): The simulated latency in seconds of
+            each replayed page.
+            progress (str, optional): A file to which progress records of
+            the crawl are appended as JSON lines, or "-" for standard error.
+            progress_interval (float, optional): The number of seconds
+            between progress records. Defaults to config.app.PROGRESS_INTERVAL.
+            parsers (int, optional): The number of threads parsing pages
+            with the pipeline engine. Defaults to config.app.PARSERS.
+            queue_size (int, optional): The maximum number of items in
+            flight with the pipeline engine. Defaults to config.app.QUEUE_SIZE.
+            processes (bool, optional): Whether the pipeline engine parses
+            the pages in parsers worker processes instead of threads.
+            Defaults to config.app.PROCESSES.
+            chunk_size (int, optional): The maximum number of pages sent to
+            a worker process at once. Defaults to config.app.CHUNK_SIZE.
         """
+        if record and replay:
+            raise ValueError("Cannot record and replay at the same time")
         self.clubid = clubid
         self.dbname = dbname
+        self.workers = workers if workers is not None else config.net.WORKERS
+        self.budget = budget if budget is not None else config.net.WORKER_BUDGET
+        self.engine = engine
+        self.use_cache = use_cache if use_cache is not None else config.cache.ENABLED
+        self.update = update
+        self.resume = resume
+        self.flush_size = flush_size if flush_size is not None else config.db.FLUSH_SIZE
+        self.wal = wal if wal is not None else config.db.WAL
+        self.prefilter = prefilter if prefilter is not None else config.app.PREFILTER
+        self.strategy = strategy
+        self.record = record
+        self.replay = replay
+        self.latency = latency
+        self.progress = progress
+        self.progress_interval = (progress_interval if progress_interval is not None
+                                  else config.app.PROGRESS_INTERVAL)
+        self.progress_stream: TextIO = None
+        self.parsers = parsers if parsers is not None else config.app.PARSERS
+        self.queue_size = queue_size if queue_size is not None else config.app.QUEUE_SIZE
+        self.processes = processes if processes is not None else config.app.PROCESSES
+        self.chunk_size = chunk_size if chunk_size is not None else config.app.CHUNK_SIZE
         return
 
     def run(self):
         """
         Runs the main function that creates the database.
+
+        In update mode, the existing database is kept and only the
+        matchups of players whose tournament history changed are crawled
+        again.  In resume mode, the existing database is kept and only the
+        matchups that were not completed by a previous run are crawled.
         """
         # Delete the database if it already exists to ensure a fresh start
-        if os.path.exists(self.dbname):
-            os.remove(self.dbname)
+        fresh = not (self.update or self.resume)
+        if fresh:
+            for filename in [self.dbname, f"{self.dbname}-wal", f"{self.dbname}-shm"]:
+                if os.path.exists(filename):
+                    os.remove(filename)
 
-        # Create and connect to the new SQLite database
-        with sqlite3.connect(self.dbname) as con:
-            self.create_tables(con)
+        # Serve unchanged pages from the page cache instead of downloading
+        # them again
+        if self.use_cache and not self.replay:
+            fetcher.cache = PageCache.from_config(config.cache)
+        fetcher.reset_counts()
+        metrics.reset()
+
+        # Write progress records of the crawl
+        if self.progress == "-":
+            self.progress_stream = sys.stderr
+        elif self.progress:
+            self.progress_stream = open(self.progress, "a", encoding="utf-8")
+
+        # Record the pages, or replay them without going to the network
+        if self.record:
+            fetcher.archive = Archive(self.record, "record")
+        elif self.replay:
+            fetcher.archive = Archive(self.replay, "replay", self.latency)
+
+        try:
+            # Create and connect to the SQLite database
+            with sqlite3.connect(self.dbname) as con:
+                self.configure(con)
+                self.create_tables(con)
+
+                # Create a Club object using the given club ID and write it
+                # to the database.  An update needs the current club page and
+                # active player list, not the cached ones.
+                if self.update:
+                    self.invalidate(Club.get_url(self.clubid))
+                club = Club(self.clubid)
+                self.add_club(con, club)
+
+                # Get the active players associated with the club
+                if self.update:
+                    self.invalidate(club.active_players_url)
+                players = list(club.get_active_players())
+
+                if self.strategy == "crosstables":
+                    # Plan the tournaments, then add all the players to the
+                    # database, or update them, and read the crosstables
+                    tids = self.plan_tournaments(con, players)
+                    with DatabaseWriter(con, self.flush_size) as writer:
+                        if not self.update:
+                            writer.add_players(players)
+                        self.crawl_tournaments(writer, tids, players)
+                        self.save_updated_players(writer, players)
+                else:
+                    # Plan the head-to-head matchups
+                    pairs = self.plan_pairs(con, players)
 
-            # Create a Club object using the given club ID and write it
-            # to the database
-            club = Club(self.clubid)
-            self.add_club(con, club)
+                    # Add all the players to the database, or update them,
+                    # and then do the head-to-head matchups
+                    with DatabaseWriter(con, self.flush_size) as writer:
+                        if not self.update:
+                            writer.add_players(players)
+                        self.crawl_pairs(writer, pairs, fresh)
+                        self.save_updated_players(writer, players)
 
-            # Insert active players associated with the club into the database
-            players = list(club.get_active_players())
+                # Index the games once they are loaded.  The summaries
+                # table has been kept up to date as the games were written.
+                self.create_indexes(con)
+        finally:
+            print(f"LOG: {str(fetcher)}")
+            if fetcher.cache is not None:
+                print(f"LOG: {str(fetcher.cache)}")
+                fetcher.cache.close()
+                fetcher.cache = None
+            if fetcher.archive is not None:
+                print(f"LOG: {len(fetcher.archive)} pages in {fetcher.archive.path}")
+                fetcher.archive.close()
+                fetcher.archive = None
+            if self.progress_stream not in (None, sys.stderr):
+                self.progress_stream.close()
+            self.progress_stream = None
+        return
+
+    def save_updated_players(self, writer: DatabaseWriter, players: List[Player]):
+        """
+        In an update, saves the players' new event counts and last events,
+        once the games of the changed players have been committed.  Until
+        then the players still look changed, so an interrupted update is
+        done again by the next one.
+        """
+        if not self.update:
+            return
+        writer.flush()
+        writer.add_players(players)
 
-            # First, add all the players to the database
-            for player in players:
-                self.add_player(con, player)
+    def plan_pairs(self, con: sqlite3.Connection, players: List[Player]) -> List[Tuple[Player, Player]]:
+        """
+        Plans the head-to-head matchups so that each unordered pair of
+        players is fetched only once.  An update only needs the pairs in
+        which at least one player has played since the last run, and a
+        resumed crawl only needs the pairs that were not completed.  With
+        the prefilter, only the pairs of players who were in the same
+        tournament are kept.
+        """
+        pairs = list(get_player_pairs(players))
+        if self.update:
+            changed = self.get_changed_players(con, players)
+            pairs = [(player, opponent) for player, opponent in pairs
+                     if player.id in changed or opponent.id in changed]
+            print(f"LOG: {len(changed)} of {len(players)} players changed")
+            for id in changed:
+                self.invalidate_history(id)
+        elif self.resume:
+            completed = self.get_completed_pairs(con)
+            pairs = [(player, opponent) for player, opponent in pairs
+                     if self.pair_key(player.id, opponent.id) not in completed]
+            print(f"LOG: resuming, {len(completed)} pairs already completed")
+        if self.prefilter:
+            pairs = self.prefilter_pairs(players, pairs)
+        if self.update:
+            for player, opponent in pairs:
+                self.invalidate(get_head_to_head_url(player.id, opponent.id))
+        print(f"LOG: {len(pairs)} head-to-head requests planned"
+              f" for {len(players)} players")
+        return pairs
 
-            # Now do the head-to-head matchups
-            for i in range(len(players)-1):
-                player = players[i]
+    def prefilter_pairs(self, players: List[Player],
+                        pairs: List[Tuple[Player, Player]]) -> List[Tuple[Player, Player]]:
+        """
+        Reads the tournament history of each player, one page request per
+        player instead of one per pair, and keeps only the pairs of players
+        who share a tournament.  A player whose history cannot be read is
+        kept in all of their pairs.
+        """
+        if not pairs:
+            return pairs
+        index = TournamentIndex()
+        crawler = Crawler(self.workers, self.budget)
+        for player, history in crawler.histories(players):
+            if isinstance(history, Exception):
+                print(f"LOG: tournament history of {player.id} failed: {history}")
+                index.add_unknown(player.id)
+            else:
+                index.add(player.id, history.tids)
+        filtered = index.filter(pairs)
+        print(f"LOG: prefilter kept {len(filtered)} of {len(pairs)} pairs")
+        return filtered
+
+    def crawl_pairs(self, writer: DatabaseWriter, pairs: List[Tuple[Player, Player]], fresh: bool):
+        """
+        Crawls the head-to-head matchups of the planned pairs.  The crawler
+        fetches and parses the pages, possibly on several threads or
+        processes, while this thread remains the only one writing to the
+        database.
+        """
+        crawler = self.get_crawler()
+        HeadToHead.reset_counts()
+        progress = self.new_progress(len(pairs))
+        previous = None
+        failures = 0
+        for player, opponent, head_to_head in crawler.crawl(pairs):
+            if progress is not None:
+                progress.update()
+            if player is not previous:
                 current_time = datetime.now().strftime("%H:%M:%S")
                 print(f"LOG: {current_time} {str(player)}")
+                previous = player
 
-                # Do the head-to-head matchup between this player and
-                # all others
-                for j in range(1, len(players)):
-                    opponent = players[j]
-
-                    # Parse the head-to-head matchup page
-                    head_to_head = HeadToHead(player.id, opponent.id)
-                    for game in head_to_head.games:
-                        
-                        # Store the game and its inversion
-                        self.add_game(con, game)
-                        game.invert()
-                        self.add_game(con, game)
-
-        # Create the summaries table from the games table
-        self.create_summaries(con)
-        
-        
+            # Record a failed pair so that it can be retried by --resume
+            if isinstance(head_to_head, Exception):
+                print(f"LOG: {player.id} vs {opponent.id} failed: {head_to_head}")
+                writer.add_crawl_failure(player.id, opponent.id, head_to_head)
+                failures += 1
+                continue
+
+            # Store the games from both players' perspectives, replacing
+            # any that were stored by a previous run
+            writer.add_head_to_head(player.id, opponent.id, head_to_head.games,
+                                    replace=not fresh)
+
+        writer.flush()
+        if progress is not None:
+            progress.finish()
+        print(f"LOG: {HeadToHead.counts()}")
+        if failures:
+            print(f"LOG: {failures} head-to-head requests failed;"
+                  f" run again with --resume to retry them")
+        return
+
+    def plan_tournaments(self, con: sqlite3.Connection, players: List[Player]) -> List[str]:
+        """
+        Plans the tournaments whose crosstables are read: those in which at
+        least two of the players played, according to their tournament
+        histories and last events.  The tournaments stored by a previous
+        run are complete, so they are skipped, except in an update for
+        the tournaments of the players who changed.
+        """
+        changed = self.get_changed_players(con, players) if self.update else set()
+        for id in changed:
+            self.invalidate_history(id)
+
+        index = TournamentIndex()
+        crawler = Crawler(self.workers, self.budget)
+        for player, history in crawler.histories(players):
+            if player.last_event:
+                index.add(player.id, [player.last_event])
+            if isinstance(history, Exception):
+                print(f"LOG: tournament history of {player.id} failed: {history}")
+            else:
+                index.add(player.id, history.tids)
+        tids = index.tournaments()
+
+        if not (self.update or self.resume):
+            print(f"LOG: {len(tids)} crosstables planned for {len(players)} players")
+            return tids
+        stored = {id for id, in con.execute("SELECT id FROM tournaments")}
+        planned = [tid for tid in tids
+                   if tid not in stored or index.players[tid] & changed]
+        print(f"LOG: {len(planned)} of {len(tids)} crosstables planned"
+              f" for {len(players)} players")
+        return planned
+
+    def crawl_tournaments(self, writer: DatabaseWriter, tids: List[str], players: List[Player]):
+        """
+        Reads the crosstables of the planned tournaments and stores the
+        games played between the players.
+        """
+        ids = {player.id for player in players}
+        # The async engine only crawls pairs
+        crawler = Crawler(self.workers, self.budget) if self.engine == "async" else self.get_crawler()
+        progress = self.new_progress(len(tids))
+        failures = 0
+        for tid, crosstable in crawler.crosstables(tids):
+            if progress is not None:
+                progress.update()
+            if isinstance(crosstable, Exception):
+                print(f"LOG: crosstable of {tid} failed: {crosstable}")
+                failures += 1
+                continue
+            games = [game for game in crosstable.games
+                     if game.player_id in ids and game.opponent_id in ids]
+            current_time = datetime.now().strftime("%H:%M:%S")
+            print(f"LOG: {current_time} {tid} {crosstable.name}: {len(games)} games")
+            writer.add_tournament(crosstable, games)
+
+        writer.flush()
+        if progress is not None:
+            progress.finish()
+        if failures:
+            print(f"LOG: {failures} crosstables failed;"
+                  f" run again with --resume to retry them")
         return
 
+    def new_progress(self, total: int) -> Progress:
+        """
+        Returns a Progress for a crawl of total items, or None if progress
+        records were not asked for
+        """
+        if self.progress_stream is None:
+            return None
+        parsers = self.parsers if self.engine == "pipeline" else self.workers
+        return Progress(total, self.progress_stream, self.workers, self.progress_interval, parsers)
+
+    def invalidate(self, url: str):
+        """
+        Expires a page in the page cache, if there is one, so that it is
+        revalidated with the server, and downloaded again if it changed
+        """
+        if fetcher.cache is not None:
+            fetcher.cache.expire(url)
+
+    def invalidate_history(self, id: str):
+        """
+        Expires every page of a player's tournament history in the page
+        cache, since new events shift the older ones onto the later pages
+        """
+        if fetcher.cache is not None:
+            fetcher.cache.expire_pages(TournamentHistory.get_url(id))
+
+    def get_crawler(self):
+        """
+        Returns the crawler for the selected fetch engine
+        """
+        if self.engine == "async":
+            # Import here so that aiohttp is only needed for async crawling
+            from chess_clubs.async_crawler import AsyncCrawler
+            return AsyncCrawler(concurrency=self.workers)
+        if self.engine == "pipeline":
+            return Pipeline(self.workers, self.parsers, self.budget, self.queue_size,
+                            self.processes, self.chunk_size)
+        return Crawler(self.workers, self.budget)
+
     #   ========================================================
     #   Database methods
     #   ========================================================
 
+    def configure(self, con: sqlite3.Connection):
+        """
+        Sets the journal mode and synchronous level of the database
+        """
+        if self.wal:
+            con.execute("PRAGMA journal_mode = WAL")
+            con.execute("PRAGMA synchronous = NORMAL")
+        return
+
     def add_club(self, con: sqlite3.Connection, club: Club):
         """ 
         Adds the club to the database if it is not already there
@@ -94,64 +453,49 @@ class Main():
         con.commit()
         return
 
-    def add_game(self, con: sqlite3.Connection, game: Game):
+    def get_completed_pairs(self, con: sqlite3.Connection) -> Set[Tuple[str, str]]:
         """
-        Adds this game to the database
+        Returns the pairs whose head-to-head matchup was crawled
+        successfully by a previous run, as keys from pair_key(), so that
+        they are found whatever the order of the active player list
         """
-        cur = con.cursor()
+        sql = """ SELECT pid, oid FROM crawl_state WHERE status='done' """
+        return {self.pair_key(pid, oid) for pid, oid in con.execute(sql)}
 
-        # Insert game details into the database
-        sql = """
-        
-        INSERT INTO games (pid, oid, tid, sname, rnumber, color, result)
-        VALUES(?, ?, ?, ?, ?, ?, ?)
-        
+    @staticmethod
+    def pair_key(pid: str, oid: str) -> Tuple[str, str]:
         """
-        cur.execute(sql, (game.player_id,
-                          game.opponent_id,
-                          game.tid,
-                          game.sname,
-                          game.rnumber,
-                          game.color,
-                          game.result))
-        con.commit()
-        return
+        Returns the key of an unordered pair of players
+        """
+        return (pid, oid) if pid <= oid else (oid, pid)
 
-    def add_player(self, con: sqlite3.Connection, player: Player):
+    def get_changed_players(self, con: sqlite3.Connection, players: List[Player]) -> Set[str]:
         """
-        Adds the player to the database if it is not already there
+        Returns the IDs of the players who are new, or whose event count or
+        last event changed since the database was last built
         """
-        cur = con.cursor()
+        sql = """ SELECT id, event_count, last_event FROM players """
+        previous = {}
+        for id, event_count, last_event in con.execute(sql):
+            previous[id] = (str(event_count), last_event)
 
-        # Check whether the player already exists in the database
-        sql = """ SELECT 1 FROM players WHERE id=? """
-        cur.execute(sql, (player.id,))
-        if cur.fetchone() is not None:
-            return
-
-        # Insert player details into the database
-        sql = """
-            
-        INSERT INTO players (id, name, state, date, rating, event_count, last_event)
-        VALUES(?, ?, ?, ?, ?, ?, ?)    
-    
-        """
-        cur.execute(sql, (player.id,
-                          player.name,
-                          player.state,
-                          player.date,
-                          player.rating,
-                          player.event_count,
-                          player.last_event))
-        con.commit()
-        return
+        changed = set()
+        for player in players:
+            current = (str(player.event_count), player.last_event)
+            if previous.get(player.id) != current:
+                changed.add(player.id)
+        return changed
 
     def create_summaries(self, con:sqlite3.Connection):
         """
-        Creates the summaries table from the games table
+        Creates the summaries table from the games table, replacing any
+        summaries that are already there.  The triggers keep the summaries
+        up to date after that, so this is only needed to repair them.
         """
         sql = """
         
+        DELETE FROM summaries;
+
         INSERT INTO summaries (pid, oid, wins, losses, draws)
         SELECT
             pid,
@@ -164,10 +508,66 @@ class Main():
         
         """
         cur = con.cursor()
-        cur.execute(sql)
+        cur.executescript(sql)
         con.commit()
         return
 
+    def verify_summaries(self, con: sqlite3.Connection) -> List[Tuple]:
+        """
+        Checks the summaries table against a full recompute from the games
+        table, and checks that every summary has a mirror image from the
+        opponent's perspective.
+
+        Returns:
+            List[Tuple]: A (problem, pid, oid, wins, losses, draws) tuple
+            for each summary that is wrong, missing or unmatched.  The list
+            is empty if the summaries are correct.
+        """
+        sql = """
+        
+        WITH expected AS (
+            SELECT
+                pid,
+                oid,
+                SUM(CASE WHEN result = 'W' THEN 1 ELSE 0 END) AS wins,
+                SUM(CASE WHEN result = 'L' THEN 1 ELSE 0 END) AS losses,
+                SUM(CASE WHEN result = 'D' THEN 1 ELSE 0 END) AS draws
+            FROM        games
+            GROUP BY    pid, oid
+        ),
+        actual AS (
+            SELECT pid, oid, wins, losses, draws FROM summaries
+        ),
+        mirrored AS (
+            SELECT oid, pid, losses, wins, draws FROM summaries
+        )
+        SELECT 'missing', * FROM (SELECT * FROM expected EXCEPT SELECT * FROM actual)
+        UNION ALL
+        SELECT 'wrong', * FROM (SELECT * FROM actual EXCEPT SELECT * FROM expected)
+        UNION ALL
+        SELECT 'unmatched', * FROM (SELECT * FROM actual EXCEPT SELECT * FROM mirrored)
+        ORDER BY 2, 3;
+        
+        """
+        return con.execute(sql).fetchall()
+
+    def verify(self) -> List[Tuple]:
+        """
+        Verifies the summaries of the existing database.
+
+        Returns:
+            List[Tuple]: The problems found by verify_summaries().
+
+        Raises:
+            FileNotFoundError: If the database does not exist.
+        """
+        if not os.path.exists(self.dbname):
+            raise FileNotFoundError(self.dbname)
+        with sqlite3.connect(self.dbname) as con:
+            problems = self.verify_summaries(con)
+        con.close()
+        return problems
+
     def create_tables(self, con: sqlite3.Connection):
         """
         Creates the database and tables
@@ -175,13 +575,13 @@ class Main():
         # SQL script to create necessary tables for clubs and players
         sql = """
             
-        CREATE TABLE clubs (
+        CREATE TABLE IF NOT EXISTS clubs (
             id          TEXT NOT NULL PRIMARY KEY, -- Unique Club ID
             name        TEXT,       -- Name of the club
             url         TEXT        -- Source URL for club information
         );
 
-        CREATE TABLE games (
+        CREATE TABLE IF NOT EXISTS games (
             pid         TEXT,       -- Player id
             oid         TEXT,       -- Opponent id
             tid         TEXT,       -- Tournament ID
@@ -191,7 +591,7 @@ class Main():
             result      TEXT        -- Result ("W" for win, "L" for loss, "D" for draw)
         );
         
-        CREATE TABLE players (
+        CREATE TABLE IF NOT EXISTS players (
             id          TEXT NOT NULL PRIMARY KEY, -- Unique Player ID
             name        TEXT,       -- Player's name
             state       TEXT,       -- Player's state of residence
@@ -201,7 +601,7 @@ class Main():
             last_event  TEXT        -- Last tournament played
         );
         
-        CREATE TABLE summaries (
+        CREATE TABLE IF NOT EXISTS summaries (
             pid         TEXT NOT NULL,  -- Unique ID of player 1
             oid         TEXT NOT NULL,  -- Unique ID of player 2
             wins        INT,        -- Number of wins
@@ -210,7 +610,17 @@ class Main():
             PRIMARY KEY (pid, oid)
         );
         
-        CREATE TABLE tournaments (
+        CREATE TABLE IF NOT EXISTS crawl_state (
+            pid         TEXT NOT NULL,  -- Unique ID of player 1
+            oid         TEXT NOT NULL,  -- Unique ID of player 2
+            status      TEXT,       -- "done" or "failed"
+            attempts    INT,        -- Number of attempts so far
+            last_error  TEXT,       -- Error from the last failed attempt
+            updated     TEXT,       -- Time of the last attempt
+            PRIMARY KEY (pid, oid)
+        );
+        
+        CREATE TABLE IF NOT EXISTS tournaments (
             id          TEXT NOT NULL PRIMARY KEY, -- Unique Tournament ID
             name        TEXT,       -- Tournament name
             location    TEXT,       -- Location
@@ -224,4 +634,99 @@ class Main():
         """
         cur = con.cursor()
         cur.executescript(sql)  # Execute the SQL script to create tables
+        self.create_games_key(con)
+        self.create_summary_triggers(con)
+        return
+
+    def create_summary_triggers(self, con: sqlite3.Connection):
+        """
+        Creates the triggers that keep the summaries table up to date as
+        games are inserted and deleted.  Every game is stored from both
+        perspectives, so both players' summaries are maintained.  In a
+        database built by an older version, the summaries are rebuilt once
+        when the triggers are created.
+        """
+        sql = """ SELECT 1 FROM sqlite_master WHERE type='trigger' AND name='games_insert' """
+        if con.execute(sql).fetchone() is not None:
+            return
+
+        sql = """
+        
+        CREATE TRIGGER games_insert AFTER INSERT ON games
+        BEGIN
+            INSERT INTO summaries (pid, oid, wins, losses, draws)
+            VALUES (NEW.pid,
+                    NEW.oid,
+                    NEW.result IS 'W',
+                    NEW.result IS 'L',
+                    NEW.result IS 'D')
+            ON CONFLICT(pid, oid) DO UPDATE SET
+                wins = wins + excluded.wins,
+                losses = losses + excluded.losses,
+                draws = draws + excluded.draws;
+        END;
+
+        CREATE TRIGGER games_delete AFTER DELETE ON games
+        BEGIN
+            UPDATE summaries SET
+                wins = wins - (OLD.result IS 'W'),
+                losses = losses - (OLD.result IS 'L'),
+                draws = draws - (OLD.result IS 'D')
+            WHERE pid = OLD.pid AND oid = OLD.oid;
+
+            -- Drop the summary once the pair has no games left
+            DELETE FROM summaries
+            WHERE pid = OLD.pid AND oid = OLD.oid
+            AND NOT EXISTS (
+                SELECT 1 FROM games WHERE pid = OLD.pid AND oid = OLD.oid
+            );
+        END;
+        
+        """
+        cur = con.cursor()
+        cur.executescript(sql)
+        self.create_summaries(con)
+        return
+
+    def create_games_key(self, con: sqlite3.Connection):
+        """
+        Creates the unique index on the natural key of the games table, so
+        that inserting a game that is already there is a no-op.  Duplicate
+        games in a database built by an older version are deleted first.
+        """
+        sql = """ SELECT 1 FROM sqlite_master WHERE type='index' AND name='games_key' """
+        if con.execute(sql).fetchone() is not None:
+            return
+
+        sql = """
+        
+        DELETE FROM games
+        WHERE rowid NOT IN (
+            SELECT MIN(rowid) FROM games
+            GROUP BY pid, oid, tid, sname, rnumber
+        );
+
+        CREATE UNIQUE INDEX games_key ON games (pid, oid, tid, sname, rnumber);
+        
+        """
+        cur = con.cursor()
+        cur.executescript(sql)
+        return
+
+    def create_indexes(self, con: sqlite3.Connection):
+        """
+        Creates the lookup indexes on the games table.  These are built
+        after the games are loaded, so that they do not slow down the inserts.
+        """
+        sql = """
+        
+        -- Covers per-player and per-pair queries, including the summaries
+        CREATE INDEX IF NOT EXISTS games_pair ON games (pid, oid, result);
+
+        -- Per-tournament queries
+        CREATE INDEX IF NOT EXISTS games_tid ON games (tid);
+        
+        """
+        cur = con.cursor()
+        cur.executescript(sql)
         return
@@ -0,0 +1,159 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+from typing import Generator, Iterable, Tuple
+
+from chess_clubs.crosstable import Crosstable
+from chess_clubs.head_to_head import HeadToHead
+from chess_clubs.player import Player
+from chess_clubs.tournament_history import TournamentHistory
+
+
+class Crawler:
+    """
+    Fetches head-to-head matchups concurrently on a bounded thread pool.
+
+    The workers only fetch and parse pages.  The matchups are handed back
+    to the caller in the same order as the planned pairs, so the single
+    thread that owns the database connection sees exactly what a serial
+    run would have produced.
+    """
+
+    def __init__(self, workers: int = 1, budget: float = None):
+        """
+        Initializes a Crawler.
+
+        Args:
+            workers (int, optional): The number of worker threads. One
+            worker means the pairs are fetched serially in the calling thread.
+            budget (float, optional): The maximum number of requests per
+            second that each worker may make. None or zero means no limit.
+        """
+        self.workers: int = max(1, workers)
+        self.budget: float = budget
+        self._local = threading.local()
+
+    def crawl(self, pairs: Iterable[Tuple[Player, Player]]
+              ) -> Generator[Tuple[Player, Player, HeadToHead], None, None]:
+        """
+        Fetches the head-to-head matchup for each pair of players.
+
+        Args:
+            pairs (Iterable[Tuple[Player, Player]]): The planned pairs.
+
+        Returns:
+            Generator[Tuple[Player, Player, HeadToHead], None, None]: A
+            generator yielding (player, opponent, head_to_head) tuples in
+            the order of the planned pairs.  If a pair could not be
+            crawled, head_to_head is the exception that was raised.
+        """
+        for (player, opponent), head_to_head in self.map(self.fetch, pairs):
+            yield player, opponent, head_to_head
+
+    def histories(self, players: Iterable[Player]
+                  ) -> Generator[Tuple[Player, TournamentHistory], None, None]:
+        """
+        Fetches the tournament history of each player.
+
+        Args:
+            players (Iterable[Player]): The players.
+
+        Returns:
+            Generator[Tuple[Player, TournamentHistory], None, None]: A
+            generator yielding (player, history) tuples in the order of the
+            players.  If a history could not be fetched, history is the
+            exception that was raised.
+        """
+        for (player,), history in self.map(self.fetch_history, ((player,) for player in players)):
+            yield player, history
+
+    def crosstables(self, tids: Iterable[str]
+                    ) -> Generator[Tuple[str, Crosstable], None, None]:
+        """
+        Fetches the crosstable of each tournament.
+
+        Args:
+            tids (Iterable[str]): The tournament IDs.
+
+        Returns:
+            Generator[Tuple[str, Crosstable], None, None]: A generator
+            yielding (tid, crosstable) tuples in the order of the tournament
+            IDs.  If a crosstable could not be fetched, crosstable is the
+            exception that was raised.
+        """
+        for (tid,), crosstable in self.map(self.fetch_crosstable, ((tid,) for tid in tids)):
+            yield tid, crosstable
+
+    def map(self, fn, items: Iterable[tuple]) -> Generator[Tuple[tuple, object], None, None]:
+        """
+        Calls fn(*args) for each tuple of arguments on the worker threads,
+        yielding (args, result) tuples in the order of the items.
+        """
+        if self.workers == 1:
+            for args in items:
+                yield args, self.attempt(fn, *args)
+            return
+
+        # Keep only a bounded number of calls in flight, so that a slow
+        # consumer does not let fetched pages pile up in memory
+        max_pending = 2 * self.workers
+        pending = deque()
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            for args in items:
+                future = executor.submit(self.attempt, fn, *args)
+                pending.append((args, future))
+                if len(pending) >= max_pending:
+                    args, future = pending.popleft()
+                    yield args, future.result()
+            while pending:
+                args, future = pending.popleft()
+                yield args, future.result()
+
+    def attempt(self, fn, *args):
+        """
+        Calls fn(*args), returning the exception instead of raising it if
+        the attempt fails, so that one bad pair does not stop the crawl.
+        """
+        try:
+            return fn(*args)
+        except Exception as e:
+            return e
+
+    def fetch(self, player: Player, opponent: Player) -> HeadToHead:
+        """
+        Fetches and parses one head-to-head matchup, staying within the
+        request budget of the calling worker.
+        """
+        self.throttle()
+        return HeadToHead(player.id, opponent.id)
+
+    def fetch_history(self, player: Player) -> TournamentHistory:
+        """
+        Fetches and parses the tournament history of one player, staying
+        within the request budget of the calling worker.
+        """
+        self.throttle()
+        return TournamentHistory(player.id)
+
+    def fetch_crosstable(self, tid: str) -> Crosstable:
+        """
+        Fetches and parses the crosstable of one tournament, staying within
+        the request budget of the calling worker.
+        """
+        self.throttle()
+        return Crosstable(tid)
+
+    def throttle(self):
+        """
+        Sleeps as long as needed to keep the calling worker within its
+        request budget.
+        """
+        if not self.budget:
+            return
+        interval = 1.0 / self.budget
+        last = getattr(self._local, "last", None)
+        now = time.monotonic()
+        if last is not None and now - last < interval:
+            time.sleep(interval - (now - last))
+        self._local.last = time.monotonic()
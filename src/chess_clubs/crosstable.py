@@ -0,0 +1,148 @@
+import re
+from typing import Dict, List, Tuple
+
+from bs4 import BeautifulSoup
+from name_formatter import FormattedName
+
+from chess_clubs import config, get_page
+from chess_clubs.game import Game
+from chess_clubs.game_factory import GameFactory
+from chess_clubs.metrics import metrics
+
+
+class Crosstable:
+    """
+    The crosstable of a tournament, which holds every game of every section.
+
+    The page starts with a table of event details, followed by the
+    crosstable of each section as preformatted text, in which each player
+    takes two lines:
+
+    |    1 | TYLER SHANE HUG                 |1.5  |W   3|D   4|L   2|
+    |   NC | 30403332 / R: 1801   ->1795     |     |  W  |  B  |  W  |
+
+    The first line has the pair number, name, score and, for each round,
+    the result and the pair number of the opponent.  The second line has
+    the USCF ID and the color played in each round.  Only rounds with a
+    result of W, L or D were played over the board; forfeits and byes
+    are not games.
+    """
+
+    # Labels of the rows of the event details table
+    DETAILS = {
+        "Event": "name",
+        "Location": "location",
+        "Event Date(s)": "date",
+        "Sponsoring Affiliate": "club_id",
+        "Chief TD": "chief_td_id",
+        "Stats": "stats",
+    }
+
+    def __init__(self, tid: str, html: str = None):
+        """
+        Initializes a Crosstable by parsing the crosstable page.
+
+        Args:
+            tid (str): The tournament ID.
+            html (str, optional): The HTML of the crosstable page, if it
+            has already been fetched. Otherwise it is fetched from USCF.
+        """
+        self.tid: str = tid
+        self.name: str = None           # Tournament name
+        self.location: str = None       # Location
+        self.date: str = None           # Date
+        self.club_id: str = None        # Sponsoring club ID
+        self.chief_td_id: str = None    # ID of chief tournament director
+        self.n_sections: int = None     # Number of sections
+        self.n_players: int = None      # Number of players
+        self.games: List[Game] = []     # Each game once, from one side
+
+        if html is None:
+            html = get_page(self.get_url(tid))
+        with metrics.timer("parse.seconds"):
+            soup = BeautifulSoup(html, 'html.parser')
+            self.parse_details(soup)
+            for pre in soup.find_all("pre"):
+                heading = pre.find_previous(string=re.compile(r"Section \d+ - "))
+                sname = heading.split(" - ", 1)[1].strip() if heading else ""
+                self.games.extend(self.parse_section(sname, pre.get_text()))
+
+    @staticmethod
+    def get_url(tid: str) -> str:
+        """
+        Returns the URL of the crosstable of all sections of a tournament.
+        """
+        return f"{config.net.BASE_URL}/msa/XtblMain.php?{tid}.0"
+
+    def parse_details(self, soup: BeautifulSoup):
+        """
+        Extracts the tournament details from the table at the top of the page.
+        """
+        for tr in soup.find_all("tr"):
+            tds = tr.find_all("td", recursive=False)
+            if len(tds) != 2:
+                continue
+            field = self.DETAILS.get(tds[0].get_text(strip=True))
+            if field is None:
+                continue
+            value = tds[1].get_text(" ", strip=True)
+            if field == "name":
+                # The name is followed by the tournament ID in parentheses
+                self.name = re.sub(r"\s*\(\d+\)$", "", value)
+            elif field in ("club_id", "chief_td_id"):
+                m = re.search(r"\((\w+)\)$", value)
+                setattr(self, field, m.group(1) if m else None)
+            elif field == "stats":
+                m = re.search(r"(\d+) Section\(s\),\s*(\d+) Players", value)
+                if m:
+                    self.n_sections = int(m.group(1))
+                    self.n_players = int(m.group(2))
+            else:
+                setattr(self, field, value)
+
+    def parse_section(self, sname: str, text: str) -> List[Game]:
+        """
+        Parses the crosstable of one section.
+
+        Args:
+            sname (str): The section name.
+            text (str): The preformatted text of the crosstable.
+
+        Returns:
+            List[Game]: The games of the section, each one once, from the
+            side of the player with the lower pair number.
+        """
+        # Pair number -> (USCF ID, name, results, colors)
+        players: Dict[int, Tuple[str, str, List[str], List[str]]] = {}
+        lines = [line for line in text.splitlines() if line.startswith("|")]
+        for first, second in zip(lines, lines[1:]):
+            cells = first.split("|")
+            if len(cells) < 5 or not cells[1].strip().isdigit():
+                continue
+            below = second.split("|")
+            if len(below) < 5:
+                continue
+            m = re.match(r"\s*(\d+)\s*/", below[2])
+            if m is None:
+                continue
+            colors = [cell.strip() for cell in below[4:-1]]
+            results = [cell.strip() for cell in cells[4:-1]]
+            players[int(cells[1])] = (m.group(1), cells[2].strip(), results, colors)
+
+        games = []
+        for pair, (id, name, results, colors) in players.items():
+            for rnumber, result in enumerate(results, 1):
+                m = re.match(r"([WLD])\s*(\d+)$", result)
+                if m is None:
+                    continue
+                opponent = int(m.group(2))
+                if opponent <= pair or opponent not in players:
+                    continue
+                oid, oname = players[opponent][:2]
+                color = colors[rnumber - 1] if rnumber <= len(colors) else ""
+                href = f"XtblMain.php?{self.tid}"
+                cells = [self.name, sname, str(rnumber), color, oid, oname, "", m.group(1)]
+                game = GameFactory.from_values(id, href, cells)
+                game.player_name = FormattedName(name).get_last_first()
+                games.append(game)
+        return games
@@ -0,0 +1,300 @@
+import codecs
+import re
+import threading
+import time
+from typing import Dict
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from chess_clubs.archive import Archive
+from chess_clubs.cache import PageCache
+from chess_clubs.config import NetConfig
+from chess_clubs.metrics import metrics
+from chess_clubs.rate_limiter import RETRY_STATUSES, RateLimiter, backoff_delay, parse_retry_after
+
+CHARSET_PATTERN = re.compile(rb"""charset\s*=\s*["']?([A-Za-z0-9._:-]+)""")
+
+
+def find_charset(text: bytes) -> str:
+    """
+    Returns the charset named in a Content-Type header or in the <meta>
+    tags at the start of a page.
+
+    Args:
+        text (bytes): The header, or the start of the page.
+
+    Returns:
+        str: The normalized name of the encoding.
+        None: If no known charset is named.
+    """
+    match = CHARSET_PATTERN.search(text)
+    if match is None:
+        return None
+    try:
+        return codecs.lookup(match.group(1).decode("ascii")).name
+    except LookupError:
+        return None
+
+
+class Fetcher:
+    """
+    Fetches web pages over a pooled, keep-alive requests.Session, within
+    the request rate allowed by a shared RateLimiter.
+
+    A single Fetcher is shared by every thread of the program.  The
+    session is created on first use, and its connection pool lets the
+    threads reuse open connections instead of paying for a new TCP and
+    TLS handshake on every page.
+    """
+
+    def __init__(self, net: NetConfig):
+        """
+        Initializes a Fetcher.
+
+        Args:
+            net (NetConfig): The network settings: retries, timeout,
+            rate limit, pool size, keep-alive and compression.
+        """
+        self.net: NetConfig = net
+        self.limiter: RateLimiter = RateLimiter(net.RATE, net.BURST)
+        self.cache: PageCache = None    # Optional on-disk page cache
+        self.archive: Archive = None    # Optional record or replay archive
+        self.requests: int = 0          # Responses received
+        self.not_modified: int = 0      # 304 responses to conditional requests
+        self.bytes: int = 0             # Body bytes received
+        self.encodings: Dict[str, str] = {}  # Host -> encoding of pages without a charset
+        self._session: requests.Session = None
+        self._lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+
+    @property
+    def session(self) -> requests.Session:
+        """
+        Returns the shared session, creating it on first use.
+        """
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    self._session = self.new_session()
+        return self._session
+
+    def new_session(self) -> requests.Session:
+        """
+        Creates a session whose connection pool holds up to
+        net.POOL_SIZE connections per host.
+        """
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.net.POOL_SIZE,
+                              pool_maxsize=self.net.POOL_SIZE,
+                              pool_block=True)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers["Connection"] = "keep-alive" if self.net.KEEP_ALIVE else "close"
+        session.headers["Accept-Encoding"] = "gzip, deflate" if self.net.GZIP else "identity"
+        return session
+
+    def close(self):
+        """
+        Closes the session and all of its pooled connections.
+        """
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+    def get_page(self, url: str) -> str:
+        """
+        Fetches the HTML content of a webpage from a given URL, retrying on
+        timeouts and on responses that ask us to slow down.
+
+        If a page cache is installed, pages are served from it while they
+        are fresh, and newly fetched pages are stored in it.  An expired
+        page is requested with its ETag and Last-Modified validators, so
+        that the server can answer 304 Not Modified instead of sending
+        the page again.
+
+        If an archive is installed, the pages are recorded in it, or, when
+        replaying, served from it alone.
+
+        Args:
+            url (str): The URL of the webpage to fetch.
+
+        Returns:
+            str: The HTML content of the requested webpage.
+
+        Raises:
+            requests.exceptions.RequestException: If the request encounters an error.
+        """
+        if self.archive is not None and self.archive.replaying:
+            return self.archive.get(url)
+        html = self.load(url)
+        if self.archive is not None:
+            self.archive.put(url, html)
+        return html
+
+    def load(self, url: str) -> str:
+        """
+        Returns a page from the cache or the network.
+        """
+        headers = {}
+        if self.cache is not None:
+            html = self.cache.get(url)
+            if html is not None:
+                return html
+            headers = self.conditional_headers(url)
+
+        response = self.fetch(url, headers)
+        if response.status_code == 304:
+            html = self.cache.revalidate(url)
+            if html is not None:
+                return html
+            # The page was evicted meanwhile, so download it after all
+            response = self.fetch(url)
+
+        html = self.decode(url, response.content, response.headers.get("Content-Type"))
+        if self.cache is not None:
+            self.cache.put(url, html,
+                           response.headers.get("ETag"),
+                           response.headers.get("Last-Modified"))
+        return html
+
+    def decode(self, url: str, body: bytes, content_type: str = None) -> str:
+        """
+        Decodes the body of a page, once, without guessing its encoding
+        from the whole body.
+
+        The encoding is the charset of the Content-Type header.  If there
+        is none, it is the configured net.ENCODING, or else the one sniffed
+        from the first page of the host, from its <meta> tags or by
+        detection, and then used for every page of the host.
+
+        Args:
+            url (str): The URL of the page.
+            body (bytes): The body of the response.
+            content_type (str, optional): The Content-Type header.
+
+        Returns:
+            str: The HTML content of the page.
+        """
+        encoding = find_charset(content_type.encode("latin-1")) if content_type else None
+        if encoding is None:
+            encoding = self.net.ENCODING or self.host_encoding(url, body)
+        return body.decode(encoding, errors="replace")
+
+    def host_encoding(self, url: str, body: bytes) -> str:
+        """
+        Returns the encoding of the pages of a host that do not name their
+        charset, sniffing it from the first such page.
+        """
+        host = urlsplit(url).netloc
+        encoding = self.encodings.get(host)
+        if encoding is None:
+            encoding = find_charset(body[:2048])
+            if encoding is None:
+                from charset_normalizer import from_bytes  # Installed with requests
+                best = from_bytes(body).best()
+                encoding = best.encoding if best is not None else "utf-8"
+                if encoding == "ascii":
+                    # An ASCII page says nothing about the other pages
+                    encoding = "utf-8"
+            self.encodings[host] = encoding
+        return encoding
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """
+        Returns the headers of a conditional request for a cached page.
+        """
+        headers = {}
+        etag, modified = self.cache.validators(url)
+        if etag:
+            headers["If-None-Match"] = etag
+        if modified:
+            headers["If-Modified-Since"] = modified
+        return headers
+
+    def count(self, status: int, nbytes: int):
+        """
+        Counts a response and the size of its body.
+        """
+        metrics.observe("fetch.bytes", nbytes)
+        with self._stats_lock:
+            self.requests += 1
+            self.bytes += nbytes
+            if status == 304:
+                self.not_modified += 1
+
+    def reset_counts(self):
+        """
+        Resets the response counts.
+        """
+        with self._stats_lock:
+            self.requests = 0
+            self.not_modified = 0
+            self.bytes = 0
+
+    def __str__(self) -> str:
+        """
+        Returns a string representation of the response counts.
+        """
+        parts = [
+            f'requests="{self.requests}"',
+            f'not_modified="{self.not_modified}"',
+            f'bytes="{self.bytes}"',
+        ]
+        return f"Fetcher({','.join(parts)})"
+
+    def fetch(self, url: str, headers: Dict[str, str] = None) -> requests.Response:
+        """
+        Fetches a page over the network, bypassing the cache.
+
+        Every attempt waits for the shared rate limiter.  Timeouts, and
+        responses saying that the server is throttling us or overloaded,
+        are retried with exponential backoff; the server's Retry-After is
+        honoured, and holds back the other workers too.
+        """
+        MAX_ATTEMPTS = self.net.MAX_ATTEMPTS
+        TIMEOUT = self.net.TIMEOUT
+        RETRY_DELAY = self.net.RETRY_DELAY
+
+        for attempt in range(MAX_ATTEMPTS):
+            last = attempt == MAX_ATTEMPTS - 1
+            self.limiter.acquire()
+            try:
+                # Attempt to fetch the page
+                with metrics.timer("fetch.seconds"):
+                    response = self.session.get(url, timeout=TIMEOUT, headers=headers)
+            except requests.exceptions.Timeout:
+                if last:
+                    # Raise the exception after the last attempt
+                    raise
+                metrics.incr("fetch.retries")
+                # If a timeout occurs and attempts are remaining, retry
+                print(
+                    f"Timeout occurred, retrying... ({attempt + 1}/{MAX_ATTEMPTS})")
+                time.sleep(backoff_delay(attempt, RETRY_DELAY, self.net.MAX_BACKOFF))
+                continue
+
+            if response.status_code in RETRY_STATUSES and not last:
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                delay = backoff_delay(attempt, RETRY_DELAY, self.net.MAX_BACKOFF, retry_after)
+                print(f"HTTP {response.status_code} occurred, retrying in {delay:.1f} s..."
+                      f" ({attempt + 1}/{MAX_ATTEMPTS})")
+                metrics.incr("fetch.retries")
+                self.limiter.pause(delay)
+                continue
+            response.raise_for_status()  # Raise an error for bad status codes
+            self.count(response.status_code, self.body_size(response))
+            return response
+
+    @staticmethod
+    def body_size(response: requests.Response) -> int:
+        """
+        Returns the number of body bytes received, which is less than the
+        length of the content if it was compressed in transit.
+        """
+        length = response.headers.get("Content-Length")
+        if length is not None and length.isdigit():
+            return int(length)
+        return len(response.content)
@@ -6,8 +6,14 @@ class Game:
     Represents a chess game with relevant details such as player names,
     tournament information, round number, color played, opponent details,
     and game result.
+
+    The attributes are stored in slots rather than in a per-instance
+    dictionary, which makes large numbers of games much smaller.
     """
-    
+
+    __slots__ = ("player_id", "player_name", "tname", "tid", "tdate", "sname",
+                 "rnumber", "color", "opponent_id", "opponent_name", "result")
+
     def __init__(self):
         """
         Initializes a Game instance with default None values.
@@ -1,4 +1,6 @@
 import re
+from typing import List
+
 from bs4 import element
 from name_formatter import FormattedName
 from chess_clubs.game import Game
@@ -55,6 +57,33 @@ class GameFactory:
 
         return game
 
+    def from_values(player_id: str, href: str, cells: List[str]) -> Game:
+        """
+        Creates a Game object from the values of a game table row that
+        has already been taken apart by a faster parser than BeautifulSoup.
+        The values are the same as those that from_soup() extracts.
+
+        Args:
+            player_id (str): The unique identifier of the player.
+            href (str): The link to the tournament in the first <td>.
+            cells (List[str]): The stripped text of the eight <td> elements.
+
+        Returns:
+            Game: A fully populated Game object.
+        """
+        assert len(cells) >= 8, f"Expected 8 <td> elements, found {len(cells)}"
+        game = Game()
+        game.player_id = player_id
+        game.tname = cells[0]
+        parse_tid(game, href)
+        game.sname = cells[1]
+        game.rnumber = int(cells[2])
+        parse_color(game, cells[3])
+        game.opponent_id = cells[4]
+        game.opponent_name = FormattedName(cells[5]).get_last_first()
+        game.result = cells[7]
+        return game
+
 #   ============================================================
 #   Parsing Functions
 #   ============================================================
@@ -78,11 +107,13 @@ def parse_first_td(game: Game, td: element.Tag):
 
     href = a.get("href")
     assert href is not None, "Expected a valid href attribute."
+    parse_tid(game, href)
 
-    a = td.find("a")
-    assert a is not None
-    href = a.get("href")
-    assert href is not None
+
+def parse_tid(game: Game, href: str):
+    """
+    Extracts the tournament ID and date from the link to the tournament.
+    """
     parts = href.split("?")
     assert len(parts) == 2
     tid = parts[1]
@@ -118,12 +149,17 @@ def parse_fourth_td(game: Game, td: element.Tag):
 
     Note that this may be empty or U, if color not known (fairly common)
     """
-    color = td.get_text(strip=True)
+    parse_color(game, td.get_text(strip=True))
+
+
+def parse_color(game: Game, color: str):
+    """
+    Stores the color played, using U for anything other than W, B or empty.
+    """
     if color and color not in ['W', 'B']:
         game.color = "U"
     else:
         game.color = color
-    return
 
 
 def parse_fifth_td(game: Game, td: element.Tag):
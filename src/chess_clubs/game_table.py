@@ -0,0 +1,158 @@
+from array import array
+import sqlite3
+from typing import Dict, Iterable, List, Tuple
+
+from chess_clubs.summary import Summary
+
+COLORS = {"W": 0, "B": 1}           # Any other color is coded as 2
+RESULTS = {"W": 0, "L": 1, "D": 2}  # Any other result is coded as 3
+
+# The code of each color and result seen from the other side
+COLOR_INVERSE = [1, 0, 2]
+RESULT_INVERSE = [1, 0, 2, 3]
+
+# The most W/L/D/other counters that count_results() allocates to count
+# every possible pair directly, rather than only the pairs that played
+DENSE_CELLS = 1 << 23
+
+
+class GameTable:
+    """
+    A column-oriented table of games, for analytics over millions of games.
+
+    Each column is a typed array instead of an attribute of a Game object:
+
+    - pid, oid: codes of the player and opponent IDs, indexes into `ids`
+    - tid: the tournament ID as an integer, 0 if unknown
+    - rnumber: the round number, 0 if unknown
+    - color: 0 for White, 1 for Black, 2 if unknown
+    - result: 0 for a win, 1 for a loss, 2 for a draw, 3 for anything else
+
+    The rows are the ones of the games table, and can be loaded from the
+    database or from a crawl without creating a Game object per game.
+    invert() and count_results() work on whole columns with NumPy, which
+    is an optional dependency (`pip install -e .[numpy]`).
+
+    Usage:
+        table = GameTable.from_database(con)
+        pids, oids, wins, losses, draws = table.count_results()
+    """
+
+    def __init__(self):
+        """
+        Initializes an empty GameTable.
+        """
+        self.ids: List[str] = []            # Player ID of each code
+        self.codes: Dict[str, int] = {}     # Code of each player ID
+        self.pid: array = array("i")
+        self.oid: array = array("i")
+        self.tid: array = array("q")
+        self.rnumber: array = array("h")
+        self.color: array = array("b")
+        self.result: array = array("b")
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[tuple]) -> "GameTable":
+        """
+        Creates a GameTable from rows of the games table, such as the
+        GameRows of a crawl.
+        """
+        table = cls()
+        table.extend(rows)
+        return table
+
+    @classmethod
+    def from_database(cls, con: sqlite3.Connection) -> "GameTable":
+        """
+        Creates a GameTable from the games table of a database.
+        """
+        sql = """ SELECT pid, oid, tid, sname, rnumber, color, result FROM games """
+        return cls.from_rows(con.execute(sql))
+
+    def code(self, id: str) -> int:
+        """
+        Returns the code of a player ID, assigning a new one if needed.
+        """
+        code = self.codes.get(id)
+        if code is None:
+            code = self.codes[id] = len(self.ids)
+            self.ids.append(id)
+        return code
+
+    def extend(self, rows: Iterable[tuple]):
+        """
+        Appends rows of the games table: (pid, oid, tid, sname, rnumber,
+        color, result) tuples.  The section name is not kept.
+        """
+        code = self.code
+        colors = COLORS.get
+        results = RESULTS.get
+        pid, oid, tid = self.pid.append, self.oid.append, self.tid.append
+        rnumber, color, result = self.rnumber.append, self.color.append, self.result.append
+        for row in rows:
+            pid(code(row[0]))
+            oid(code(row[1]))
+            tid(int(row[2]) if row[2] else 0)
+            rnumber(row[4] or 0)
+            color(colors(row[5], 2))
+            result(results(row[6], 3))
+
+    def __len__(self) -> int:
+        """
+        Returns the number of games.
+        """
+        return len(self.result)
+
+    def invert(self):
+        """
+        Inverts every game, by swapping the player and opponent columns and
+        mapping the colors and results to the other side.
+        """
+        import numpy as np  # Optional dependency, only needed for GameTable
+
+        self.pid, self.oid = self.oid, self.pid
+        for column, inverse in ((self.color, COLOR_INVERSE), (self.result, RESULT_INVERSE)):
+            values = np.frombuffer(column, dtype=np.int8)
+            values[:] = np.array(inverse, dtype=np.int8)[values]
+            del values  # Release the buffer, so the column can grow again
+
+    def count_results(self) -> Tuple:
+        """
+        Counts the wins, losses and draws of each pair of players, like
+        Summary.update_with() and the summaries table.  Every pair with at
+        least one game is counted, even if none of its games was a win, a
+        loss or a draw.
+
+        Returns:
+            Tuple: NumPy arrays of the player codes, the opponent codes,
+            and the wins, losses and draws of each pair, sorted by player
+            and then opponent code.
+        """
+        import numpy as np  # Optional dependency, only needed for GameTable
+
+        n = len(self.ids)
+        pid = np.frombuffer(self.pid, dtype=np.int32).astype(np.int64)
+        oid = np.frombuffer(self.oid, dtype=np.int32)
+        result = np.frombuffer(self.result, dtype=np.int8)
+        key = pid * n + oid
+        if 4 * n * n <= min(max(len(key), 1 << 16), DENSE_CELLS):
+            # Few enough players to count every possible pair directly,
+            # with no more counters than games
+            counts = np.bincount(key * 4 + result, minlength=n * n * 4).reshape(-1, 4)
+            pairs = np.flatnonzero(counts.any(axis=1))
+            counts = counts[pairs]
+        else:
+            pairs, inverse = np.unique(key, return_inverse=True)
+            counts = np.bincount(inverse * 4 + result, minlength=len(pairs) * 4).reshape(-1, 4)
+        return pairs // n, pairs % n, counts[:, 0], counts[:, 1], counts[:, 2]
+
+    def summaries(self) -> List[Summary]:
+        """
+        Returns the Summary of each pair of players with at least one game.
+        """
+        summaries = []
+        for pid, oid, wins, losses, draws in zip(*(column.tolist() for column in self.count_results())):
+            summary = Summary(self.ids[pid], self.ids[oid])
+            summary.wins, summary.losses, summary.draws = wins, losses, draws
+            summaries.append(summary)
+        return summaries
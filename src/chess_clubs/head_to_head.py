@@ -1,36 +1,214 @@
 import re
-from typing import List
+import threading
+from typing import List, NamedTuple
 
-from bs4 import BeautifulSoup
-from chess_clubs import get_head_to_head_url, get_page
+from bs4 import BeautifulSoup, SoupStrainer
+from chess_clubs import config, get_head_to_head_url, get_page
 from chess_clubs.game import Game
 from chess_clubs.game_factory import GameFactory
+from chess_clubs.metrics import metrics
+from chess_clubs.row_parser import GameRowParser, LayoutError
+from chess_clubs.writer import DatabaseWriter
+
+
+class GameRows(NamedTuple):
+    """
+    The games of a head-to-head matchup as rows of the games table, which
+    are much cheaper to send between processes than Game objects.
+    """
+    player_id: str
+    opponent_id: str
+    games: List[tuple]     # From the player's perspective
 
 
 class HeadToHead:
     """
     Collects games for a specified pair of opponents
+
+    The page can be parsed with one of several backends, which all produce
+    identical games:
+
+    - "html.parser": BeautifulSoup with Python's own HTML parser
+    - "lxml": BeautifulSoup with the lxml tree builder, keeping only <tr> elements
+    - "xpath": lxml.html directly, finding the game rows with XPath
+    - "stream": GameRowParser, which builds no tree at all and falls back
+      to "html.parser" if the page does not have the expected layout
+
+    The lxml backends need the optional lxml package.
+
+    Most pairs of players have never played each other, so a page without
+    any link to a tournament crosstable is recognised before it reaches
+    any parser.  The class counts how many pages took this fast path.
     """
 
-    def __init__(self, player_id: str, opponent_id: str):
+    PARSERS = ("html.parser", "lxml", "xpath", "stream")
+    GAME_MARKER = "XtblMain"    # Every game row links to its crosstable
+
+    # Counts of the pages parsed, and of the empty pages that were skipped
+    pages: int = 0
+    empty_pages: int = 0
+    _lock = threading.Lock()
+
+    def __init__(self, player_id: str, opponent_id: str, html: str = None, parser: str = None):
+        """
+        Initializes a HeadToHead instance by parsing the head-to-head
+        matchup page.
+
+        Args:
+            player_id (str): The unique identifier of the player.
+            opponent_id (str): The unique identifier of the opponent.
+            html (str, optional): The HTML of the matchup page, if it has
+            already been fetched. Otherwise it is fetched from USCF.
+            parser (str, optional): The parser backend, one of PARSERS.
+            Defaults to config.app.PARSER.
+        """
         self.player_id: str = player_id
         self.opponent_id: str = opponent_id
         self.games: List[Game] = []
         
         # Get the HTML of the head-to-head matchup page
-        html = self.get_html()
-        soup = BeautifulSoup(html, 'html.parser')
-        
+        if html is None:
+            html = self.get_html()
+
+        # Skip the parser entirely for a page with no games
+        empty = self.GAME_MARKER not in html
+        self.count(empty)
+        if not empty:
+            with metrics.timer("parse.seconds"):
+                self.games = self.parse(html, parser)
+        metrics.observe("pair.games", len(self.games))
+
+    def parse(self, html: str, parser: str = None) -> List[Game]:
+        """
+        Parses the games with the selected backend.
+
+        Args:
+            html (str): The HTML of the matchup page.
+            parser (str, optional): The parser backend, one of PARSERS.
+            Defaults to config.app.PARSER.
+
+        Returns:
+            List[Game]: The games, from the player's perspective.
+        """
+        if parser is None:
+            parser = config.app.PARSER
+        if parser == "stream":
+            return self.parse_stream(html)
+        if parser == "xpath":
+            return self.parse_xpath(html)
+        return self.parse_soup(html, parser)
+
+    @classmethod
+    def count(cls, empty: bool):
+        """
+        Counts a page, and whether it took the fast path for empty pages.
+        """
+        with cls._lock:
+            cls.pages += 1
+            if empty:
+                cls.empty_pages += 1
+
+    @classmethod
+    def add_counts(cls, pages: int, empty_pages: int):
+        """
+        Adds the page counts of another process.
+        """
+        with cls._lock:
+            cls.pages += pages
+            cls.empty_pages += empty_pages
+
+    @classmethod
+    def reset_counts(cls):
+        """
+        Resets the page counts.
+        """
+        with cls._lock:
+            cls.pages = 0
+            cls.empty_pages = 0
+
+    @classmethod
+    def counts(cls) -> str:
+        """
+        Returns a string representation of the page counts.
+        """
+        return f'HeadToHead(pages="{cls.pages}",empty_pages="{cls.empty_pages}")'
+
+    def parse_soup(self, html: str, parser: str) -> List[Game]:
+        """
+        Parses the games with BeautifulSoup.
+
+        Args:
+            html (str): The HTML of the matchup page.
+            parser (str): "html.parser" or "lxml".
+
+        Returns:
+            List[Game]: The games, from the player's perspective.
+        """
+        if parser == "html.parser":
+            soup = BeautifulSoup(html, 'html.parser')
+        elif parser == "lxml":
+            # Only the table rows are needed, so skip building the rest of the tree
+            soup = BeautifulSoup(html, 'lxml', parse_only=SoupStrainer("tr"))
+        else:
+            raise ValueError(f"Unknown parser {parser!r}, expected one of {self.PARSERS}")
+
         # Navigate to where the rows should be
+        games = []
         links = soup.find_all("a", href=re.compile("XtblMain"))
         for link in links:
             tr = link.find_parent("tr")
             game = GameFactory.from_soup(self.player_id, tr)
-            self.games.append(game)
+            games.append(game)
+        return games
+
+    def parse_stream(self, html: str) -> List[Game]:
+        """
+        Parses the games with GameRowParser, falling back to BeautifulSoup
+        if the page layout is not the expected one.
+
+        Args:
+            html (str): The HTML of the matchup page.
+
+        Returns:
+            List[Game]: The games, from the player's perspective.
+        """
+        try:
+            return GameRowParser.parse(self.player_id, html)
+        except LayoutError:
+            return self.parse_soup(html, "html.parser")
+
+    def parse_xpath(self, html: str) -> List[Game]:
+        """
+        Parses the games with lxml.html and XPath, without BeautifulSoup.
+
+        Args:
+            html (str): The HTML of the matchup page.
+
+        Returns:
+            List[Game]: The games, from the player's perspective.
+        """
+        import lxml.html  # Optional dependency, only needed for this parser
+
+        if not html.strip():
+            return []
+        tree = lxml.html.fromstring(html)
+        games = []
+        for tr in tree.xpath('//a[contains(@href, "XtblMain")]/ancestor::tr[1]'):
+            tds = tr.xpath(".//td")
+            cells = ["".join(s.strip() for s in td.itertext()) for td in tds]
+            href = tds[0].xpath(".//a/@href")[0] if tds else None
+            game = GameFactory.from_values(self.player_id, href, cells)
+            games.append(game)
+        return games
+
+    def to_rows(self) -> GameRows:
+        """
+        Returns the games as rows of the games table.
+        """
+        rows = [DatabaseWriter.game_row(game) for game in self.games]
+        return GameRows(self.player_id, self.opponent_id, rows)
 
     def get_html(self) -> str:
         url = get_head_to_head_url(self.player_id, self.opponent_id)
         html = get_page(url)
         return html
-    
-    pass
@@ -0,0 +1,275 @@
+from contextlib import contextmanager
+import json
+import math
+import threading
+import time
+from typing import Dict, TextIO
+
+
+class Histogram:
+    """
+    A histogram of observed values, such as latencies or sizes.
+
+    The values are counted in buckets whose upper bounds are powers of
+    two, so the memory used does not grow with the number of values, and
+    the percentiles are accurate to within a factor of two.
+    """
+
+    def __init__(self):
+        """
+        Initializes an empty Histogram.
+        """
+        self.count: int = 0
+        self.total: float = 0.0
+        self.min: float = None
+        self.max: float = None
+        self.buckets: Dict[int, int] = {}  # Exponent -> count
+
+    def observe(self, value: float):
+        """
+        Adds a value to the histogram.
+        """
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        exponent = math.frexp(value)[1] if value > 0 else -1074
+        self.buckets[exponent] = self.buckets.get(exponent, 0) + 1
+
+    def percentile(self, p: float) -> float:
+        """
+        Returns the upper bound of the bucket holding the p-th percentile.
+        """
+        if not self.count:
+            return None
+        rank = p / 100 * self.count
+        seen = 0
+        for exponent in sorted(self.buckets):
+            seen += self.buckets[exponent]
+            if seen >= rank:
+                return min(self.max, math.ldexp(1.0, exponent))
+        return self.max
+
+    def merge(self, other: "Histogram"):
+        """
+        Adds the values of another histogram.
+        """
+        if not other.count:
+            return
+        self.count += other.count
+        self.total += other.total
+        self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = other.max if self.max is None else max(self.max, other.max)
+        for exponent, n in other.buckets.items():
+            self.buckets[exponent] = self.buckets.get(exponent, 0) + n
+
+    def summary(self) -> Dict[str, float]:
+        """
+        Returns the count, total, mean, extremes and main percentiles.
+        """
+        return {
+            "count": self.count,
+            "total": self.total,
+            "mean": self.total / self.count if self.count else None,
+            "min": self.min,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "max": self.max,
+        }
+
+
+class Metrics:
+    """
+    Counters and histograms shared by every thread of the program.
+
+    Usage:
+        metrics.incr("fetch.retries")
+        with metrics.timer("db.flush.seconds"):
+            ...
+    """
+
+    def __init__(self):
+        """
+        Initializes empty Metrics.
+        """
+        self.counters: Dict[str, int] = {}
+        self.histograms: Dict[str, Histogram] = {}
+        self._lock = threading.Lock()
+
+    def incr(self, name: str, n: int = 1):
+        """
+        Adds n to a counter.
+        """
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def observe(self, name: str, value: float):
+        """
+        Adds a value to a histogram.
+        """
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram()
+            histogram.observe(value)
+
+    @contextmanager
+    def timer(self, name: str):
+        """
+        Observes the number of seconds spent in the with block.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    def merge(self, other: "Metrics"):
+        """
+        Adds the counters and histograms of another Metrics, such as the
+        ones collected by a worker process.
+        """
+        with self._lock:
+            for name, n in other.counters.items():
+                self.counters[name] = self.counters.get(name, 0) + n
+            for name, histogram in other.histograms.items():
+                self.histograms.setdefault(name, Histogram()).merge(histogram)
+
+    def __getstate__(self) -> dict:
+        with self._lock:
+            return {"counters": self.counters, "histograms": self.histograms}
+
+    def __setstate__(self, state: dict):
+        self.counters = state["counters"]
+        self.histograms = state["histograms"]
+        self._lock = threading.Lock()
+
+    def total(self, name: str) -> float:
+        """
+        Returns the sum of the values of a histogram.
+        """
+        with self._lock:
+            histogram = self.histograms.get(name)
+            return histogram.total if histogram is not None else 0.0
+
+    def snapshot(self) -> dict:
+        """
+        Returns a copy of the counters and a summary of each histogram.
+        """
+        with self._lock:
+            return {
+                "counters": dict(self.counters),
+                "histograms": {name: histogram.summary()
+                               for name, histogram in self.histograms.items()},
+            }
+
+    def reset(self):
+        """
+        Discards all counters and histograms.
+        """
+        with self._lock:
+            self.counters = {}
+            self.histograms = {}
+
+
+metrics = Metrics()
+
+
+class Progress:
+    """
+    Writes periodic progress records of a crawl as JSON lines.
+
+    Each record has the number of items done out of the total, the
+    throughput and an estimate of the time left, and a snapshot of the
+    metrics.  It also tells which stage is the busiest: the share of the
+    elapsed time that the fetching and parsing threads, and the single
+    database writer, spent in each stage.  A crawl whose workers are busy
+    fetching is network-bound, and one whose writer is busy is
+    write-bound.
+
+    Usage:
+        progress = Progress(len(pairs), stream, workers=8)
+        for ...:
+            progress.update()
+        progress.finish()
+    """
+
+    # Histograms of the time spent in each stage
+    STAGES = {
+        "fetch": "fetch.seconds",
+        "parse": "parse.seconds",
+        "write": "db.flush.seconds",
+    }
+
+    def __init__(self, total: int, stream: TextIO, workers: int = 1, interval: float = 10.0,
+                 parsers: int = None):
+        """
+        Initializes a Progress.
+
+        Args:
+            total (int): The number of items to do.
+            stream (TextIO): Where to write the records.
+            workers (int, optional): The number of fetching threads.
+            interval (float, optional): The minimum number of seconds
+            between two records.
+            parsers (int, optional): The number of parsing threads.
+            Defaults to workers, who parse the pages they fetch.
+        """
+        self.total: int = total
+        self.stream: TextIO = stream
+        self.workers: int = max(1, workers)
+        self.parsers: int = max(1, parsers if parsers is not None else workers)
+        self.interval: float = interval
+        self.done: int = 0
+        self.start: float = time.monotonic()
+        self._last: float = self.start
+
+    def update(self, n: int = 1):
+        """
+        Counts items as done, writing a record if the interval has passed.
+        """
+        self.done += n
+        now = time.monotonic()
+        if now - self._last >= self.interval:
+            self._last = now
+            self.write(now)
+
+    def finish(self):
+        """
+        Writes the final record.
+        """
+        self.write(time.monotonic(), final=True)
+
+    def record(self, now: float, final: bool = False) -> dict:
+        """
+        Returns a progress record.
+        """
+        elapsed = now - self.start
+        rate = self.done / elapsed if elapsed > 0 else None
+        left = self.total - self.done
+        eta = left / rate if rate else None
+        busy = {}
+        threads = {"fetch": self.workers, "parse": self.parsers, "write": 1}
+        for stage, name in self.STAGES.items():
+            busy[stage] = metrics.total(name) / (elapsed * threads[stage]) if elapsed > 0 else 0.0
+        record = {
+            "time": time.time(),
+            "final": final,
+            "done": self.done,
+            "total": self.total,
+            "elapsed": elapsed,
+            "rate": rate,
+            "eta": 0.0 if final else eta,
+            "busy": busy,
+            "bound": max(busy, key=busy.get) if any(busy.values()) else None,
+        }
+        record.update(metrics.snapshot())
+        return record
+
+    def write(self, now: float, final: bool = False):
+        """
+        Writes a progress record as one line of JSON.
+        """
+        self.stream.write(json.dumps(self.record(now, final)) + "\n")
+        self.stream.flush()
@@ -0,0 +1,322 @@
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+import multiprocessing
+import queue
+import threading
+from typing import Generator, Iterable, List, Tuple
+
+from chess_clubs import config, get_head_to_head_url, get_page
+from chess_clubs.crawler import Crawler
+from chess_clubs.crosstable import Crosstable
+from chess_clubs.head_to_head import GameRows, HeadToHead
+from chess_clubs.metrics import Metrics, metrics
+from chess_clubs.player import Player
+
+_DONE = object()  # Marks the end of the work on a queue
+
+
+class Pipeline(Crawler):
+    """
+    Fetches and parses pages in separate stages, connected by bounded
+    queues.
+
+    The fetch stage only waits on the network, and the parse stage only
+    works on the pages already fetched, so each stage can be given its
+    own number of threads.  The results are handed back to the caller,
+    the write stage, in the same order as the planned items, like
+    Crawler.crawl().
+
+    At most `queue_size` items are in flight between the planning of an
+    item and its hand-over to the caller.  A caller that writes slowly
+    therefore holds back the fetch stage, instead of letting the parsed
+    pages pile up in memory.  When the caller stops early, the items in
+    flight are drained and the threads are joined before it resumes.
+
+    Parsing is CPU-bound, so parse threads can only use one core between
+    them.  With `processes`, each parse thread instead hands the pages to
+    a pool of as many worker processes, in chunks of up to `chunk_size`
+    pages to amortize the cost of sending them.  The matchups then come
+    back as GameRows rather than HeadToHead objects.
+    """
+
+    def __init__(self, fetchers: int = 1, parsers: int = 1,
+                 budget: float = None, queue_size: int = None,
+                 processes: bool = False, chunk_size: int = 16):
+        """
+        Initializes a Pipeline.
+
+        Args:
+            fetchers (int, optional): The number of threads fetching pages.
+            parsers (int, optional): The number of threads parsing pages.
+            budget (float, optional): The maximum number of requests per
+            second that each fetcher may make. None or zero means no limit.
+            queue_size (int, optional): The maximum number of items in
+            flight. Defaults to twice the number of threads.
+            processes (bool, optional): Whether to parse the pages in
+            `parsers` worker processes instead of threads.
+            chunk_size (int, optional): The maximum number of pages sent
+            to a worker process at once.
+        """
+        super().__init__(fetchers, budget)
+        self.parsers: int = max(1, parsers)
+        self.processes: bool = processes
+        self.chunk_size: int = max(1, chunk_size)
+        if not queue_size:
+            queue_size = 2 * (self.workers + self.parsers)
+            if processes:
+                queue_size += self.parsers * self.chunk_size
+        self.queue_size: int = max(1, queue_size)
+
+    def crawl(self, pairs: Iterable[Tuple[Player, Player]]
+              ) -> Generator[Tuple[Player, Player, HeadToHead], None, None]:
+        """
+        Fetches the head-to-head matchup for each pair of players.
+
+        Args:
+            pairs (Iterable[Tuple[Player, Player]]): The planned pairs.
+
+        Returns:
+            Generator[Tuple[Player, Player, HeadToHead], None, None]: A
+            generator yielding (player, opponent, head_to_head) tuples in
+            the order of the planned pairs, where head_to_head is a
+            GameRows if the pages are parsed in worker processes.  If a
+            pair could not be crawled, head_to_head is the exception that
+            was raised.
+        """
+        if self.processes:
+            parse = partial(Pipeline.parse_game_rows, parser=config.app.PARSER)
+        else:
+            parse = Pipeline.parse_head_to_head
+        for (player, opponent), head_to_head in self.stages(
+                self.fetch_head_to_head, parse, pairs):
+            yield player, opponent, head_to_head
+
+    def crosstables(self, tids: Iterable[str]
+                    ) -> Generator[Tuple[str, Crosstable], None, None]:
+        """
+        Fetches the crosstable of each tournament.
+
+        Args:
+            tids (Iterable[str]): The tournament IDs.
+
+        Returns:
+            Generator[Tuple[str, Crosstable], None, None]: A generator
+            yielding (tid, crosstable) tuples in the order of the tournament
+            IDs.  If a crosstable could not be fetched, crosstable is the
+            exception that was raised.
+        """
+        for (tid,), crosstable in self.stages(
+                self.fetch_crosstable_page, Pipeline.parse_crosstable, ((tid,) for tid in tids)):
+            yield tid, crosstable
+
+    def stages(self, fetch, parse, items: Iterable[tuple]
+               ) -> Generator[Tuple[tuple, object], None, None]:
+        """
+        Calls fetch(*args) on the fetch threads and parse(*args, page) on
+        the parse threads, or in the worker processes, for each tuple of
+        arguments, yielding (args, result) tuples in the order of the
+        items.  If either call fails, result is the exception that was
+        raised.
+        """
+        executor = None
+        if self.processes:
+            # Spawn the workers rather than fork this multi-threaded process
+            executor = ProcessPoolExecutor(max_workers=self.parsers,
+                                           mp_context=multiprocessing.get_context("spawn"))
+        slots = threading.Semaphore(self.queue_size)
+        stop = threading.Event()
+        fetch_queue = queue.Queue(maxsize=self.queue_size)
+        parse_queue = queue.Queue(maxsize=self.queue_size)
+        results = queue.Queue(maxsize=self.queue_size)
+        errors = []
+        fetching = [self.workers]   # Fetch threads still running
+        lock = threading.Lock()
+
+        def feed():
+            try:
+                for seq, args in enumerate(items):
+                    # Wait for an item to leave the pipeline
+                    while not slots.acquire(timeout=0.1):
+                        if stop.is_set():
+                            return
+                    if stop.is_set():
+                        return
+                    fetch_queue.put((seq, args))
+            except BaseException as e:
+                errors.append(e)
+            finally:
+                for _ in range(self.workers):
+                    fetch_queue.put(_DONE)
+
+        def fetch_stage():
+            while (item := fetch_queue.get()) is not _DONE:
+                if stop.is_set():
+                    continue
+                seq, args = item
+                page = self.attempt(fetch, *args)
+                parse_queue.put((seq, args, page))
+            with lock:
+                fetching[0] -= 1
+                if fetching[0] == 0:
+                    for _ in range(self.parsers):
+                        parse_queue.put(_DONE)
+
+        def parse_stage():
+            while (item := parse_queue.get()) is not _DONE:
+                if stop.is_set():
+                    continue
+                seq, args, page = item
+                if not isinstance(page, Exception):
+                    page = self.attempt(parse, *args, page)
+                results.put((seq, args, page))
+            results.put(_DONE)
+
+        def parse_stage_in_processes():
+            done = False
+            while not done:
+                item = parse_queue.get()
+                if item is _DONE:
+                    break
+                # Take whatever else is waiting, up to a chunk, without
+                # waiting for more pages to be fetched
+                chunk = [item]
+                while len(chunk) < self.chunk_size:
+                    try:
+                        item = parse_queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if item is _DONE:
+                        done = True
+                        break
+                    chunk.append(item)
+                if stop.is_set():
+                    continue
+                for item in self.parse_chunk(executor, parse, chunk):
+                    results.put(item)
+            results.put(_DONE)
+
+        threads = [threading.Thread(target=feed, daemon=True)]
+        threads += [threading.Thread(target=fetch_stage, daemon=True) for _ in range(self.workers)]
+        target = parse_stage_in_processes if self.processes else parse_stage
+        threads += [threading.Thread(target=target, daemon=True) for _ in range(self.parsers)]
+        for thread in threads:
+            thread.start()
+
+        # Put the results back in order.  There are never more than
+        # queue_size of them waiting, since each holds a slot.
+        waiting = {}
+        expected = 0
+        finished = 0
+        try:
+            while finished < self.parsers:
+                item = results.get()
+                if item is _DONE:
+                    finished += 1
+                    continue
+                seq, args, result = item
+                waiting[seq] = (args, result)
+                while expected in waiting:
+                    args, result = waiting.pop(expected)
+                    expected += 1
+                    slots.release()
+                    yield args, result
+            if errors:
+                raise errors[0]
+        finally:
+            # Drain the work in flight, so that every thread ends
+            stop.set()
+            while finished < self.parsers:
+                if results.get() is _DONE:
+                    finished += 1
+            for thread in threads:
+                thread.join()
+            if executor is not None:
+                executor.shutdown()
+
+    def parse_chunk(self, executor: ProcessPoolExecutor, parse, chunk: List[tuple]) -> List[tuple]:
+        """
+        Parses a chunk of fetched pages in a worker process, and adds the
+        metrics and page counts collected there to those of this process.
+
+        Args:
+            executor (ProcessPoolExecutor): The worker processes.
+            parse: A picklable callable taking the arguments of an item
+            and its page.
+            chunk (List[tuple]): (seq, args, page) tuples, where page may
+            be the exception raised by the fetch.
+
+        Returns:
+            List[tuple]: (seq, args, result) tuples.
+        """
+        pages = [(args, page) for _, args, page in chunk if not isinstance(page, Exception)]
+        try:
+            parsed, child_metrics, counts = executor.submit(parse_pages, parse, pages).result()
+            metrics.merge(child_metrics)
+            HeadToHead.add_counts(*counts)
+        except Exception as e:
+            # The worker process died, so the whole chunk failed
+            parsed = [e] * len(pages)
+        parsed = iter(parsed)
+        return [(seq, args, page if isinstance(page, Exception) else next(parsed))
+                for seq, args, page in chunk]
+
+    def fetch_head_to_head(self, player: Player, opponent: Player) -> str:
+        """
+        Fetches one head-to-head matchup page, staying within the request
+        budget of the calling fetcher.
+        """
+        self.throttle()
+        return get_page(get_head_to_head_url(player.id, opponent.id))
+
+    @staticmethod
+    def parse_head_to_head(player: Player, opponent: Player, html: str) -> HeadToHead:
+        """
+        Parses one head-to-head matchup page.
+        """
+        return HeadToHead(player.id, opponent.id, html=html)
+
+    @staticmethod
+    def parse_game_rows(player: Player, opponent: Player, html: str, parser: str = None) -> GameRows:
+        """
+        Parses one head-to-head matchup page into rows of the games table.
+        """
+        return HeadToHead(player.id, opponent.id, html=html, parser=parser).to_rows()
+
+    def fetch_crosstable_page(self, tid: str) -> str:
+        """
+        Fetches the crosstable page of one tournament, staying within the
+        request budget of the calling fetcher.
+        """
+        self.throttle()
+        return get_page(Crosstable.get_url(tid))
+
+    @staticmethod
+    def parse_crosstable(tid: str, html: str) -> Crosstable:
+        """
+        Parses the crosstable page of one tournament.
+        """
+        return Crosstable(tid, html=html)
+
+
+def parse_pages(parse, pages: List[tuple]) -> Tuple[list, Metrics, Tuple[int, int]]:
+    """
+    Parses pages in a worker process.
+
+    Args:
+        parse: A callable taking the arguments of an item and its page.
+        pages (List[tuple]): (args, page) tuples.
+
+    Returns:
+        Tuple[list, Metrics, Tuple[int, int]]: The result of each page, or
+        the exception that was raised, the metrics collected while parsing,
+        and the HeadToHead page counts.
+    """
+    metrics.reset()
+    HeadToHead.reset_counts()
+    results = []
+    for args, page in pages:
+        try:
+            results.append(parse(*args, page))
+        except Exception as e:
+            results.append(e)
+    return results, metrics, (HeadToHead.pages, HeadToHead.empty_pages)
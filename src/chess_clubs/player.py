@@ -15,6 +15,8 @@ class Player:
         _last_event (str): The ID of the last tournament the player participated in.
     """
 
+    __slots__ = ("_id", "_name", "_state", "_rating", "_date", "_event_count", "_last_event")
+
     def __init__(self,
                  id: str,
                  name: str = None,
@@ -0,0 +1,132 @@
+import asyncio
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+import random
+import threading
+import time
+
+# HTTP status codes that mean the server is overloaded or throttling us,
+# so the request is worth retrying after a pause
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class RateLimiter:
+    """
+    A token bucket that limits the request rate of the whole program.
+
+    The bucket holds up to `burst` tokens and is refilled at `rate` tokens
+    per second.  Each request takes a token, waiting for one if the
+    bucket is empty.  Tokens are reserved under a lock, and the caller
+    sleeps outside of it, so one limiter is shared by the threads of the
+    thread crawler and the tasks of the async crawler alike.  When the
+    server asks for a pause, every request waits until it is over.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        """
+        Initializes a RateLimiter with a full bucket.
+
+        Args:
+            rate (float): The number of requests per second. None or zero
+            means no limit, apart from the pauses asked for by the server.
+            burst (int, optional): The number of requests that can be made
+            at once after an idle period.
+        """
+        self.rate: float = rate
+        self.burst: int = max(1, burst)
+        self._tokens: float = self.burst
+        self._updated: float = time.monotonic()
+        self._paused_until: float = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """
+        Takes a token from the bucket, or reserves the next one.
+
+        Returns:
+            float: The number of seconds to wait before making the request.
+        """
+        with self._lock:
+            now = time.monotonic()
+            wait = max(0.0, self._paused_until - now)
+            if not self.rate:
+                return wait
+            elapsed = now - self._updated
+            self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            if self._tokens < 0:
+                # Going into debt reserves the next token for this caller
+                wait = max(wait, -self._tokens / self.rate)
+            return wait
+
+    def acquire(self):
+        """
+        Waits until a request can be made.
+        """
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        """
+        Waits until a request can be made, without blocking the event loop.
+        """
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def pause(self, seconds: float):
+        """
+        Holds back every request for the given number of seconds.
+        """
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+
+def parse_retry_after(value: str) -> float:
+    """
+    Parses the Retry-After header of a response.
+
+    Args:
+        value (str): The header value, either a number of seconds or an
+        HTTP date.
+
+    Returns:
+        float: The number of seconds to wait.
+        None: If there is no header, or it cannot be parsed.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def backoff_delay(attempt: int, base: float, cap: float, retry_after: float = None) -> float:
+    """
+    Returns how long to wait before retrying a request.
+
+    The delay grows exponentially with the attempt number, up to the cap,
+    with full jitter so that the workers do not all retry at once.  The
+    server's Retry-After, if given, is honoured instead.
+
+    Args:
+        attempt (int): The number of the failed attempt, starting at 0.
+        base (float): The delay after the first failed attempt.
+        cap (float): The longest delay.
+        retry_after (float, optional): The delay asked for by the server.
+
+    Returns:
+        float: The number of seconds to wait.
+    """
+    if retry_after is not None:
+        return retry_after
+    return random.uniform(0, min(cap, base * 2 ** attempt))
@@ -0,0 +1,114 @@
+from html.parser import HTMLParser
+from typing import List
+
+from chess_clubs.game import Game
+from chess_clubs.game_factory import GameFactory
+
+
+class LayoutError(ValueError):
+    """
+    Raised when a gamestats page does not have the expected layout.
+    """
+
+
+class GameRowParser(HTMLParser):
+    """
+    Extracts the games from a gamestats page without building a DOM.
+
+    The page is streamed through html.parser, and only the cell text of
+    each <tr> and the link to its tournament are kept.  A row whose first
+    cell links to XtblMain is a game row, and becomes a Game as soon as
+    its </tr> is seen.  Anything that does not match the layout that
+    GameFactory.from_soup() documents raises a LayoutError, so that the
+    caller can fall back to BeautifulSoup.
+
+    Usage:
+        games = GameRowParser.parse(player_id, html)
+    """
+
+    START_MARKER = "Games against"  # Heading of the table of games
+    END_MARKER = "banner_sep"       # Page footer, after the table of games
+
+    def __init__(self, player_id: str):
+        """
+        Initializes a GameRowParser.
+
+        Args:
+            player_id (str): The unique identifier of the player.
+        """
+        super().__init__(convert_charrefs=True)
+        self.player_id: str = player_id
+        self.games: List[Game] = []
+        self._cells: List[str] = None   # Cell texts of the current row
+        self._text: List[str] = None    # Text pieces of the current cell
+        self._href: str = None          # Tournament link of the current row
+
+    @classmethod
+    def parse(cls, player_id: str, html: str) -> List[Game]:
+        """
+        Returns the games on a gamestats page.
+
+        Only the table of games is parsed.  A page without one is
+        recognised by finding the page footer before any tournament link,
+        which is a few kilobytes into the page.
+
+        Args:
+            player_id (str): The unique identifier of the player.
+            html (str): The HTML of the matchup page.
+
+        Returns:
+            List[Game]: The games, from the player's perspective.
+
+        Raises:
+            LayoutError: If the page does not have the expected layout.
+        """
+        end = html.find(cls.END_MARKER)
+        if end < 0:
+            raise LayoutError(f"{cls.END_MARKER} not found")
+        start = html.find(cls.START_MARKER, 0, end)
+        if start < 0:
+            if html.find("XtblMain", 0, end) >= 0:
+                raise LayoutError(f"{cls.START_MARKER} not found")
+            return []
+
+        parser = cls(player_id)
+        parser.feed(html[start:end])
+        parser.close()
+        if len(parser.games) != html.count("XtblMain", start, end):
+            raise LayoutError("Tournament links found outside of game rows")
+        return parser.games
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "tr":
+            self._cells = []
+        elif tag == "td" and self._cells is not None:
+            self._text = []
+        elif tag == "a" and self._text is not None and not self._cells and self._href is None:
+            self._href = dict(attrs).get("href")
+
+    def handle_endtag(self, tag):
+        if tag == "td" and self._text is not None:
+            self._cells.append("".join(s.strip() for s in self._text))
+            self._text = None
+        elif tag == "tr" and self._cells is not None:
+            self.end_row()
+
+    def handle_data(self, data):
+        if self._text is not None:
+            self._text.append(data)
+
+    def end_row(self):
+        """
+        Creates a Game from the row that just ended, if it is a game row.
+        """
+        cells, href = self._cells, self._href
+        self._cells = self._href = None
+        if href is None or "XtblMain" not in href:
+            return
+        if len(cells) != 8:
+            raise LayoutError(f"Expected 8 <td> elements, found {len(cells)}")
+        try:
+            game = GameFactory.from_values(self.player_id, href, cells)
+        except (AssertionError, ValueError) as e:
+            raise LayoutError(f"Unexpected game row {cells}") from e
+        self.games.append(game)
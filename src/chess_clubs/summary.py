@@ -4,28 +4,30 @@ class Summary:
     """
     Represents a summary of a player's game results, including wins, losses, draws,
     and the computed percentage score against an opponent
+
+    The attributes are stored in slots, and the percentage is computed only
+    when it is read, since millions of summaries may be updated but few are
+    displayed.
     """
-    
+
+    __slots__ = ("pid", "oid", "_wins", "_losses", "_draws")
+
     def __init__(self, player_id: str, opponent_id: str):
         """
         Initializes a Summary instance with zeroed statistics.
         """
         self.pid: str = player_id
         self.oid: str = opponent_id
-        self._games: int = 0
         self._wins: int = 0
         self._losses: int = 0
         self._draws: int = 0
-        self._pct: float = 0.0
     
     def invert(self):
         """
         Inverts the summary by swapping wins and losses.
-        Updates the percentage accordingly.
         """
         self.pid, self.oid = self.oid, self.pid
-        self.wins, self.losses = self.losses, self.wins
-        self._update_pct()
+        self._wins, self._losses = self._losses, self._wins
     
     def __str__(self) -> str:
         """
@@ -52,12 +54,13 @@ class Summary:
         Args:
             game (Game): A game object containing the result.
         """
-        if game.result == "W":
-            self.wins += 1
-        elif game.result == "L":
-            self.losses += 1
-        elif game.result == "D":
-            self.draws += 1
+        result = game.result
+        if result == "W":
+            self._wins += 1
+        elif result == "L":
+            self._losses += 1
+        elif result == "D":
+            self._draws += 1
     
     @property
     def games(self) -> int:
@@ -67,7 +70,7 @@ class Summary:
         Returns:
             int: The sum of wins, losses, and draws.
         """
-        return self.wins + self.losses + self.draws
+        return self._wins + self._losses + self._draws
 
     @property
     def wins(self) -> int:
@@ -82,13 +85,12 @@ class Summary:
     @wins.setter
     def wins(self, value: int):
         """
-        Sets the number of wins and updates the percentage variable.
+        Sets the number of wins.
         
         Args:
             value (int): The number of wins.
         """
         self._wins = value
-        self._update_pct()
 
     @property
     def losses(self) -> int:
@@ -103,10 +105,9 @@ class Summary:
     @losses.setter
     def losses(self, value: int):
         """
-        Sets the number of losses and updates the percentage variable.
+        Sets the number of losses.
         """
         self._losses = value
-        self._update_pct()
 
     @property
     def draws(self) -> int:
@@ -126,25 +127,16 @@ class Summary:
             value (int): The number of draws.
         """
         self._draws = value
-        self._update_pct()
 
     @property
     def pct(self) -> float:
         """
-        Returns the player's score percentage.
+        Returns the player's score percentage, as a number from zero to 100.
         
         Returns:
             float: The calculated percentage score.
         """
-        return self._pct
-
-    def _update_pct(self):
-        """
-        Updates the percentage score based on current win, loss, and draw counts.
-        Percentage is represented as a number from zero to 100.
-        """
-        total = self.games
+        total = self._wins + self._losses + self._draws
         if total > 0:
-            self._pct = 100.0 * (self._wins + 0.5 * self._draws) / total
-        else:
-            self._pct = 0.0
+            return 100.0 * (self._wins + 0.5 * self._draws) / total
+        return 0.0
@@ -0,0 +1,120 @@
+import itertools
+import re
+from typing import Dict, Iterable, List, Set, Tuple
+
+from chess_clubs import config, get_page
+from chess_clubs.player import Player
+
+
+class TournamentHistory:
+    """
+    The tournaments that a player has played in, read from the player's
+    tournament history pages on the USCF website.
+
+    Each event on a history page links to its crosstable, as in
+    XtblMain.php?202502076302-30420180, the same tournament IDs as the
+    last_event column of the active player list.  A long history is split
+    over several pages, which are all read.
+    """
+
+    # Tournament ID in a link to a crosstable
+    TID_PATTERN = re.compile(r"XtblMain\.php\?(\d{12})")
+
+    def __init__(self, player_id: str, html: str = None):
+        """
+        Initializes a TournamentHistory by reading the player's history pages.
+
+        Args:
+            player_id (str): The unique identifier of the player.
+            html (str, optional): The HTML of the first history page, if it
+            has already been fetched. Otherwise it is fetched from USCF.
+        """
+        self.player_id: str = player_id
+        self.tids: Set[str] = set()
+
+        if html is None:
+            html = get_page(self.get_url(player_id))
+        self.tids.update(self.TID_PATTERN.findall(html))
+
+        # Read the remaining pages, which are linked from the first one
+        for page in range(2, self.page_count(html) + 1):
+            html = get_page(self.get_url(player_id, page))
+            self.tids.update(self.TID_PATTERN.findall(html))
+
+    @staticmethod
+    def get_url(player_id: str, page: int = 1) -> str:
+        """
+        Returns the URL of a page of the player's tournament history.
+        """
+        url = f"{config.net.BASE_URL}/msa/MbrDtlTnmtHst.php?{player_id}"
+        if page > 1:
+            url += f".{page}"
+        return url
+
+    def page_count(self, html: str) -> int:
+        """
+        Returns the number of history pages, from the links to the other
+        pages on the first one.
+        """
+        pattern = rf"MbrDtlTnmtHst\.php\?{self.player_id}\.(\d+)"
+        pages = [int(page) for page in re.findall(pattern, html)]
+        return max(pages, default=1)
+
+
+class TournamentIndex:
+    """
+    An inverted index from each tournament to the players who played in it.
+
+    Two players can only have played each other if they were in the same
+    tournament, so the index tells which pairs of players are worth a
+    head-to-head request.
+    """
+
+    def __init__(self):
+        """
+        Initializes an empty TournamentIndex.
+        """
+        self.players: Dict[str, Set[str]] = {}  # Tournament ID -> player IDs
+        self.unknown: Set[str] = set()          # Players without a history
+
+    def add(self, player_id: str, tids: Iterable[str]):
+        """
+        Adds the tournaments of a player.
+        """
+        for tid in tids:
+            self.players.setdefault(tid, set()).add(player_id)
+
+    def add_unknown(self, player_id: str):
+        """
+        Adds a player whose tournament history could not be read, who
+        must be paired with everyone.
+        """
+        self.unknown.add(player_id)
+
+    def candidates(self) -> Set[Tuple[str, str]]:
+        """
+        Returns the pairs of players who share at least one tournament,
+        in both orders.
+        """
+        pairs = set()
+        for ids in self.players.values():
+            pairs.update(itertools.permutations(ids, 2))
+        return pairs
+
+    def tournaments(self) -> List[str]:
+        """
+        Returns the IDs of the tournaments in which at least two of the
+        players played, in order.
+        """
+        return sorted(tid for tid, ids in self.players.items() if len(ids) > 1)
+
+    def filter(self, pairs: Iterable[Tuple[Player, Player]]) -> List[Tuple[Player, Player]]:
+        """
+        Returns the planned pairs whose players may have played each
+        other, in their original order.
+        """
+        candidates = self.candidates()
+        return [(player, opponent) for player, opponent in pairs
+                if (player.id, opponent.id) in candidates
+                or player.id in self.unknown
+                or opponent.id in self.unknown]
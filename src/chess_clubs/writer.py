@@ -0,0 +1,221 @@
+from datetime import datetime
+import sqlite3
+from typing import Iterable, List
+
+from chess_clubs import invert_color, invert_result
+from chess_clubs.crosstable import Crosstable
+from chess_clubs.game import Game
+from chess_clubs.metrics import metrics
+from chess_clubs.player import Player
+
+
+class DatabaseWriter:
+    """
+    Buffers rows for the database and writes them in batches.
+
+    Each head-to-head matchup is buffered as a unit: its games, from both
+    players' perspectives, and its crawl state.  When the buffer holds at
+    least `flush_size` game rows, everything buffered is written with
+    executemany() in a single transaction, so a pair's games and its crawl
+    state are always committed together.  A tournament read from its
+    crosstable is buffered in the same way, as a unit with its games.  A
+    game that is already in the database is ignored.
+
+    Usage:
+        with DatabaseWriter(con, flush_size=1000) as writer:
+            writer.add_head_to_head(pid, oid, games)
+    """
+
+    GAME_SQL = """
+
+    INSERT OR IGNORE INTO games (pid, oid, tid, sname, rnumber, color, result)
+    VALUES(?, ?, ?, ?, ?, ?, ?)
+
+    """
+
+    PLAYER_SQL = """
+
+    INSERT INTO players (id, name, state, date, rating, event_count, last_event)
+    VALUES(?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(id) DO UPDATE SET
+        name=excluded.name,
+        state=excluded.state,
+        date=excluded.date,
+        rating=excluded.rating,
+        event_count=excluded.event_count,
+        last_event=excluded.last_event
+
+    """
+
+    CRAWL_STATE_SQL = """
+
+    INSERT INTO crawl_state (pid, oid, status, attempts, last_error, updated)
+    VALUES(?, ?, ?, 1, ?, ?)
+    ON CONFLICT(pid, oid) DO UPDATE SET
+        status=excluded.status,
+        attempts=attempts + 1,
+        last_error=excluded.last_error,
+        updated=excluded.updated
+
+    """
+
+    TOURNAMENT_SQL = """
+
+    INSERT OR REPLACE INTO tournaments
+        (id, name, location, date, club_id, chief_td_id, n_sections, n_players)
+    VALUES(?, ?, ?, ?, ?, ?, ?, ?)
+
+    """
+
+    DELETE_SQL = """ DELETE FROM games WHERE (pid=? AND oid=?) OR (pid=? AND oid=?) """
+
+    def __init__(self, con: sqlite3.Connection, flush_size: int = 1000):
+        """
+        Initializes a DatabaseWriter.
+
+        Args:
+            con (sqlite3.Connection): The database connection, which is
+            used only by the thread calling the writer.
+            flush_size (int, optional): The number of buffered game rows
+            that triggers a flush.
+        """
+        self.con: sqlite3.Connection = con
+        self.flush_size: int = max(1, flush_size)
+        self._deletes: List[tuple] = []
+        self._games: List[tuple] = []
+        self._states: List[tuple] = []
+        self._tournaments: List[tuple] = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        # The buffer only ever holds complete pairs, so it is written even
+        # if the crawl was interrupted
+        self.flush()
+
+    def add_head_to_head(self, pid: str, oid: str, games: List[Game], replace: bool = False):
+        """
+        Buffers the games of one head-to-head matchup, once from each
+        player's perspective, and marks the pair as completed.
+
+        Args:
+            pid (str): The unique identifier of the player.
+            oid (str): The unique identifier of the opponent.
+            games (List[Game]): The games, from the player's perspective,
+            as Game objects or as rows of the games table.
+            replace (bool, optional): Whether to delete the games stored
+            for the pair by a previous run.
+        """
+        if replace:
+            self._deletes.append((pid, oid, oid, pid))
+        self.add_games(games)
+        self._states.append(self.crawl_state_row(pid, oid, "done"))
+        if len(self._games) >= self.flush_size:
+            self.flush()
+
+    def add_tournament(self, crosstable: Crosstable, games: List[Game]):
+        """
+        Buffers a tournament and the games of its crosstable that are to be
+        stored, once from each player's perspective.  The tournament row
+        is written in the same transaction as its games, so a stored
+        tournament is a completed one.
+
+        Args:
+            crosstable (Crosstable): The parsed crosstable.
+            games (List[Game]): The games to store.
+        """
+        self.add_games(games)
+        self._tournaments.append((crosstable.tid,
+                                  crosstable.name,
+                                  crosstable.location,
+                                  crosstable.date,
+                                  crosstable.club_id,
+                                  crosstable.chief_td_id,
+                                  crosstable.n_sections,
+                                  crosstable.n_players))
+        if len(self._games) >= self.flush_size:
+            self.flush()
+
+    def add_games(self, games: List[Game]):
+        """
+        Buffers games, once from each player's perspective.  The games
+        are Game objects, or rows of the games table.
+        """
+        for game in games:
+            # Store the game and its inversion
+            if isinstance(game, tuple):
+                self._games.append(game)
+                self._games.append(self.invert_row(game))
+                continue
+            self._games.append(self.game_row(game))
+            game.invert()
+            self._games.append(self.game_row(game))
+
+    def add_crawl_failure(self, pid: str, oid: str, error: Exception):
+        """
+        Buffers the crawl state of a pair whose head-to-head matchup could
+        not be crawled.
+        """
+        self._states.append(self.crawl_state_row(pid, oid, "failed", str(error)))
+
+    def add_players(self, players: Iterable[Player]):
+        """
+        Adds the players to the database, or updates the details of the
+        players who are already there, in a single transaction.
+        """
+        rows = [(player.id,
+                 player.name,
+                 player.state,
+                 player.date,
+                 player.rating,
+                 player.event_count,
+                 player.last_event) for player in players]
+        with self.con:
+            self.con.executemany(self.PLAYER_SQL, rows)
+
+    def flush(self):
+        """
+        Writes everything buffered in a single transaction.
+        """
+        if not (self._deletes or self._games or self._states or self._tournaments):
+            return
+        with metrics.timer("db.flush.seconds"), self.con:
+            self.con.executemany(self.DELETE_SQL, self._deletes)
+            self.con.executemany(self.GAME_SQL, self._games)
+            self.con.executemany(self.CRAWL_STATE_SQL, self._states)
+            self.con.executemany(self.TOURNAMENT_SQL, self._tournaments)
+        metrics.incr("db.game_rows", len(self._games))
+        self._deletes = []
+        self._games = []
+        self._states = []
+        self._tournaments = []
+
+    @staticmethod
+    def game_row(game: Game) -> tuple:
+        """
+        Returns the values of a row of the games table.
+        """
+        return (game.player_id,
+                game.opponent_id,
+                game.tid,
+                game.sname,
+                game.rnumber,
+                game.color,
+                game.result)
+
+    @staticmethod
+    def invert_row(row: tuple) -> tuple:
+        """
+        Returns a row of the games table from the opponent's perspective.
+        """
+        pid, oid, tid, sname, rnumber, color, result = row
+        return (oid, pid, tid, sname, rnumber, invert_color(color), invert_result(result))
+
+    @staticmethod
+    def crawl_state_row(pid: str, oid: str, status: str, error: str = None) -> tuple:
+        """
+        Returns the values of a row of the crawl_state table.
+        """
+        updated = datetime.now().isoformat(timespec="seconds")
+        return (pid, oid, status, error, updated)
@@ -0,0 +1,47 @@
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from chess_clubs import config, get_player_pairs
+from chess_clubs.player import Player
+from tests.testdata import TESTDATA
+from tests.testdata.server import TestdataServer
+
+
+@pytest.fixture
+def pages():
+    games = (Path(TESTDATA) / "head_to_head_page.html").read_text(encoding="utf-8")
+    zero = (Path(TESTDATA) / "head_to_head_zero.html").read_text(encoding="utf-8")
+    return games, zero
+
+
+@pytest.fixture
+def pairs():
+    players = [Player(f"{10000000 + i}", f"PLAYER NUMBER{i}") for i in range(6)]
+    return list(get_player_pairs(players))
+
+
+@pytest.fixture
+def page_of(pages):
+    games, zero = pages
+
+    def page(player_id):
+        # Only pairs involving the first player have played each other
+        return games if player_id == "10000000" else zero
+    return page
+
+
+@pytest.fixture
+def summarize():
+    def summarize(results):
+        return [(player.id, opponent.id, [str(game) for game in h2h.games])
+                for player, opponent, h2h in results]
+    return summarize
+
+
+@pytest.fixture
+def server():
+    with TestdataServer(played={"30403332"}, players=5) as server:
+        with patch.object(config.net, "BASE_URL", server.base_url):
+            yield server
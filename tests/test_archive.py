@@ -0,0 +1,72 @@
+import sqlite3
+import time
+from unittest.mock import patch
+
+import pytest
+
+from chess_clubs import config, fetcher, get_page
+from chess_clubs.archive import Archive, ArchiveMiss
+from chess_clubs.core import Main
+from tests import config as test_config
+from tests.testdata.server import TestdataServer
+
+CLUB_ID = test_config["club_id"]
+
+
+def table(dbname, sql):
+    with sqlite3.connect(dbname) as con:
+        return con.execute(sql).fetchall()
+
+
+def test_record_and_replay(tmp_path):
+    directory = str(tmp_path / "archive")
+    recorded = str(tmp_path / "recorded.db")
+    replayed = str(tmp_path / "replayed.db")
+    with TestdataServer(played={"30403332"}, players=5) as server:
+        with patch.object(config.net, "BASE_URL", server.base_url):
+            Main(CLUB_ID, recorded, budget=0, use_cache=False, record=directory).run()
+        base_url = server.base_url
+    assert fetcher.archive is None
+
+    # The server is gone, but the run can be replayed
+    with patch.object(config.net, "BASE_URL", base_url):
+        Main(CLUB_ID, replayed, budget=0, replay=directory).run()
+
+    for sql in ["SELECT * FROM games ORDER BY 1, 2, 3, 4, 5",
+                "SELECT * FROM summaries ORDER BY 1, 2",
+                "SELECT * FROM players ORDER BY 1"]:
+        assert table(replayed, sql) == table(recorded, sql)
+    assert len(table(replayed, "SELECT * FROM games")) == 12
+
+
+def test_replay_miss(tmp_path):
+    Archive(str(tmp_path), "record").close()
+    fetcher.archive = Archive(str(tmp_path), "replay")
+    try:
+        with pytest.raises(ArchiveMiss):
+            get_page("https://www.uschess.org/msa/thin.php?12345678")
+    finally:
+        fetcher.archive.close()
+        fetcher.archive = None
+
+
+def test_replay_latency(tmp_path):
+    archive = Archive(str(tmp_path), "record")
+    archive.put("https://example.com", "<html></html>")
+    archive.close()
+
+    archive = Archive(str(tmp_path), "replay", latency=0.1)
+    start = time.monotonic()
+    assert archive.get("https://example.com") == "<html></html>"
+    assert time.monotonic() - start >= 0.1
+    archive.close()
+
+
+def test_replay_needs_archive(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        Archive(str(tmp_path), "replay")
+
+
+def test_record_and_replay_exclusive():
+    with pytest.raises(ValueError):
+        Main(CLUB_ID, "club.db", record="a", replay="b")
@@ -0,0 +1,56 @@
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from chess_clubs import config, get_player_pairs
+from chess_clubs.player import Player
+from tests.testdata.server import TestdataServer
+
+pytest.importorskip("aiohttp")
+
+from chess_clubs.async_crawler import AsyncCrawler  # noqa: E402
+
+
+def test_async_crawl_in_plan_order():
+    players = [Player(f"{10000000 + i}", f"PLAYER NUMBER{i}") for i in range(8)]
+    pairs = list(get_player_pairs(players))
+
+    with TestdataServer(played={"10000003"}) as server:
+        with patch.object(config.net, "BASE_URL", server.base_url):
+            results = list(AsyncCrawler(concurrency=4, pool_size=2).crawl(pairs))
+        assert server.requests == len(pairs)
+
+    assert [(p.id, o.id) for p, o, _ in results] == [(p.id, o.id) for p, o in pairs]
+    for player, opponent, head_to_head in results:
+        expected = 6 if opponent.id == "10000003" else 0
+        assert len(head_to_head.games) == expected
+
+
+def test_async_crawl_returns_fetch_errors():
+    players = [Player(f"{10000000 + i}", f"PLAYER NUMBER{i}") for i in range(3)]
+    pairs = list(get_player_pairs(players))
+
+    with TestdataServer() as server:
+        with patch.object(config.net, "BASE_URL", server.base_url + "/missing"):
+            results = list(AsyncCrawler(concurrency=2).crawl(pairs))
+    assert len(results) == len(pairs)
+    for _, _, head_to_head in results:
+        assert isinstance(head_to_head, Exception)
+
+
+def test_async_crawl_closed_early():
+    players = [Player(f"{10000000 + i}", f"PLAYER NUMBER{i}") for i in range(12)]
+    pairs = list(get_player_pairs(players))
+
+    with TestdataServer() as server:
+        with patch.object(config.net, "BASE_URL", server.base_url):
+            crawl = AsyncCrawler(concurrency=2).crawl(pairs)
+            next(crawl)
+            crawl.close()
+            # The event loop thread has ended, and makes no more requests
+            assert not any(thread.name.endswith("(run)") for thread in threading.enumerate())
+            requests = server.requests
+            time.sleep(0.1)
+            assert server.requests == requests < len(pairs)
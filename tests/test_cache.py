@@ -0,0 +1,127 @@
+import os
+from unittest.mock import patch
+
+import pytest
+
+from chess_clubs.cache import PageCache
+
+TTLS = {"club": 100, "active": 100, "gamestats": 1000, "history": 100, "other": 10000}
+CLUB_URL = "https://www.uschess.org/msa/AffDtlMain.php?A6021250"
+GAMESTATS_URL = ("https://www.uschess.org/datapage/gamestats.php"
+                 "?memid=12910923&ptype=0&rs=R&drill=32197553")
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = PageCache(str(tmp_path / "pages.db"), 1024 * 1024, TTLS)
+    yield cache
+    cache.close()
+
+
+def test_put_and_get(cache):
+    html = "<html>" + "x" * 10000 + "</html>"
+    cache.put(CLUB_URL, html)
+    assert cache.get(CLUB_URL) == html
+    assert cache.size < len(html)  # Stored compressed
+    assert (cache.hits, cache.misses) == (1, 0)
+
+
+def test_miss(cache):
+    assert cache.get(CLUB_URL) is None
+    assert (cache.hits, cache.misses) == (0, 1)
+
+
+def test_url_class(cache):
+    assert cache.url_class(CLUB_URL) == "club"
+    assert cache.url_class(GAMESTATS_URL) == "gamestats"
+    assert cache.url_class(
+        "https://www.uschess.org/datapage/top-affil-players.php?affil=A6021250") == "active"
+    assert cache.url_class(
+        "https://www.uschess.org/msa/MbrDtlTnmtHst.php?12345678") == "history"
+    assert cache.url_class("https://www.uschess.org/msa/thin.php?12345678") == "other"
+
+
+def test_ttl_per_url_class(cache):
+    with patch("time.time", return_value=1000.0):
+        cache.put(CLUB_URL, "club")
+        cache.put(GAMESTATS_URL, "gamestats")
+    with patch("time.time", return_value=1500.0):
+        assert cache.get(CLUB_URL) is None          # Older than 100 seconds
+        assert cache.get(GAMESTATS_URL) == "gamestats"
+
+
+def test_lru_eviction(tmp_path):
+    pages = {f"{GAMESTATS_URL}{i}": os.urandom(1000).hex() for i in range(4)}
+    urls = list(pages)
+    clock = iter(range(1000, 2000))
+    with patch("time.time", side_effect=lambda: float(next(clock))):
+        # Find the compressed size of one page, then allow room for three
+        probe = PageCache(str(tmp_path / "probe.db"), 1024 * 1024, TTLS)
+        probe.put(urls[0], pages[urls[0]])
+        budget = 3 * probe.size + 100
+        probe.close()
+
+        cache = PageCache(str(tmp_path / "pages.db"), budget, TTLS)
+        cache.put(urls[0], pages[urls[0]])
+        cache.put(urls[1], pages[urls[1]])
+        cache.get(urls[0])                      # urls[1] is now least recently used
+        cache.put(urls[2], pages[urls[2]])
+        cache.put(urls[3], pages[urls[3]])
+        assert cache.size <= budget
+        assert cache.get(urls[1]) is None
+        assert cache.get(urls[0]) == pages[urls[0]]
+        assert cache.get(urls[3]) == pages[urls[3]]
+    cache.close()
+
+
+def test_reopen_keeps_pages(tmp_path):
+    path = str(tmp_path / "pages.db")
+    cache = PageCache(path, 1024 * 1024, TTLS)
+    cache.put(CLUB_URL, "club")
+    size = cache.size
+    cache.close()
+
+    cache = PageCache(path, 1024 * 1024, TTLS)
+    assert cache.size == size
+    assert cache.get(CLUB_URL) == "club"
+    cache.close()
+
+
+def test_revalidate_expired_page(cache):
+    cache.put(CLUB_URL, "<html>club</html>", '"abc"', "Sat, 01 Mar 2025 00:00:00 GMT")
+    cache.expire(CLUB_URL)
+    assert cache.get(CLUB_URL) is None
+    assert cache.validators(CLUB_URL) == ('"abc"', "Sat, 01 Mar 2025 00:00:00 GMT")
+
+    # The server said the page has not changed
+    assert cache.revalidate(CLUB_URL) == "<html>club</html>"
+    assert (cache.hits, cache.misses, cache.revalidated) == (1, 0, 1)
+    assert cache.get(CLUB_URL) == "<html>club</html>"
+
+
+def test_expire_pages(cache):
+    history = "https://www.uschess.org/msa/MbrDtlTnmtHst.php?12345678"
+    other = "https://www.uschess.org/msa/MbrDtlTnmtHst.php?123456789"
+    for url in [history, history + ".2", history + ".3", other]:
+        cache.put(url, url)
+    cache.expire_pages(history)
+    assert [cache.get(url) for url in [history, history + ".2", history + ".3"]] == [None] * 3
+    assert cache.get(other) == other
+
+
+def test_validators_of_missing_page(cache):
+    assert cache.validators(CLUB_URL) == (None, None)
+    assert cache.revalidate(CLUB_URL) is None
+
+
+def test_old_cache_gets_validator_columns(tmp_path):
+    import sqlite3
+    path = str(tmp_path / "pages.db")
+    with sqlite3.connect(path) as con:
+        con.execute("""CREATE TABLE pages (key TEXT NOT NULL PRIMARY KEY, url TEXT,
+                       body BLOB, size INT, fetched REAL, accessed REAL)""")
+    con.close()
+    cache = PageCache(path, 1024 * 1024, TTLS)
+    cache.put(CLUB_URL, "<html>club</html>", '"abc"')
+    assert cache.validators(CLUB_URL) == ('"abc"', None)
+    cache.close()
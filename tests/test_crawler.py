@@ -0,0 +1,31 @@
+import time
+from unittest.mock import patch
+
+from chess_clubs.crawler import Crawler
+from chess_clubs.head_to_head import HeadToHead
+
+
+def test_crawl_concurrent_matches_serial(page_of, pairs, summarize):
+    with patch.object(HeadToHead, 'get_html', lambda self: page_of(self.player_id)):
+        serial = summarize(Crawler(workers=1).crawl(pairs))
+        concurrent = summarize(Crawler(workers=4).crawl(pairs))
+    assert len(serial) == len(pairs)
+    assert concurrent == serial
+    assert sum(len(games) for _, _, games in serial) == 5 * 6
+
+
+def test_throttle_honours_budget():
+    crawler = Crawler(workers=1, budget=20)
+    start = time.monotonic()
+    crawler.throttle()
+    crawler.throttle()
+    crawler.throttle()
+    assert time.monotonic() - start >= 0.09
+
+
+def test_throttle_without_budget_does_not_sleep():
+    crawler = Crawler(workers=1)
+    with patch("time.sleep") as mock_sleep:
+        crawler.throttle()
+        crawler.throttle()
+    mock_sleep.assert_not_called()
@@ -0,0 +1,46 @@
+import sqlite3
+
+from chess_clubs.core import Main
+
+GAME = ("11111111", "22222222", "202406012762", "OPEN", 1, "W", "W")
+INSERT = """ INSERT OR IGNORE INTO games (pid, oid, tid, sname, rnumber, color, result)
+             VALUES(?, ?, ?, ?, ?, ?, ?) """
+
+
+def index_names(con):
+    sql = "SELECT name FROM sqlite_master WHERE type='index' AND tbl_name='games'"
+    return {row[0] for row in con.execute(sql)}
+
+
+def test_duplicate_games_are_ignored():
+    con = sqlite3.connect(":memory:")
+    Main("A6021250", ":memory:").create_tables(con)
+    con.executemany(INSERT, [GAME, GAME, GAME[:4] + (2, "B", "L")])
+    assert con.execute("SELECT COUNT(*) FROM games").fetchone()[0] == 2
+
+
+def test_create_indexes():
+    con = sqlite3.connect(":memory:")
+    main = Main("A6021250", ":memory:")
+    main.create_tables(con)
+    assert index_names(con) == {"games_key"}
+
+    main.create_indexes(con)
+    assert index_names(con) == {"games_key", "games_pair", "games_tid"}
+
+    # The summaries query is answered from the covering index
+    plan = " ".join(str(row) for row in con.execute(
+        "EXPLAIN QUERY PLAN SELECT pid, oid, COUNT(*) FROM games WHERE pid=? GROUP BY pid, oid",
+        ("11111111",)))
+    assert "COVERING INDEX" in plan
+
+
+def test_old_database_is_deduplicated():
+    con = sqlite3.connect(":memory:")
+    con.execute("""CREATE TABLE games (pid TEXT, oid TEXT, tid TEXT, sname TEXT,
+                                       rnumber INT, color TEXT, result TEXT)""")
+    con.executemany("INSERT INTO games VALUES(?, ?, ?, ?, ?, ?, ?)", [GAME] * 4)
+
+    Main("A6021250", ":memory:").create_tables(con)
+    assert con.execute("SELECT COUNT(*) FROM games").fetchone()[0] == 1
+    assert "games_key" in index_names(con)
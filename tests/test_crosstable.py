@@ -0,0 +1,94 @@
+import sqlite3
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from chess_clubs import config
+from chess_clubs.core import Main
+from chess_clubs.crosstable import Crosstable
+from tests import config as test_config
+from tests.testdata import TESTDATA
+from tests.testdata.server import TestdataServer
+
+CLUB_ID = test_config["club_id"]
+TID = "202406012762"
+
+
+@pytest.fixture
+def crosstable():
+    html = (Path(TESTDATA) / "crosstable.html").read_text(encoding="utf-8")
+    return Crosstable(TID, html=html)
+
+
+def test_details(crosstable):
+    assert crosstable.name == "TOURNAMENT OF POWER 17"
+    assert crosstable.location == "GREENVILLE, NC 27858"
+    assert crosstable.date == "2024-06-01"
+    assert crosstable.club_id == "A6021250"
+    assert crosstable.chief_td_id == "16457832"
+    assert (crosstable.n_sections, crosstable.n_players) == (2, 6)
+
+
+def test_games(crosstable):
+    games = {(g.player_id, g.opponent_id, g.sname, g.rnumber): (g.color, g.result)
+             for g in crosstable.games}
+    # Forfeits are not games, and each game is listed once
+    assert games == {
+        ("30420180", "12205620", "OPEN", 1): ("B", "W"),
+        ("30403332", "99999999", "OPEN", 1): ("W", "W"),
+        ("30403332", "12205620", "OPEN", 2): ("B", "D"),
+        ("30403332", "30420180", "OPEN", 3): ("W", "L"),
+        ("99999999", "12205620", "OPEN", 3): ("W", "D"),
+        ("11054901", "88888888", "RESERVE", 1): ("B", "W"),
+    }
+    game = crosstable.games[0]
+    assert (game.tid, game.tdate, game.tname) == (TID, "2024-06-01", "TOURNAMENT OF POWER 17")
+    assert game.player_name == "Richardson, Avanni"
+
+
+def test_truncated_second_line():
+    html = (Path(TESTDATA) / "crosstable.html").read_text(encoding="utf-8")
+    html = html.replace("|   VA | 99999999 / R: 1500   ->1498     |     |  B  |     |  W  |", "|   VA")
+    crosstable = Crosstable(TID, html=html)
+    # Only the games of the player with the truncated line are lost
+    games = {(g.player_id, g.opponent_id, g.sname, g.rnumber) for g in crosstable.games}
+    assert games == {
+        ("30420180", "12205620", "OPEN", 1),
+        ("30403332", "12205620", "OPEN", 2),
+        ("30403332", "30420180", "OPEN", 3),
+        ("11054901", "88888888", "RESERVE", 1),
+    }
+
+
+def test_crosstable_strategy(tmp_path):
+    dbname = str(tmp_path / "club.db")
+    with TestdataServer(players=5) as server:
+        server.histories = {
+            "30420180": [TID, "202502076302"],
+            "30403332": [TID, "202301068672"],
+            "12205620": [TID, "202502076302"],
+        }
+        with patch.object(config.net, "BASE_URL", server.base_url):
+            Main(CLUB_ID, dbname, budget=0, use_cache=False, strategy="crosstables").run()
+
+            # Club page, active players, 5 histories and 3 crosstables: one
+            # shared in the histories, one shared as the players' last
+            # event, and the one that is served
+            assert server.requests == 2 + 5 + 3
+            with sqlite3.connect(dbname) as con:
+                assert con.execute("SELECT COUNT(*) FROM games").fetchone()[0] == 6
+                row = con.execute("SELECT id, name, n_players FROM tournaments").fetchone()
+                assert row == (TID, "TOURNAMENT OF POWER 17", 6)
+                sql = "SELECT * FROM summaries WHERE pid='30420180' ORDER BY oid"
+                assert con.execute(sql).fetchall() == [
+                    ("30420180", "12205620", 1, 0, 0),
+                    ("30420180", "30403332", 1, 0, 0),
+                ]
+            assert Main(CLUB_ID, dbname).verify() == []
+
+            # A resumed crawl only retries the crosstables that failed
+            server.requests = 0
+            Main(CLUB_ID, dbname, budget=0, use_cache=False, strategy="crosstables",
+                 resume=True).run()
+            assert server.requests == 2 + 5 + 2
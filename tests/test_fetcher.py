@@ -0,0 +1,132 @@
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest.mock import patch
+
+from chess_clubs.config import NetConfig
+from chess_clubs.fetcher import Fetcher
+from tests.testdata import TESTDATA
+from tests.testdata.server import TestdataServer
+
+
+def make_fetcher(**kwargs):
+    net = NetConfig(MAX_ATTEMPTS=3, TIMEOUT=10, RETRY_DELAY=0, **kwargs)
+    return Fetcher(net)
+
+
+def test_session_is_shared_between_threads():
+    fetcher = make_fetcher()
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        sessions = set(executor.map(lambda _: id(fetcher.session), range(32)))
+    assert len(sessions) == 1
+
+
+def test_session_headers():
+    fetcher = make_fetcher(KEEP_ALIVE=False, GZIP=False)
+    assert fetcher.session.headers["Connection"] == "close"
+    assert fetcher.session.headers["Accept-Encoding"] == "identity"
+
+    fetcher = make_fetcher()
+    assert fetcher.session.headers["Connection"] == "keep-alive"
+    assert "gzip" in fetcher.session.headers["Accept-Encoding"]
+
+
+def test_session_pool_size():
+    fetcher = make_fetcher(POOL_SIZE=3)
+    adapter = fetcher.session.get_adapter("https://www.uschess.org")
+    assert adapter._pool_maxsize == 3
+
+
+def test_close_discards_session():
+    fetcher = make_fetcher()
+    session = fetcher.session
+    fetcher.close()
+    assert fetcher.session is not session
+
+
+def test_get_page_reuses_connections():
+    expected = (Path(TESTDATA) / "head_to_head_page.html").read_text(encoding="utf-8")
+    fetcher = make_fetcher(POOL_SIZE=2)
+    with TestdataServer(played={"30403332"}) as server:
+        url = server.url("/datapage/gamestats.php?memid=30420180&drill=30403332")
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            pages = list(executor.map(lambda _: fetcher.get_page(url), range(8)))
+        expected = expected.replace("https://www.uschess.org", server.base_url)
+    fetcher.close()
+    assert pages == [expected] * 8
+
+
+def test_get_page_uses_cache(tmp_path):
+    from chess_clubs.cache import PageCache
+    fetcher = make_fetcher()
+    fetcher.cache = PageCache(str(tmp_path / "pages.db"), 1024 * 1024,
+                              {"club": 60, "active": 60, "gamestats": 60, "other": 60})
+    with TestdataServer() as server:
+        url = server.url("/datapage/gamestats.php?memid=30420180&drill=30403332")
+        first = fetcher.get_page(url)
+        second = fetcher.get_page(url)
+        assert server.requests == 1
+    assert first == second
+    assert (fetcher.cache.hits, fetcher.cache.misses) == (1, 1)
+    fetcher.cache.close()
+    fetcher.close()
+
+
+def test_get_page_revalidates_expired_pages(tmp_path):
+    from chess_clubs.cache import PageCache
+    fetcher = make_fetcher()
+    fetcher.cache = PageCache(str(tmp_path / "pages.db"), 1024 * 1024,
+                              {"club": 60, "active": 60, "gamestats": 60, "other": 60})
+    with TestdataServer() as server:
+        url = server.url("/datapage/gamestats.php?memid=30420180&drill=30403332")
+        first = fetcher.get_page(url)
+        size = fetcher.bytes
+
+        # Unchanged, so the server sends no body
+        fetcher.cache.expire(url)
+        assert fetcher.get_page(url) == first
+        assert (fetcher.requests, fetcher.not_modified, fetcher.bytes) == (2, 1, size)
+        assert (fetcher.cache.hits, fetcher.cache.revalidated) == (1, 1)
+
+        # Changed, so it is downloaded again
+        fetcher.cache.expire(url)
+        server.overrides["/datapage/gamestats.php"] = b"<html>changed</html>"
+        assert fetcher.get_page(url) == "<html>changed</html>"
+        assert fetcher.not_modified == 1
+        assert fetcher.cache.get(url) == "<html>changed</html>"
+    assert str(fetcher).startswith('Fetcher(requests="3",not_modified="1"')
+    fetcher.cache.close()
+    fetcher.close()
+
+
+def test_decode_uses_header_charset():
+    fetcher = make_fetcher(ENCODING="utf-8")
+    body = "Müller".encode("cp1252")
+    assert fetcher.decode("https://example.com", body, "text/html; charset=windows-1252") == "Müller"
+
+
+def test_decode_uses_configured_encoding():
+    fetcher = make_fetcher(ENCODING="cp1252")
+    body = "Müller".encode("cp1252")
+    assert fetcher.decode("https://example.com", body, "text/html") == "Müller"
+    assert fetcher.encodings == {}
+
+
+def test_decode_sniffs_once_per_host():
+    fetcher = make_fetcher()
+    first = '<meta charset="iso-8859-1"><p>Müller</p>'.encode("latin-1")
+    assert fetcher.decode("https://example.com/a", first, "text/html").endswith("Müller</p>")
+    assert fetcher.encodings == {"example.com": "iso8859-1"}
+    # Later pages of the host are decoded the same way, without sniffing
+    with patch("chess_clubs.fetcher.find_charset", return_value=None) as find:
+        assert fetcher.decode("https://example.com/b", "Ä".encode("latin-1")) == "Ä"
+    find.assert_not_called()
+
+
+def test_get_page_without_charset():
+    fetcher = make_fetcher()
+    with TestdataServer() as server:
+        server.content_type = "text/html"
+        html = fetcher.get_page(server.url("/msa/XtblMain.php?202406012762.0"))
+    assert "Section 1" in html
+    assert fetcher.encodings[server.base_url.split("//")[1]] == "utf-8"
+    fetcher.close()
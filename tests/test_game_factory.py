@@ -41,3 +41,27 @@ def test_from_soup_with_valid_row(mock_formatted_name_class):
     assert game.opponent_id == "32197553"
     assert game.opponent_name == "Napier, Graham Rf"
     assert game.result == "W"
+
+
+def test_from_values_matches_from_soup():
+    html = """
+    <tr>
+        <td><a href="http://msa.uschess.org/XtblMain.php?202412219692"> ADULT AND YOUTH BEFORE CHRISTMAS24 </a></td>
+        <td>ADULTS ONLY WEDNESDAY</td>
+        <td>1</td>
+        <td>X</td>
+        <td><a href="./gamestats.php?memid=12910923&amp;ptype=0&amp;rs=R&amp;dkey=wk_memid&amp;drill=32197553">32197553</a></td>
+        <td><a href="http://msa.uschess.org/MbrDtlMain.php?32197553">GRAHAM RF NAPIER</a></td>
+        <td><nobr>1074 =&gt; 1012 (R)</nobr></td>
+        <td>W</td>
+    </tr>
+    """
+    tr = BeautifulSoup(html, "html.parser").find("tr")
+    expected = GameFactory.from_soup("12910923", tr)
+
+    href = "http://msa.uschess.org/XtblMain.php?202412219692"
+    cells = [td.get_text(strip=True) for td in tr.find_all("td")]
+    game = GameFactory.from_values("12910923", href, cells)
+
+    assert game.color == "U"
+    assert str(game) == str(expected)
@@ -0,0 +1,75 @@
+import sqlite3
+
+import pytest
+
+from chess_clubs.core import Main
+from chess_clubs.game_table import GameTable
+from chess_clubs.writer import DatabaseWriter
+
+np = pytest.importorskip("numpy")
+
+ROWS = [
+    ("11111111", "22222222", "202406012762", "OPEN", 1, "W", "W"),
+    ("11111111", "22222222", "202406012762", "OPEN", 2, "B", "D"),
+    ("11111111", "33333333", "202503075872", "U1800", 1, "B", "L"),
+    ("22222222", "33333333", "202503075872", "U1800", 3, "W", "X"),
+    ("22222222", "33333333", None, "", None, None, "W"),
+]
+
+
+def summaries(table):
+    return sorted((s.pid, s.oid, s.wins, s.losses, s.draws) for s in table.summaries())
+
+
+def test_columns():
+    table = GameTable.from_rows(ROWS)
+    assert len(table) == 5
+    assert table.ids == ["11111111", "22222222", "33333333"]
+    assert list(table.pid) == [0, 0, 0, 1, 1]
+    assert list(table.tid) == [202406012762, 202406012762, 202503075872, 202503075872, 0]
+    assert list(table.rnumber) == [1, 2, 1, 3, 0]
+    assert list(table.color) == [0, 1, 1, 0, 2]
+    assert list(table.result) == [0, 2, 1, 3, 0]
+
+
+def test_count_results():
+    assert summaries(GameTable.from_rows(ROWS)) == [
+        ("11111111", "22222222", 1, 0, 1),
+        ("11111111", "33333333", 0, 1, 0),
+        ("22222222", "33333333", 1, 0, 0),
+    ]
+
+
+def test_invert():
+    table = GameTable.from_rows(ROWS)
+    table.invert()
+    assert list(table.color) == [1, 0, 0, 1, 2]
+    assert list(table.result) == [1, 2, 0, 3, 1]
+    assert summaries(table) == [
+        ("22222222", "11111111", 0, 1, 1),
+        ("33333333", "11111111", 1, 0, 0),
+        ("33333333", "22222222", 0, 1, 0),
+    ]
+    # The columns can still grow after being inverted
+    table.extend(ROWS[:1])
+    assert len(table) == 6
+
+
+def test_sparse_pairs_match_dense():
+    table = GameTable.from_rows(ROWS)
+    dense = [column.tolist() for column in table.count_results()]
+    table.ids.extend(str(i) for i in range(2000))  # Too many players to count every pair
+    sparse = [column.tolist() for column in table.count_results()]
+    assert sparse == dense
+
+
+def test_matches_summaries_table():
+    con = sqlite3.connect(":memory:")
+    Main("A6021250", ":memory:").create_tables(con)
+    with DatabaseWriter(con) as writer:
+        writer.add_games(ROWS)
+    table = GameTable.from_database(con)
+    assert len(table) == 10
+    assert summaries(table) == sorted(con.execute(
+        "SELECT pid, oid, wins, losses, draws FROM summaries"))
+    con.close()
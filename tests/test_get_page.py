@@ -8,7 +8,7 @@ def test_get_page_happy_path():
     url = "https://example.com"
     expected_html = "<html><body><h1>Test Page</h1></body></html>"
     
-    with patch("requests.get") as mock_get:
+    with patch("requests.Session.get") as mock_get:
         mock_response = requests.Response()
         mock_response.status_code = 200
         mock_response._content = expected_html.encode("utf-8")
@@ -20,7 +20,7 @@ def test_get_page_happy_path():
 def test_get_page_http_error():
     url = "https://example.com"
     
-    with patch("requests.get") as mock_get:
+    with patch("requests.Session.get") as mock_get:
         mock_response = requests.Response()
         mock_response.status_code = 404
         mock_response._content = b"Not Found"
@@ -33,7 +33,7 @@ def test_get_page_http_error():
 def test_get_page_connection_error():
     url = "https://example.com"
     
-    with patch("requests.get") as mock_get:
+    with patch("requests.Session.get") as mock_get:
         mock_get.side_effect = requests.exceptions.ConnectionError("Failed to establish a new connection")
         
         with pytest.raises(requests.exceptions.ConnectionError):
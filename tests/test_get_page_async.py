@@ -0,0 +1,81 @@
+import asyncio
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from chess_clubs import get_page_async
+from tests.testdata import TESTDATA
+from tests.testdata.server import TestdataServer
+
+aiohttp = pytest.importorskip("aiohttp")
+
+
+def fetch(url):
+    async def main():
+        async with aiohttp.ClientSession() as session:
+            return await get_page_async(session, url)
+    return asyncio.run(main())
+
+
+def test_get_page_async_happy_path():
+    expected = (Path(TESTDATA) / "head_to_head_page.html").read_text(encoding="utf-8")
+    with TestdataServer(played={"30403332"}) as server:
+        actual = fetch(server.url("/datapage/gamestats.php?memid=30420180&drill=30403332"))
+        expected = expected.replace("https://www.uschess.org", server.base_url)
+    assert actual == expected
+
+
+def test_get_page_async_http_error():
+    with TestdataServer() as server:
+        with pytest.raises(aiohttp.ClientResponseError):
+            fetch(server.url("/no/such/page.php"))
+
+
+def test_get_page_async_retries_when_throttled():
+    with TestdataServer() as server:
+        server.throttle = 1
+        server.retry_after = "0"
+        html = fetch(server.url("/datapage/gamestats.php?memid=30420180&drill=30403332"))
+        assert server.requests == 2
+    assert "Games against" not in html
+
+
+def test_get_page_async_revalidates(tmp_path):
+    from chess_clubs import fetcher
+    from chess_clubs.cache import PageCache
+    fetcher.cache = PageCache(str(tmp_path / "pages.db"), 1024 * 1024,
+                              {"club": 60, "active": 60, "gamestats": 60, "other": 60})
+    try:
+        with TestdataServer() as server:
+            url = server.url("/datapage/gamestats.php?memid=30420180&drill=30403332")
+            first = fetch(url)
+            fetcher.cache.expire(url)
+            assert fetch(url) == first
+            assert server.requests == 2
+            assert fetcher.cache.revalidated == 1
+    finally:
+        fetcher.cache.close()
+        fetcher.cache = None
+
+
+def test_get_page_async_refetches_evicted_page(tmp_path):
+    from chess_clubs import config, fetcher
+    from chess_clubs.cache import PageCache
+    fetcher.cache = PageCache(str(tmp_path / "pages.db"), 1024 * 1024,
+                              {"club": 60, "active": 60, "gamestats": 60, "other": 60})
+    try:
+        with TestdataServer() as server:
+            url = server.url("/datapage/gamestats.php?memid=30420180&drill=30403332")
+            first = fetch(url)
+            fetcher.cache.expire(url)
+            # The page is evicted between the 304 and its revalidation, on
+            # the last attempt
+            evict = lambda url: fetcher.cache.delete(url)
+            with patch.object(fetcher.cache, "revalidate", side_effect=evict), \
+                 patch.object(config.net, "MAX_ATTEMPTS", 1):
+                assert fetch(url) == first
+            assert server.requests == 3
+    finally:
+        fetcher.cache.close()
+        fetcher.cache = None
@@ -0,0 +1,33 @@
+from chess_clubs import get_player_pairs
+from chess_clubs.player import Player
+
+
+def make_players(n):
+    return [Player(f"{10000000 + i}", f"PLAYER NUMBER{i}") for i in range(n)]
+
+
+def test_get_player_pairs_count():
+    players = make_players(10)
+    pairs = list(get_player_pairs(players))
+    assert len(pairs) == 10 * 9 // 2
+
+
+def test_get_player_pairs_each_unordered_pair_once():
+    players = make_players(6)
+    pairs = list(get_player_pairs(players))
+    keys = [frozenset((player.id, opponent.id)) for player, opponent in pairs]
+    assert len(keys) == len(set(keys))
+    for player, opponent in pairs:
+        assert player.id != opponent.id
+
+
+def test_get_player_pairs_skips_duplicate_player():
+    players = make_players(2)
+    players.append(Player(players[0].id, "PLAYER NUMBER0"))
+    pairs = list(get_player_pairs(players))
+    assert pairs == [(players[0], players[1])]
+
+
+def test_get_player_pairs_empty():
+    assert list(get_player_pairs([])) == []
+    assert list(get_player_pairs(make_players(1))) == []
@@ -33,3 +33,34 @@ def test_head_to_head_zero(bad_html):
         assert h2h.opponent_id == "87654321"
         assert isinstance(h2h.games, list)
         assert len(h2h.games) == 0
+
+@pytest.mark.parametrize("parser", ["lxml", "xpath"])
+def test_head_to_head_parsers_agree(sample_html, parser):
+    pytest.importorskip("lxml")
+    expected = HeadToHead("12345678", "87654321", html=sample_html, parser="html.parser")
+    h2h = HeadToHead("12345678", "87654321", html=sample_html, parser=parser)
+    assert [str(game) for game in h2h.games] == [str(game) for game in expected.games]
+
+@pytest.mark.parametrize("parser", ["lxml", "xpath"])
+def test_head_to_head_parsers_zero(bad_html, parser):
+    pytest.importorskip("lxml")
+    h2h = HeadToHead("12345678", "87654321", html=bad_html, parser=parser)
+    assert h2h.games == []
+
+def test_head_to_head_unknown_parser(sample_html):
+    with pytest.raises(ValueError):
+        HeadToHead("12345678", "87654321", html=sample_html, parser="html5lib")
+
+def test_head_to_head_empty_fast_path(sample_html, bad_html):
+    HeadToHead.reset_counts()
+    with patch.object(HeadToHead, "parse_stream") as parse_stream, \
+         patch.object(HeadToHead, "parse_soup") as parse_soup:
+        h2h = HeadToHead("12345678", "87654321", html=bad_html)
+    assert h2h.games == []
+    parse_stream.assert_not_called()
+    parse_soup.assert_not_called()
+
+    HeadToHead("12345678", "87654321", html=sample_html)
+    assert HeadToHead.pages == 2
+    assert HeadToHead.empty_pages == 1
+    assert HeadToHead.counts() == 'HeadToHead(pages="2",empty_pages="1")'
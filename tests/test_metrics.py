@@ -0,0 +1,113 @@
+import io
+import json
+import pickle
+from unittest.mock import patch
+
+import pytest
+
+from chess_clubs import config
+from chess_clubs.core import Main
+from chess_clubs.metrics import Histogram, Metrics, Progress
+from tests import config as test_config
+from tests.testdata.server import TestdataServer
+
+CLUB_ID = test_config["club_id"]
+
+
+def test_histogram():
+    histogram = Histogram()
+    for value in [0.001, 0.002, 0.003, 0.1, 0]:
+        histogram.observe(value)
+    summary = histogram.summary()
+    assert summary["count"] == 5
+    assert summary["total"] == pytest.approx(0.106)
+    assert summary["min"] == 0
+    assert summary["max"] == 0.1
+    # Percentiles are the upper bound of their power-of-two bucket
+    assert 0.002 <= summary["p50"] <= 0.004
+    assert summary["p99"] == 0.1
+
+
+def test_empty_histogram():
+    summary = Histogram().summary()
+    assert summary["count"] == 0
+    assert summary["mean"] is None
+    assert summary["p50"] is None
+
+
+def test_metrics():
+    m = Metrics()
+    m.incr("fetch.retries")
+    m.incr("fetch.retries", 2)
+    with m.timer("parse.seconds"):
+        pass
+    snapshot = m.snapshot()
+    assert snapshot["counters"] == {"fetch.retries": 3}
+    assert snapshot["histograms"]["parse.seconds"]["count"] == 1
+    assert m.total("db.flush.seconds") == 0.0
+    m.reset()
+    assert m.snapshot() == {"counters": {}, "histograms": {}}
+
+
+def test_merge_pickled_metrics():
+    child = Metrics()
+    child.incr("db.game_rows", 4)
+    child.observe("parse.seconds", 0.5)
+    child = pickle.loads(pickle.dumps(child))
+
+    parent = Metrics()
+    parent.incr("db.game_rows")
+    parent.observe("parse.seconds", 0.25)
+    parent.merge(child)
+    snapshot = parent.snapshot()
+    assert snapshot["counters"] == {"db.game_rows": 5}
+    parse = snapshot["histograms"]["parse.seconds"]
+    assert (parse["count"], parse["total"], parse["min"], parse["max"]) == (2, 0.75, 0.25, 0.5)
+
+
+def test_progress_records():
+    stream = io.StringIO()
+    progress = Progress(10, stream, workers=2, interval=0)
+    progress.update(4)
+    progress.finish()
+    first, last = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert first["done"] == 4
+    assert first["total"] == 10
+    assert first["final"] is False
+    assert first["rate"] > 0
+    assert first["eta"] > 0
+    assert last["final"] is True
+    assert last["eta"] == 0.0
+    assert set(last["busy"]) == {"fetch", "parse", "write"}
+
+
+def test_progress_interval():
+    stream = io.StringIO()
+    progress = Progress(1000, stream, interval=60)
+    for _ in range(1000):
+        progress.update()
+    assert stream.getvalue() == ""
+
+
+def test_run_writes_progress(tmp_path):
+    path = tmp_path / "progress.jsonl"
+    with TestdataServer(played={"30403332"}, players=5) as server:
+        with patch.object(config.net, "BASE_URL", server.base_url):
+            Main(CLUB_ID, str(tmp_path / "club.db"), budget=0, use_cache=False,
+                 progress=str(path), progress_interval=0).run()
+    records = [json.loads(line) for line in path.read_text().splitlines()]
+    assert len(records) == 11  # One per pair, and the final one
+    final = records[-1]
+    assert final["final"] is True
+    assert final["done"] == final["total"] == 10
+    assert final["bound"] in ("fetch", "parse", "write")
+    counters, histograms = final["counters"], final["histograms"]
+    assert histograms["fetch.seconds"]["count"] >= 12
+    assert histograms["fetch.bytes"]["total"] > 0
+    assert histograms["pair.games"]["count"] == 10
+    assert histograms["pair.games"]["total"] == 6
+    assert histograms["parse.seconds"]["count"] == 1  # The empty pages are not parsed
+    assert histograms["db.flush.seconds"]["count"] >= 1
+    assert counters["db.game_rows"] == 12
+    assert "fetch.retries" not in counters
+
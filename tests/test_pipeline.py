@@ -0,0 +1,124 @@
+import sqlite3
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from chess_clubs import config
+from chess_clubs.core import Main
+from chess_clubs.crawler import Crawler
+from chess_clubs.head_to_head import GameRows, HeadToHead
+from chess_clubs.metrics import metrics
+from chess_clubs.pipeline import Pipeline
+from chess_clubs.player import Player
+from tests import config as test_config
+from tests.testdata.server import TestdataServer
+
+
+def fake_fetch(page_of, delays=None):
+    def fetch(self, player, opponent):
+        if delays:
+            time.sleep(delays.get(opponent.id, 0))
+        return page_of(player.id)
+    return fetch
+
+
+def test_pipeline_matches_serial(page_of, pairs, summarize):
+    with patch.object(HeadToHead, "get_html", lambda self: page_of(self.player_id)):
+        serial = summarize(Crawler(workers=1).crawl(pairs))
+    # Slow down some pages, so that they arrive out of order
+    delays = {"10000001": 0.05, "10000003": 0.02}
+    with patch.object(Pipeline, "fetch_head_to_head", fake_fetch(page_of, delays)):
+        pipelined = summarize(Pipeline(fetchers=4, parsers=2).crawl(pairs))
+    assert pipelined == serial
+    assert sum(len(games) for _, _, games in pipelined) == 5 * 6
+
+
+def test_process_parsing(page_of, pairs):
+    with patch.object(Pipeline, "fetch_head_to_head", fake_fetch(page_of)):
+        threaded = list(Pipeline(fetchers=2, parsers=2).crawl(pairs))
+        metrics.reset()
+        HeadToHead.reset_counts()
+        pipeline = Pipeline(fetchers=2, parsers=2, processes=True, chunk_size=4)
+        pooled = list(pipeline.crawl(pairs))
+    assert all(isinstance(rows, GameRows) for _, _, rows in pooled)
+    assert [rows.games for _, _, rows in pooled] == [h2h.to_rows().games for _, _, h2h in threaded]
+    # The counts of the worker processes are brought back
+    assert HeadToHead.pages == len(pairs)
+    assert metrics.snapshot()["histograms"]["pair.games"]["total"] == 5 * 6
+
+
+def test_failures_are_returned(pages, pairs):
+    def fetch(self, player, opponent):
+        if opponent.id == "10000002":
+            raise ValueError("unreachable")
+        return pages[1]
+
+    with patch.object(Pipeline, "fetch_head_to_head", fetch):
+        results = list(Pipeline(fetchers=2, parsers=2).crawl(pairs))
+    failed = [(p.id, o.id) for p, o, h2h in results if isinstance(h2h, Exception)]
+    assert failed == [("10000000", "10000002"), ("10000001", "10000002")]
+    assert len(results) == len(pairs)
+
+
+def test_backpressure(pages, pairs):
+    fetched = []
+
+    def fetch(self, player, opponent):
+        fetched.append((player.id, opponent.id))
+        return pages[1]
+
+    with patch.object(Pipeline, "fetch_head_to_head", fetch):
+        crawl = Pipeline(fetchers=2, parsers=1, queue_size=3).crawl(pairs)
+        next(crawl)
+        time.sleep(0.1)
+        # The caller holds one item; at most queue_size more are in flight
+        assert len(fetched) <= 1 + 3
+        crawl.close()
+
+
+def test_early_close_joins_threads(page_of, pairs):
+    before = threading.active_count()
+    with patch.object(Pipeline, "fetch_head_to_head", fake_fetch(page_of)):
+        crawl = Pipeline(fetchers=3, parsers=2, queue_size=2).crawl(pairs)
+        next(crawl)
+        crawl.close()
+    assert threading.active_count() == before
+
+
+def test_planning_error_is_raised(page_of):
+    def planned():
+        yield Player("10000000", "A B"), Player("10000001", "C D")
+        raise RuntimeError("planning failed")
+
+    with patch.object(Pipeline, "fetch_head_to_head", fake_fetch(page_of)):
+        crawl = Pipeline(fetchers=2, parsers=2).crawl(planned())
+        assert next(crawl)[0].id == "10000000"
+        with pytest.raises(RuntimeError):
+            next(crawl)
+
+
+def test_crosstables():
+    with TestdataServer() as server:
+        with patch.object(config.net, "BASE_URL", server.base_url):
+            results = list(Pipeline(fetchers=2, parsers=2).crosstables(
+                ["202406012762", "202406012762"]))
+    assert [tid for tid, _ in results] == ["202406012762"] * 2
+    assert all(crosstable.n_players == 6 for _, crosstable in results)
+
+
+def test_run_with_pipeline(tmp_path):
+    club_id = test_config["club_id"]
+    tables = []
+    with TestdataServer(played={"30403332"}, players=5) as server:
+        with patch.object(config.net, "BASE_URL", server.base_url):
+            for engine, processes in [("threads", False), ("pipeline", False), ("pipeline", True)]:
+                dbname = str(tmp_path / f"{engine}-{processes}.db")
+                Main(club_id, dbname, workers=3, parsers=2, queue_size=4, processes=processes,
+                     budget=0, use_cache=False, engine=engine).run()
+                with sqlite3.connect(dbname) as con:
+                    tables.append(con.execute("SELECT * FROM games ORDER BY 1, 2, 3, 4, 5").fetchall())
+    assert tables[1] == tables[0]
+    assert tables[2] == tables[0]
+    assert len(tables[0]) == 12
@@ -0,0 +1,116 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import formatdate
+import time
+
+import pytest
+import requests
+
+from chess_clubs.config import NetConfig
+from chess_clubs.fetcher import Fetcher
+from chess_clubs.metrics import metrics
+from chess_clubs.rate_limiter import RateLimiter, backoff_delay, parse_retry_after
+from tests.testdata.server import TestdataServer
+
+GAMESTATS = "/datapage/gamestats.php?memid=30420180&drill=30403332"
+
+
+def test_burst_then_rate():
+    limiter = RateLimiter(rate=100, burst=5)
+    waits = [limiter.reserve() for _ in range(7)]
+    assert waits[:5] == [0] * 5
+    assert waits[5] == pytest.approx(0.01, abs=0.002)
+    assert waits[6] == pytest.approx(0.02, abs=0.002)
+
+
+def test_no_limit():
+    limiter = RateLimiter(rate=0)
+    assert all(limiter.reserve() == 0 for _ in range(100))
+
+
+def test_pause_holds_back_everyone():
+    limiter = RateLimiter(rate=0)
+    limiter.pause(0.5)
+    assert limiter.reserve() == pytest.approx(0.5, abs=0.05)
+
+
+def test_shared_between_threads():
+    limiter = RateLimiter(rate=50, burst=1)
+    start = time.monotonic()
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        list(executor.map(lambda _: limiter.acquire(), range(11)))
+    assert time.monotonic() - start >= 0.19
+
+
+def test_shared_between_tasks():
+    limiter = RateLimiter(rate=50, burst=1)
+
+    async def main():
+        await asyncio.gather(*(limiter.acquire_async() for _ in range(11)))
+
+    start = time.monotonic()
+    asyncio.run(main())
+    assert time.monotonic() - start >= 0.19
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(formatdate(time.time() + 10, usegmt=True)) == pytest.approx(10, abs=1.5)
+    assert parse_retry_after(formatdate(time.time() - 10, usegmt=True)) == 0
+
+
+def test_backoff_delay():
+    for attempt in range(10):
+        assert 0 <= backoff_delay(attempt, 1, 8) <= min(8, 2 ** attempt)
+    assert backoff_delay(5, 1, 8, retry_after=30) == 30
+
+
+def make_fetcher(**kwargs):
+    settings = {"MAX_ATTEMPTS": 3, "TIMEOUT": 10, "RETRY_DELAY": 0.01}
+    settings.update(kwargs)
+    net = NetConfig(**settings)
+    return Fetcher(net)
+
+
+def test_fetcher_retries_when_throttled():
+    fetcher = make_fetcher()
+    metrics.reset()
+    with TestdataServer() as server:
+        server.throttle = 2
+        assert "Games against" not in fetcher.get_page(server.url(GAMESTATS))
+        assert server.requests == 3
+    assert metrics.snapshot()["counters"]["fetch.retries"] == 2
+    fetcher.close()
+
+
+def test_fetcher_gives_up():
+    fetcher = make_fetcher(MAX_ATTEMPTS=2)
+    with TestdataServer() as server:
+        server.throttle = 5
+        with pytest.raises(requests.exceptions.HTTPError):
+            fetcher.get_page(server.url(GAMESTATS))
+        assert server.requests == 2
+    fetcher.close()
+
+
+def test_fetcher_honours_retry_after():
+    fetcher = make_fetcher()
+    with TestdataServer() as server:
+        server.throttle = 1
+        server.retry_after = "1"
+        start = time.monotonic()
+        fetcher.get_page(server.url(GAMESTATS))
+        assert time.monotonic() - start >= 1
+    fetcher.close()
+
+
+def test_fetcher_rate():
+    fetcher = make_fetcher(RATE=20, BURST=1)
+    with TestdataServer() as server:
+        start = time.monotonic()
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            list(executor.map(lambda _: fetcher.get_page(server.url(GAMESTATS)), range(6)))
+        assert time.monotonic() - start >= 0.24
+    fetcher.close()
@@ -0,0 +1,77 @@
+import sqlite3
+from unittest.mock import patch
+
+import pytest
+
+from chess_clubs.club import Club
+from chess_clubs.core import Main
+from chess_clubs.writer import DatabaseWriter
+from tests import config as test_config
+
+CLUB_ID = test_config["club_id"]
+
+
+def crawl_state(dbname):
+    with sqlite3.connect(dbname) as con:
+        sql = "SELECT pid, oid, status, attempts FROM crawl_state"
+        return {(pid, oid): (status, attempts) for pid, oid, status, attempts in con.execute(sql)}
+
+
+def test_resume_retries_failed_pairs(server, tmp_path):
+    dbname = str(tmp_path / "club.db")
+    server.failing = {"30403332"}
+    Main(CLUB_ID, dbname, budget=0, use_cache=False).run()
+
+    state = crawl_state(dbname)
+    assert len(state) == 10
+    assert state[("30420180", "30403332")] == ("failed", 1)
+
+    # The server has recovered, so resume the crawl
+    server.failing = set()
+    server.requests = 0
+    Main(CLUB_ID, dbname, budget=0, use_cache=False, resume=True).run()
+    assert server.requests == 2 + 1
+
+    state = crawl_state(dbname)
+    assert state[("30420180", "30403332")] == ("done", 2)
+    assert all(status == "done" for status, _ in state.values())
+    with sqlite3.connect(dbname) as con:
+        assert con.execute("SELECT COUNT(*) FROM games").fetchone()[0] == 12
+        assert con.execute("SELECT COUNT(*) FROM summaries").fetchone()[0] == 2
+
+
+def test_resume_after_interruption(server, tmp_path):
+    dbname = str(tmp_path / "club.db")
+    original = DatabaseWriter.add_head_to_head
+    calls = []
+
+    def interrupted(self, pid, oid, games, replace=False):
+        if len(calls) == 4:
+            raise KeyboardInterrupt
+        calls.append((pid, oid))
+        original(self, pid, oid, games, replace)
+
+    with patch.object(DatabaseWriter, "add_head_to_head", interrupted):
+        with pytest.raises(KeyboardInterrupt):
+            Main(CLUB_ID, dbname, budget=0, use_cache=False).run()
+    assert len(crawl_state(dbname)) == 4
+
+    server.requests = 0
+    Main(CLUB_ID, dbname, budget=0, use_cache=False, resume=True).run()
+    assert server.requests == 2 + 6
+    assert len(crawl_state(dbname)) == 10
+    with sqlite3.connect(dbname) as con:
+        assert con.execute("SELECT COUNT(*) FROM games").fetchone()[0] == 12
+
+
+def test_resume_with_reordered_players(server, tmp_path):
+    dbname = str(tmp_path / "club.db")
+    Main(CLUB_ID, dbname, budget=0, use_cache=False).run()
+
+    # The active player list comes back in the opposite order
+    original = Club.get_active_players
+    reordered = lambda self, *args: reversed(list(original(self, *args)))
+    server.requests = 0
+    with patch.object(Club, "get_active_players", reordered):
+        Main(CLUB_ID, dbname, budget=0, use_cache=False, resume=True).run()
+    assert server.requests == 2
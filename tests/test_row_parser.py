@@ -0,0 +1,60 @@
+import re
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from chess_clubs.head_to_head import HeadToHead
+from chess_clubs.row_parser import GameRowParser, LayoutError
+from tests.testdata import TESTDATA
+
+
+def read(name):
+    return (Path(TESTDATA) / name).read_text(encoding="utf-8")
+
+
+def test_parse_games():
+    html = read("head_to_head_page.html")
+    expected = HeadToHead("30420180", "30403332", html=html, parser="html.parser")
+    games = GameRowParser.parse("30420180", html)
+    assert len(games) == 6
+    assert [str(game) for game in games] == [str(game) for game in expected.games]
+
+
+def test_parse_zero_games():
+    html = read("head_to_head_zero.html")
+    with patch.object(GameRowParser, "feed") as feed:
+        assert GameRowParser.parse("30420180", html) == []
+    feed.assert_not_called()
+
+
+def test_parse_compact_page():
+    html = read("head_to_head_page.html")
+    compact = re.sub(r">\s+<", "><", html)
+    games = GameRowParser.parse("30420180", compact)
+    assert len(games) == 6
+
+
+@pytest.mark.parametrize("html", [
+    "<html><body>No footer</body></html>",
+    "<div id='banner_sep'></div>",
+])
+def test_layout_errors(html):
+    html = html.replace("<div", "<a href='XtblMain.php?1'></a><div")
+    with pytest.raises(LayoutError):
+        GameRowParser.parse("30420180", html)
+
+
+def test_layout_error_bad_row():
+    html = read("head_to_head_page.html").replace("<td>\n          B\n", "<td>\n          ?\n", 1)
+    html = html.replace("<td>\n          3\n", "<td>\n          three\n", 1)
+    with pytest.raises(LayoutError):
+        GameRowParser.parse("30420180", html)
+
+
+def test_head_to_head_falls_back():
+    html = read("head_to_head_page.html").replace("banner_sep", "footer")
+    with pytest.raises(LayoutError):
+        GameRowParser.parse("30420180", html)
+    h2h = HeadToHead("30420180", "30403332", html=html, parser="stream")
+    assert len(h2h.games) == 6
@@ -28,4 +28,21 @@ def test_invert():
     assert summary.wins == 1
     assert summary.losses == 3
     assert summary.draws == 2
-    
\ No newline at end of file
+    
+
+def test_pct_follows_counts():
+    summary = Summary("12345678", "87654321")
+    assert summary.pct == 0.0
+    summary.wins = 3
+    summary.draws = 2
+    summary.losses = 1
+    assert summary.games == 6
+    assert summary.pct == 100.0 * 4 / 6
+    summary.invert()
+    assert summary.pct == 100.0 * 2 / 6
+
+
+def test_slots():
+    summary = Summary("12345678", "87654321")
+    assert not hasattr(summary, "__dict__")
+    assert not hasattr(Game(), "__dict__")
@@ -0,0 +1,76 @@
+import sqlite3
+from unittest.mock import patch
+
+from chess_clubs import config
+from chess_clubs.core import Main
+from chess_clubs.player import Player
+from chess_clubs.tournament_history import TournamentHistory, TournamentIndex
+from tests import config as test_config
+from tests.testdata.server import TestdataServer
+
+CLUB_ID = test_config["club_id"]
+
+PAGE_1 = """
+<table>
+<tr><td><a href="http://msa.uschess.org/XtblMain.php?202502076302-30420180">EVENT 1</a></td></tr>
+<tr><td><a href="http://msa.uschess.org/XtblMain.php?202406012762-30420180">EVENT 2</a></td></tr>
+<tr><td><a href="http://msa.uschess.org/XtblMain.php?202406012762-30420180">EVENT 2</a></td></tr>
+</table>
+<a href="MbrDtlTnmtHst.php?30420180.2">[2]</a> <a href="MbrDtlTnmtHst.php?30420180.3">[3]</a>
+"""
+
+PAGE_2 = """
+<tr><td><a href="http://msa.uschess.org/XtblMain.php?202304155302-30420180">EVENT 3</a></td></tr>
+"""
+
+
+def test_history_reads_all_pages():
+    pages = {
+        TournamentHistory.get_url("30420180", 2): PAGE_2,
+        TournamentHistory.get_url("30420180", 3): "",
+    }
+    with patch("chess_clubs.tournament_history.get_page", side_effect=pages.get) as get_page:
+        history = TournamentHistory("30420180", html=PAGE_1)
+    assert get_page.call_count == 2
+    assert history.tids == {"202502076302", "202406012762", "202304155302"}
+
+
+def test_history_url():
+    assert TournamentHistory.get_url("30420180").endswith("/msa/MbrDtlTnmtHst.php?30420180")
+    assert TournamentHistory.get_url("30420180", 2).endswith("/msa/MbrDtlTnmtHst.php?30420180.2")
+
+
+def test_index_filter():
+    players = [Player(id, "JOHN DOE") for id in ["1", "2", "3", "4", "5"]]
+    pairs = [(p, o) for i, p in enumerate(players) for o in players[i + 1:]]
+
+    index = TournamentIndex()
+    index.add("1", ["A", "B"])
+    index.add("2", ["B"])
+    index.add("3", ["C"])
+    index.add("4", ["A", "C"])
+    index.add_unknown("5")
+
+    kept = [(p.id, o.id) for p, o in index.filter(pairs)]
+    assert kept == [("1", "2"), ("1", "4"), ("1", "5"),
+                    ("2", "5"), ("3", "4"), ("3", "5"), ("4", "5")]
+
+
+def test_prefilter(tmp_path):
+    dbname = str(tmp_path / "club.db")
+    with TestdataServer(played={"30403332"}, players=5) as server:
+        server.histories = {
+            "30420180": ["202406012762", "202502076302"],
+            "30403332": ["202406012762"],
+            "12205620": ["202301068672"],
+            "11054901": ["202301068672"],
+        }
+        with patch.object(config.net, "BASE_URL", server.base_url):
+            Main(CLUB_ID, dbname, budget=0, use_cache=False, prefilter=True).run()
+
+        # Club page, active players, 5 histories and 2 of the 10 pairs
+        assert server.requests == 2 + 5 + 2
+
+    with sqlite3.connect(dbname) as con:
+        assert con.execute("SELECT COUNT(*) FROM games").fetchone()[0] == 12
+        assert con.execute("SELECT COUNT(*) FROM crawl_state").fetchone()[0] == 2
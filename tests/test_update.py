@@ -0,0 +1,143 @@
+import sqlite3
+from unittest.mock import patch
+
+from bs4 import BeautifulSoup
+import pytest
+
+from chess_clubs import fetcher
+from chess_clubs.cache import PageCache
+from chess_clubs.core import Main
+from chess_clubs.crawler import Crawler
+from chess_clubs.player import Player
+from chess_clubs.tournament_history import TournamentHistory
+from chess_clubs.writer import DatabaseWriter
+from tests import config as test_config
+
+CLUB_ID = test_config["club_id"]
+
+
+def with_event_count(html: bytes, player_id: str, event_count: str) -> bytes:
+    soup = BeautifulSoup(html, "html.parser")
+    for tr in soup.find("h4").find_next("table").find_all("tr")[1:]:
+        tds = tr.find_all("td", recursive=False)
+        if tds[1].get_text(strip=True) == player_id:
+            tds[7].string = event_count
+    return str(soup).encode("utf-8")
+
+
+def count(con, table):
+    return con.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+
+def test_update_recrawls_only_changed_players(server, tmp_path):
+    dbname = str(tmp_path / "club.db")
+    Main(CLUB_ID, dbname, budget=0, use_cache=False).run()
+    assert server.requests == 2 + 10
+
+    # Nothing changed, so only the club page and active list are fetched
+    server.requests = 0
+    Main(CLUB_ID, dbname, budget=0, use_cache=False, update=True).run()
+    assert server.requests == 2
+
+    # One player has played in another event
+    server.requests = 0
+    server.overrides["/datapage/top-affil-players.php"] = with_event_count(
+        server.active_players(), "12205620", "9")
+    Main(CLUB_ID, dbname, budget=0, use_cache=False, update=True).run()
+    assert server.requests == 2 + 4
+
+    with sqlite3.connect(dbname) as con:
+        assert count(con, "players") == 5
+        assert count(con, "games") == 12
+        assert count(con, "summaries") == 2
+        sql = "SELECT event_count FROM players WHERE id='12205620'"
+        assert con.execute(sql).fetchone()[0] == 9
+    assert Main(CLUB_ID, dbname).verify() == []
+
+
+def test_update_replaces_games_of_changed_pairs(server, tmp_path):
+    dbname = str(tmp_path / "club.db")
+    Main(CLUB_ID, dbname, budget=0, use_cache=False).run()
+
+    # The first player has played again, and the games page changed
+    server.played = set()
+    server.overrides["/datapage/top-affil-players.php"] = with_event_count(
+        server.active_players(), "30420180", "22")
+    Main(CLUB_ID, dbname, budget=0, use_cache=False, update=True).run()
+
+    with sqlite3.connect(dbname) as con:
+        assert count(con, "games") == 0
+        assert count(con, "summaries") == 0
+    assert Main(CLUB_ID, dbname).verify() == []
+
+
+def test_interrupted_update_is_done_again(server, tmp_path):
+    dbname = str(tmp_path / "club.db")
+    Main(CLUB_ID, dbname, budget=0, use_cache=False).run()
+
+    # The first player has played again, but the update is interrupted
+    server.played = set()
+    server.overrides["/datapage/top-affil-players.php"] = with_event_count(
+        server.active_players(), "30420180", "22")
+    with patch.object(DatabaseWriter, "add_head_to_head", side_effect=KeyboardInterrupt):
+        with pytest.raises(KeyboardInterrupt):
+            Main(CLUB_ID, dbname, budget=0, use_cache=False, update=True).run()
+
+    # The player still looks changed, so the next update recrawls the pairs
+    server.requests = 0
+    Main(CLUB_ID, dbname, budget=0, use_cache=False, update=True).run()
+    assert server.requests == 2 + 4
+    with sqlite3.connect(dbname) as con:
+        assert count(con, "games") == 0
+        sql = "SELECT event_count FROM players WHERE id='30420180'"
+        assert con.execute(sql).fetchone()[0] == 22
+    assert Main(CLUB_ID, dbname).verify() == []
+
+
+def test_get_changed_players():
+    con = sqlite3.connect(":memory:")
+    main = Main(CLUB_ID, ":memory:")
+    main.create_tables(con)
+    DatabaseWriter(con).add_players([
+        Player("11111111", "ALICE A", event_count="3", last_event="202401010001"),
+        Player("22222222", "BOB B", event_count="5", last_event="202401010001"),
+    ])
+
+    players = [
+        Player("11111111", "ALICE A", event_count="3", last_event="202401010001"),
+        Player("22222222", "BOB B", event_count="6", last_event="202402020002"),
+        Player("33333333", "CAROL C", event_count="1", last_event="202402020002"),
+    ]
+    assert main.get_changed_players(con, players) == {"22222222", "33333333"}
+
+
+@pytest.fixture
+def history_cache(tmp_path):
+    ttls = dict.fromkeys(["club", "active", "gamestats", "history", "other"], 100)
+    cache = PageCache(str(tmp_path / "pages.db"), 1024 * 1024, ttls)
+    with patch.object(fetcher, "cache", cache), \
+            patch.object(Main, "get_changed_players", return_value={"22222222"}):
+        yield cache
+    cache.close()
+
+
+HISTORY_URLS = [TournamentHistory.get_url(id, page) for id in ["11111111", "22222222"] for page in [1, 2]]
+PLAYERS = [Player("11111111", "ALICE A"), Player("22222222", "BOB B")]
+
+
+def test_update_expires_every_history_page(history_cache):
+    for url in HISTORY_URLS:
+        history_cache.put(url, "")
+    Main(CLUB_ID, ":memory:", update=True).plan_pairs(None, PLAYERS)
+    assert [history_cache.get(url) for url in HISTORY_URLS] == ["", "", None, None]
+
+
+def test_tournament_update_expires_every_history_page(history_cache):
+    for url in HISTORY_URLS:
+        history_cache.put(url, "")
+    con = sqlite3.connect(":memory:")
+    main = Main(CLUB_ID, ":memory:", update=True)
+    main.create_tables(con)
+    with patch.object(Crawler, "histories", return_value=[]):
+        assert main.plan_tournaments(con, PLAYERS) == []
+    assert [history_cache.get(url) for url in HISTORY_URLS] == ["", "", None, None]
@@ -0,0 +1,83 @@
+import sqlite3
+
+import pytest
+
+from chess_clubs.core import Main
+from chess_clubs.game import Game
+from chess_clubs.writer import DatabaseWriter
+
+
+def make_game(pid, oid, rnumber, result):
+    game = Game()
+    game.player_id = pid
+    game.opponent_id = oid
+    game.tid = "202406012762"
+    game.sname = "OPEN"
+    game.rnumber = rnumber
+    game.color = "W"
+    game.result = result
+    return game
+
+
+@pytest.fixture
+def main():
+    return Main("A6021250", ":memory:")
+
+
+@pytest.fixture
+def con(main):
+    con = sqlite3.connect(":memory:")
+    main.create_tables(con)
+    yield con
+    con.close()
+
+
+def summaries(con):
+    return con.execute("SELECT * FROM summaries ORDER BY pid, oid").fetchall()
+
+
+def test_summaries_follow_inserts(main, con):
+    with DatabaseWriter(con) as writer:
+        games = [make_game("1", "2", r, result) for r, result in enumerate("WWLD", 1)]
+        writer.add_head_to_head("1", "2", games)
+        # Duplicates are ignored, so they are not counted again
+        games = [make_game("1", "2", r, result) for r, result in enumerate("WW", 1)]
+        writer.add_head_to_head("1", "2", games)
+    assert summaries(con) == [("1", "2", 2, 1, 1), ("2", "1", 1, 2, 1)]
+    assert main.verify_summaries(con) == []
+
+
+def test_summaries_follow_deletes(main, con):
+    with DatabaseWriter(con) as writer:
+        writer.add_head_to_head("1", "2", [make_game("1", "2", 1, "W")])
+        writer.add_head_to_head("1", "3", [make_game("1", "3", 1, "D")])
+    with DatabaseWriter(con) as writer:
+        writer.add_head_to_head("1", "2", [make_game("1", "2", 2, "L")], replace=True)
+        writer.add_head_to_head("1", "3", [], replace=True)
+    assert summaries(con) == [("1", "2", 0, 1, 0), ("2", "1", 1, 0, 0)]
+    assert main.verify_summaries(con) == []
+
+
+def test_verify_finds_problems(main, con):
+    with DatabaseWriter(con) as writer:
+        writer.add_head_to_head("1", "2", [make_game("1", "2", 1, "W")])
+    con.execute("UPDATE summaries SET wins = 5 WHERE pid='1'")
+    problems = main.verify_summaries(con)
+    assert ("missing", "1", "2", 1, 0, 0) in problems
+    assert ("wrong", "1", "2", 5, 0, 0) in problems
+    assert ("unmatched", "1", "2", 5, 0, 0) in problems
+
+    main.create_summaries(con)
+    assert main.verify_summaries(con) == []
+
+
+def test_old_database_gets_summaries(main):
+    con = sqlite3.connect(":memory:")
+    con.execute("""CREATE TABLE games (pid TEXT, oid TEXT, tid TEXT, sname TEXT,
+                                       rnumber INT, color TEXT, result TEXT)""")
+    con.executemany("INSERT INTO games VALUES(?, ?, ?, ?, ?, ?, ?)", [
+        ("1", "2", "202406012762", "OPEN", 1, "W", "W"),
+        ("2", "1", "202406012762", "OPEN", 1, "B", "L"),
+    ])
+    main.create_tables(con)
+    assert summaries(con) == [("1", "2", 1, 0, 0), ("2", "1", 0, 1, 0)]
@@ -0,0 +1,113 @@
+import sqlite3
+
+import pytest
+
+from chess_clubs.core import Main
+from chess_clubs.game import Game
+from chess_clubs.player import Player
+from chess_clubs.writer import DatabaseWriter
+
+
+def make_game(result, color="W", rnumber=1):
+    game = Game()
+    game.player_id = "11111111"
+    game.opponent_id = "22222222"
+    game.tid = "202406012762"
+    game.sname = "OPEN"
+    game.rnumber = rnumber
+    game.color = color
+    game.result = result
+    return game
+
+
+@pytest.fixture
+def con():
+    con = sqlite3.connect(":memory:")
+    Main("A6021250", ":memory:").create_tables(con)
+    yield con
+    con.close()
+
+
+def count(con, table):
+    return con.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+
+def test_add_head_to_head_stores_both_perspectives(con):
+    with DatabaseWriter(con) as writer:
+        writer.add_head_to_head("11111111", "22222222", [make_game("W")])
+
+    rows = con.execute(
+        "SELECT pid, oid, color, result FROM games ORDER BY pid").fetchall()
+    assert rows == [
+        ("11111111", "22222222", "W", "W"),
+        ("22222222", "11111111", "B", "L"),
+    ]
+    assert Main("A6021250", ":memory:").get_completed_pairs(con) == {("11111111", "22222222")}
+
+
+def test_add_head_to_head_accepts_rows(con):
+    games = [make_game("W"), make_game("D", color="B", rnumber=2)]
+    with DatabaseWriter(con) as writer:
+        writer.add_head_to_head("11111111", "22222222", [DatabaseWriter.game_row(g) for g in games])
+    from_rows = con.execute("SELECT * FROM games ORDER BY 1, 2, 3, 4, 5").fetchall()
+
+    con.execute("DELETE FROM games")
+    games = [make_game("W"), make_game("D", color="B", rnumber=2)]
+    with DatabaseWriter(con) as writer:
+        writer.add_head_to_head("11111111", "22222222", games)
+    assert con.execute("SELECT * FROM games ORDER BY 1, 2, 3, 4, 5").fetchall() == from_rows
+    assert len(from_rows) == 4
+
+
+def test_rows_are_buffered_until_flush_size(con):
+    writer = DatabaseWriter(con, flush_size=6)
+    writer.add_head_to_head("11111111", "22222222", [make_game("W", rnumber=1)])
+    writer.add_head_to_head("11111111", "33333333", [make_game("L", rnumber=2)])
+    assert count(con, "games") == 0
+    assert count(con, "crawl_state") == 0
+
+    # The third pair fills the buffer, so all three pairs are written
+    writer.add_head_to_head("11111111", "44444444", [make_game("D", rnumber=3)])
+    assert count(con, "games") == 6
+    assert count(con, "crawl_state") == 3
+
+
+def test_exit_flushes_complete_pairs(con):
+    with pytest.raises(KeyboardInterrupt):
+        with DatabaseWriter(con) as writer:
+            writer.add_head_to_head("11111111", "22222222", [make_game("W")])
+            writer.add_crawl_failure("11111111", "33333333", OSError("timed out"))
+            raise KeyboardInterrupt
+    assert count(con, "games") == 2
+    sql = "SELECT status, attempts, last_error FROM crawl_state WHERE oid='33333333'"
+    assert con.execute(sql).fetchone() == ("failed", 1, "timed out")
+
+
+def test_replace_deletes_previous_games(con):
+    with DatabaseWriter(con) as writer:
+        writer.add_head_to_head("11111111", "22222222",
+                                [make_game("W", rnumber=1), make_game("L", rnumber=2)])
+    with DatabaseWriter(con) as writer:
+        writer.add_head_to_head("11111111", "22222222", [make_game("D", rnumber=3)],
+                                replace=True)
+    assert count(con, "games") == 2
+    sql = "SELECT attempts FROM crawl_state"
+    assert con.execute(sql).fetchone()[0] == 2
+
+
+def test_add_players_upserts(con):
+    writer = DatabaseWriter(con)
+    writer.add_players([Player("11111111", "ALICE A", event_count="3")])
+    writer.add_players([Player("11111111", "ALICE A", event_count="4"),
+                        Player("22222222", "BOB B", event_count="1")])
+    assert count(con, "players") == 2
+    sql = "SELECT event_count FROM players WHERE id='11111111'"
+    assert con.execute(sql).fetchone()[0] == 4
+
+
+def test_wal_option(tmp_path):
+    con = sqlite3.connect(str(tmp_path / "club.db"))
+    Main("A6021250", str(tmp_path / "club.db"), wal=True).configure(con)
+    assert con.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert con.execute("PRAGMA synchronous").fetchone()[0] == 1    # NORMAL
+    con.close()
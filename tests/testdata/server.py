@@ -0,0 +1,188 @@
+import hashlib
+import os
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from bs4 import BeautifulSoup
+
+from tests.testdata import TESTDATA
+
+
+class TestdataServer:
+    """
+    A local HTTP stand-in for the USCF website that serves the pages in
+    the testdata directory.
+
+    Head-to-head requests for the opponent IDs in `played` get the page
+    with games; all others get the page with no games, except that those
+    for the opponent IDs in `failing` get a 503 error.  The active player
+    list can be cut down to its first `players` rows.  The tournament
+    history of a player lists the tournament IDs in `histories`, keyed by
+    player ID, and the crosstable of tournament 202406012762 is served.  Links to the USCF
+    website are rewritten to point at the server, and pages can be
+    replaced through the `overrides` dictionary, keyed by path.  An
+    optional latency simulates the network round trip, and the next
+    `throttle` requests are refused with a 429 and the `retry_after`
+    header, if any.  Pages are served with an ETag and a Last-Modified
+    header, and conditional requests get a 304 if the page is unchanged.
+    The `content_type` header can be changed, for instance to leave out
+    the charset.
+
+    Usage:
+        with TestdataServer(played={"30403332"}, latency=0.05) as server:
+            html = get_page(server.url("/datapage/gamestats.php?..."))
+    """
+
+    __test__ = False  # Not a test class, despite the name
+
+    LAST_MODIFIED = "Sat, 01 Mar 2025 00:00:00 GMT"
+
+    def __init__(self, played=(), latency: float = 0.0, players: int = None):
+        self.played = set(played)
+        self.failing = set()
+        self.latency = latency
+        self.players = players
+        self.overrides = {}
+        self.histories = {}
+        self.requests = 0
+        self.throttle = 0
+        self.retry_after = None
+        self.content_type = "text/html; charset=utf-8"
+        self._lock = threading.Lock()
+        self._cache = {}
+        self._httpd = None
+        self._thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def url(self, path: str) -> str:
+        return self.base_url + path
+
+    def start(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # Allow keep-alive connections
+
+            def do_GET(self):
+                server.handle(self)
+
+            def log_message(self, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self._httpd.serve_forever,
+                                        kwargs={"poll_interval": 0.05},
+                                        daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        self._thread.join()
+
+    def read(self, filename: str) -> bytes:
+        if filename not in self._cache:
+            with open(os.path.join(TESTDATA, filename), "rb") as fp:
+                self._cache[filename] = fp.read()
+        return self._cache[filename]
+
+    def club_page(self) -> bytes:
+        """
+        Returns the club page.  The saved page was prettified, so the
+        whitespace between tags is removed again, as on the real website,
+        where the link text is exactly "Active Player List".
+        """
+        html = self.read("main.html")
+        return re.sub(rb">\s+", b">", re.sub(rb"\s+<", b"<", html))
+
+    def active_players(self) -> bytes:
+        """
+        Returns the active player list, cut down to the first `players` rows.
+        """
+        html = self.read("active_players.html")
+        if self.players is None:
+            return html
+        soup = BeautifulSoup(html, "html.parser")
+        table = soup.find("h4").find_next("table")
+        for tr in table.find_all("tr")[1 + self.players:]:
+            tr.decompose()
+        return str(soup).encode("utf-8")
+
+    def history_page(self, player_id: str) -> bytes:
+        """
+        Returns a tournament history page that links to the crosstable of
+        each of the player's tournaments.
+        """
+        rows = "".join(f'<tr><td><a href="https://www.uschess.org/msa/XtblMain.php?{tid}-{player_id}">'
+                       f'EVENT {tid}</a></td></tr>'
+                       for tid in self.histories.get(player_id, ()))
+        return f"<html><body><table>{rows}</table></body></html>".encode("utf-8")
+
+    def page_for(self, path: str, query: str):
+        """
+        Returns (status, body) for a request.  Subclasses can override this
+        to serve other pages.
+        """
+        if path in self.overrides:
+            return 200, self.overrides[path]
+        if path == "/datapage/top-affil-players.php":
+            return 200, self.active_players()
+        if path == "/datapage/gamestats.php":
+            drill = parse_qs(query).get("drill", [""])[0]
+            if drill in self.failing:
+                return 503, b"Service Unavailable"
+            if drill in self.played:
+                return 200, self.read("head_to_head_page.html")
+            return 200, self.read("head_to_head_zero.html")
+        if path == "/msa/MbrDtlTnmtHst.php":
+            return 200, self.history_page(query)
+        if path == "/msa/XtblMain.php" and query == "202406012762.0":
+            return 200, self.read("crosstable.html")
+        if path == "/msa/AffDtlMain.php":
+            return 200, self.club_page()
+        return 404, b"Not Found"
+
+    def handle(self, handler: BaseHTTPRequestHandler):
+        with self._lock:
+            self.requests += 1
+            throttled = self.throttle > 0
+            if throttled:
+                self.throttle -= 1
+        if self.latency:
+            time.sleep(self.latency)
+        parsed = urlparse(handler.path)
+        if throttled:
+            status, body = 429, b"Too Many Requests"
+        else:
+            status, body = self.page_for(parsed.path, parsed.query)
+        body = body.replace(b"https://www.uschess.org", self.base_url.encode("utf-8"))
+        etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+        if status == 200 and (handler.headers.get("If-None-Match") == etag
+                              or handler.headers.get("If-Modified-Since") == self.LAST_MODIFIED
+                              and "If-None-Match" not in handler.headers):
+            status, body = 304, b""
+        handler.send_response(status)
+        if status in (200, 304):
+            handler.send_header("ETag", etag)
+            handler.send_header("Last-Modified", self.LAST_MODIFIED)
+        if throttled and self.retry_after is not None:
+            handler.send_header("Retry-After", self.retry_after)
+        handler.send_header("Content-Type", self.content_type)
+        handler.send_header("Content-Length", str(len(body)))
+        handler.end_headers()
+        handler.wfile.write(body)